@@ -0,0 +1,83 @@
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Uso: python -m benchmarks.bench_banco_planejamento --lotes 300 --sessoes 1 4 16 --processos 1 2
+# Cada sessão simulada repete: lê a tabela (cache), marca/desmarca uma flag de alguns lotes e grava
+
+
+def _sessoes(caminho, n_sessoes, duracao, lotes_por_escrita, semente):
+    from pcp import banco_planejamento, planejamento
+
+    banco = banco_planejamento.BancoPlanejamento(caminho)
+    totais = {'escritas': 0, 'leituras': 0, 'conflitos': 0}
+    trava = threading.Lock()
+
+    def sessao(indice):
+        rng = random.Random(semente * 1000 + indice)
+        escritas = leituras = conflitos = 0
+        fim = time.perf_counter() + duracao
+        while time.perf_counter() < fim:
+            df = banco.tabela()
+            leituras += 1
+            linhas = rng.sample(range(len(df)), lotes_por_escrita)
+            flag = rng.choice(planejamento.FLAGS)
+            edicoes = {linha: {flag: not df.iloc[linha][flag]} for linha in linhas}
+            conflitos += len(banco.aplicar_mudancas(planejamento.mudancas(df, edicoes)))
+            escritas += 1
+        with trava:
+            totais['escritas'] += escritas
+            totais['leituras'] += leituras
+            totais['conflitos'] += conflitos
+
+    threads = [threading.Thread(target=sessao, args=(i,)) for i in range(n_sessoes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return totais
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lotes", type=int, default=300)
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--duracao", type=float, default=3.0)
+    parser.add_argument("--lotes-por-escrita", type=int, default=5)
+    args = parser.parse_args()
+
+    from pcp import banco_planejamento
+
+    print(f"{'processos':>9} {'sessões':>8} {'escritas/s':>11} {'leituras/s':>11} {'conflitos':>10}")
+    for processos in args.processos:
+        for sessoes in args.sessoes:
+            with tempfile.TemporaryDirectory() as pasta:
+                caminho = os.path.join(pasta, "planejamento.db")
+                banco = banco_planejamento.BancoPlanejamento(caminho)
+                for i in range(args.lotes):
+                    banco.adicionar({"Lote": str(30000 + i), "Descrição": f"LOTE {i}", "Cor": "pink", "Programar": False,
+                                     "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": False})
+
+                # Sessões divididas entre processos (como vários servidores no mesmo banco)
+                with ProcessPoolExecutor(processos) as executor:
+                    futuros = [
+                        executor.submit(_sessoes, caminho, max(sessoes // processos, 1), args.duracao,
+                                        args.lotes_por_escrita, p)
+                        for p in range(processos)
+                    ]
+                    resultados = [futuro.result() for futuro in futuros]
+
+                escritas = sum(r['escritas'] for r in resultados)
+                leituras = sum(r['leituras'] for r in resultados)
+                conflitos = sum(r['conflitos'] for r in resultados)
+                print(f"{processos:>9} {sessoes:>8} {escritas / args.duracao:>11.0f} "
+                      f"{leituras / args.duracao:>11.0f} {conflitos / max(escritas * args.lotes_por_escrita, 1):>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import classificacao
+
+# Uso: python -m benchmarks.bench_classificacao --linhas 100000 500000
+
+
+def classificar_antigo(df, hoje):
+    # Código que ficava em Ofs.main antes do pcp.classificacao
+    df['Situação'] = np.where(df["Final"] > hoje, 'futura', 'atrasada')
+    df['status'] = df['Saldo'].apply(lambda x: 'fechada' if x == 0 else 'aberta')
+    df['Tipo_Lote'] = df['Plano'].astype(str).apply(
+        lambda x: 'Pedido' if x.startswith('25') and len(x) == 5 else 'Paralelo'
+    )
+    df['Plano_25xxx'] = df['Plano'].astype(str).str.match(r'^25\d{3}$')
+    return df
+
+
+def cronometrar(funcao, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 500_000])
+    args = parser.parse_args()
+    hoje = pd.to_datetime(date.today())
+
+    print(f"{'linhas':>10} {'antigo (ms)':>12} {'novo (ms)':>10} {'ganho':>7} {'memória antiga':>15} {'memória nova':>13}")
+    for n in args.linhas:
+        df = gerar_dataframe(n)
+        antigo = classificar_antigo(df.copy(), hoje)
+        novo = classificacao.classificar(df, hoje)
+        for col in classificacao.COLUNAS:
+            assert (antigo[col].astype(str).to_numpy() == novo[col].astype(str).to_numpy()).all(), col
+
+        t_antigo = cronometrar(lambda: classificar_antigo(antigo, hoje))
+        t_novo = cronometrar(lambda: classificacao.classificar(df, hoje))
+        mem_antiga = antigo[classificacao.COLUNAS].memory_usage(deep=True).sum() / 2**20
+        mem_nova = novo.memory_usage(deep=True).sum() / 2**20
+        print(f"{n:>10,} {t_antigo * 1000:>12.1f} {t_novo * 1000:>10.1f} {t_antigo / t_novo:>6.0f}x "
+              f"{mem_antiga:>12.1f} MB {mem_nova:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+from datetime import date
+
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import classificacao, compacto
+
+# Uso: python -m benchmarks.bench_compacto --linhas 1000000
+# Memória por milhão de OFs: frame como o dashboard montava (texto por linha), frame
+# normalizado com a classificação em category, e a forma compacta guardada no registro
+
+
+def com_texto(df, hoje):
+    # Como o main antigo deixava o frame: status/Situação/Tipo_Lote como str em cada linha
+    classes = classificacao.classificar(df, hoje)
+    resultado = df.copy()
+    for col in ['Situação', 'status', 'Tipo_Lote']:
+        resultado[col] = classes[col].astype(str).astype(object)
+    resultado['Plano_25xxx'] = classes['Plano_25xxx']
+    resultado['Sub-g'] = resultado['Sub-g'].replace(compacto.NOMES_SUBG)
+    return resultado
+
+
+def com_classes(df, hoje):
+    return df.join(classificacao.classificar(df, hoje))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    args = parser.parse_args()
+    hoje = pd.to_datetime(date.today())
+
+    df = gerar_dataframe(args.linhas)
+    formas = {
+        'texto (antigo)': com_texto(df, hoje),
+        'normalizado + category': com_classes(df, hoje),
+        'compacto': com_classes(compacto.compactar(df), hoje),
+    }
+
+    escala = 1_000_000 / args.linhas
+    colunas = list(formas['compacto'].columns)
+    print(f"{'coluna':>14} " + " ".join(f"{nome:>24}" for nome in formas))
+    for col in colunas:
+        print(f"{col:>14} " + " ".join(
+            f"{compacto.bytes_por_coluna(frame)[col] * escala / 2**20:>21.1f} MB" for frame in formas.values()
+        ))
+    print(f"{'total/1M OFs':>14} " + " ".join(
+        f"{compacto.bytes_por_coluna(frame).sum() * escala / 2**20:>21.1f} MB" for frame in formas.values()
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, classificacao, serie_temporal
+
+# Uso: python -m benchmarks.bench_delta --linhas 1000000 --mudancas 100 10000 100000
+
+
+def proximo_export(df, n_mudancas, rng):
+    # Fecha n_mudancas OFs abertas, como um export do ERP algumas horas depois
+    novo = df.copy()
+    abertas = np.flatnonzero(novo['Saldo'].to_numpy() != 0)
+    fechar = rng.choice(abertas, min(n_mudancas, len(abertas)), replace=False)
+    novo.loc[fechar, 'PRODUZIDO'] = novo.loc[fechar, 'PROGRAMADO']
+    novo.loc[fechar, 'Saldo'] = 0
+    return novo
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--mudancas", type=int, nargs="+", default=[100, 10_000, 100_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    hoje = date.today()
+
+    base = gerar_dataframe(args.linhas)
+    cubo_base = serie_temporal.CuboFechadas(base.join(classificacao.classificar(base, hoje)))
+
+    print(f"{'linhas':>10} {'mudanças':>9} {'diff+gravação (ms)':>19} {'cubo incremental (ms)':>22} {'cubo do zero (ms)':>18}")
+    for n in args.mudancas:
+        with tempfile.TemporaryDirectory() as pasta:
+            loja = armazenamento.LojaOfs(pasta)
+            loja.aplicar_export(base, 'base')
+            novo = proximo_export(base, n, rng)
+
+            inicio = time.perf_counter()
+            # O export anterior ainda está no registro, como no app logo depois de um upload
+            delta = loja.aplicar_export(novo, f'mudancas-{n}', lambda versao: base)
+            t_delta = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            cubo_base.atualizar(delta)
+            t_incremental = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            serie_temporal.CuboFechadas(novo.join(classificacao.classificar(novo, hoje)))
+            t_zero = time.perf_counter() - inicio
+
+            print(f"{args.linhas:>10,} {delta.alteradas:>9,} {t_delta * 1000:>19.0f} "
+                  f"{t_incremental * 1000:>22.0f} {t_zero * 1000:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
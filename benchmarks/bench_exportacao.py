@@ -0,0 +1,70 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import compacto, exportacao
+
+# Uso: python -m benchmarks.bench_exportacao --linhas 20000 100000 --formatos CSV Parquet Excel
+# Tempo e pico de memória em rodadas separadas: o tracemalloc deixa o código bem mais lento.
+# O pico cobre as alocações do Python e do numpy/pandas, não as do Arrow.
+
+
+def ingenuo(df, posicoes, formato, caminho):
+    # O que a página faria sem a exportação em blocos: copia a visão filtrada inteira e grava
+    filtrado = compacto.visao(df.take(posicoes), exportacao.colunas_exportadas(df))
+    if formato == "CSV":
+        filtrado.to_csv(caminho, sep=";", decimal=",", index=False, date_format="%d/%m/%Y")
+    elif formato == "Excel":
+        filtrado.to_excel(caminho, index=False, engine="openpyxl")
+    else:
+        filtrado.to_parquet(caminho, index=False)
+
+
+def em_blocos(df, posicoes, formato, pasta):
+    exportando = exportacao.Exportacao(df, posicoes, formato, pasta=pasta).iniciar()
+    exportando._thread.join()
+    assert exportando.pronta, exportando.erro
+    return exportando.caminho
+
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    funcao(*args)
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    resultado = funcao(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, duracao, pico / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--formatos", nargs="+", default=list(exportacao.FORMATOS), choices=list(exportacao.FORMATOS))
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'formato':>8} {'modo':>8} {'tempo (s)':>10} {'pico (MB)':>10} {'arquivo (MB)':>13}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for n in args.linhas:
+            df = compacto.compactar(gerar_dataframe(n))
+            # Visão filtrada típica: as OFs abertas
+            posicoes = np.flatnonzero(df['Saldo'].to_numpy() > 0)
+            for formato in args.formatos:
+                extensao, _ = exportacao.FORMATOS[formato]
+                caminho = os.path.join(pasta, f"ingenuo_{n}{extensao}")
+                _, duracao, pico = medir(ingenuo, df, posicoes, formato, caminho)
+                print(f"{n:>10,} {formato:>8} {'ingênuo':>8} {duracao:>10.2f} {pico:>10.1f} {os.path.getsize(caminho) / 2**20:>13.1f}")
+
+                caminho, duracao, pico = medir(em_blocos, df, posicoes, formato, pasta)
+                print(f"{n:>10,} {formato:>8} {'blocos':>8} {duracao:>10.2f} {pico:>10.1f} {os.path.getsize(caminho) / 2**20:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
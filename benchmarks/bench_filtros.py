@@ -0,0 +1,63 @@
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import classificacao, filtros
+
+# Uso: python -m benchmarks.bench_filtros --linhas 1000000
+
+
+def filtrar_antigo(df, selecoes):
+    # Código que ficava em Ofs.main: copy + isin encadeados
+    df_filtrado = df.copy()
+    for col, selecionados in selecoes.items():
+        if selecionados:
+            df_filtrado = df_filtrado[df_filtrado[col].isin(selecionados)]
+    return df_filtrado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1_000_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'linhas':>10} {'montagem (ms)':>14} {'antigo (ms)':>12} {'índice (ms)':>12}")
+    for n in args.linhas:
+        df = gerar_dataframe(n)
+        classes = classificacao.classificar(df, pd.to_datetime(date.today()))
+        for col in classificacao.COLUNAS:
+            df[col] = classes[col]
+
+        inicio = time.perf_counter()
+        indice = filtros.IndiceFiltro(df)
+        montagem = time.perf_counter() - inicio
+
+        planos = indice.valores('Plano')
+        t_antigo = t_indice = 0.0
+        consultas = 20
+        for _ in range(consultas):
+            selecoes = {
+                'Tipo_Lote': ['Pedido'],
+                'Plano': list(rng.choice(planos, 5, replace=False)),
+                'status': ['aberta'],
+                'Situação': [],
+            }
+            inicio = time.perf_counter()
+            esperado = filtrar_antigo(df, selecoes)
+            t_antigo += time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            posicoes = indice.filtrar(selecoes)
+            t_indice += time.perf_counter() - inicio
+            assert np.array_equal(posicoes, esperado.index.to_numpy())
+
+        print(f"{n:>10,} {montagem * 1000:>14.1f} {t_antigo / consultas * 1000:>12.1f} {t_indice / consultas * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
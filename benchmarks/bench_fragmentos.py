@@ -0,0 +1,102 @@
+import argparse
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.fragment import MemoryFragmentStorage
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+from streamlit.testing.v1.util import patch_config_options
+
+from benchmarks.bench_suite import SCRIPT, _widget
+
+# Uso: python -m benchmarks.bench_fragmentos --linhas 10000 100000 1000000 2>/dev/null
+# Latência de mexer no Período do dashboard de OFs: rerun do script inteiro (como era antes
+# dos fragmentos) x rerun só do fragmento da evolução (o que o navegador pede agora).
+
+
+class AppTestFragmentos(AppTest):
+    # O AppTest sempre roda o script inteiro e descarta os fragmentos a cada execução.
+    # Aqui eles ficam guardados entre execuções e um deles pode ser rodado sozinho.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fragmentos = MemoryFragmentStorage()
+
+    def _run(self, widget_state=None, timeout=None, fragmento=None):
+        mock_runtime = MagicMock(spec=Runtime)
+        mock_runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+        mock_runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = mock_runtime
+        pages_manager = PagesManager(self._script_path, ScriptCache(), setup_watcher=False)
+
+        runner = LocalScriptRunner(self._script_path, self.session_state, pages_manager, args=self.args, kwargs=self.kwargs)
+        runner._fragment_storage = self.fragmentos
+        with patch_config_options({"global.appTest": True}):
+            runner.request_rerun(RerunData(
+                widget_states=widget_state,
+                fragment_id_queue=[fragmento] if fragmento else [],
+                is_fragment_scoped_rerun=fragmento is not None,
+            ))
+            runner.start()
+            require_widgets_deltas(runner, timeout or self.default_timeout)
+            self._tree = parse_tree_from_messages(runner.forward_msgs())
+            self._tree._runner = self
+        Runtime._instance = None
+        return self
+
+    def rodar_fragmento(self, fragmento):
+        return self._run(self._tree.get_widget_states(), fragmento=fragmento)
+
+
+def medir(at, interagir, repeticoes):
+    tempos = []
+    for i in range(repeticoes):
+        # Alterna o Período para que cada repetição seja uma mudança de verdade
+        at.run()
+        periodo = _widget(at.selectbox, "Período")
+        periodo.set_value("Anual" if i % 2 == 0 else "Semanal")
+        inicio = time.perf_counter()
+        interagir(at)
+        tempos.append(time.perf_counter() - inicio)
+        assert not at.exception
+    return sorted(tempos)[len(tempos) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault("PCP_CACHE_DIR", tempfile.mkdtemp(prefix="pcp_bench_"))
+
+    from benchmarks.sintetico import planilha_em_disco
+
+    print(f"{'linhas':>9} {'script inteiro (ms)':>19} {'só o fragmento (ms)':>20}")
+    for n in sorted(args.linhas):
+        # from_string sempre devolve um AppTest comum: o script vai para um arquivo
+        script = os.path.join(os.environ["PCP_CACHE_DIR"], f"bench_fragmentos_{n}.py")
+        with open(script, "w", encoding="utf-8") as saida:
+            saida.write(SCRIPT.format(raiz=raiz, planilha=planilha_em_disco(n)))
+        at = AppTestFragmentos(script, default_timeout=3600)
+        at.run()
+        # Os fragmentos ficam guardados na ordem em que a página os declara: evolução primeiro
+        evolucao = next(iter(at.fragmentos._fragments))
+
+        t_inteiro = medir(at, lambda at: at.run(), args.repeticoes)
+        t_fragmento = medir(at, lambda at: at.rodar_fragmento(evolucao), args.repeticoes)
+        print(f"{n:>9,} {t_inteiro * 1000:>19.0f} {t_fragmento * 1000:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import time
+
+import plotly
+import plotly.graph_objects as go
+
+from pcp import gauges
+
+# Uso: python -m benchmarks.bench_gauges --lotes 12 50 200
+
+
+def gauge_antigo(valor):
+    # Código que ficava em Lotes.main: uma figura plotly por lote, cada uma num iframe
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=valor,
+        number={'suffix': "%", 'font': {'size': 22, 'color': "white"}},
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [0, 100], 'visible': False},
+            'bar': {'color': "#FFD700", 'thickness': 0.7},
+            'bgcolor': "lightgray",
+            'shape': "angular",
+        }
+    ))
+    fig.update_layout(
+        margin=dict(t=10, b=0, l=0, r=0),
+        height=180,
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig.to_html(include_plotlyjs="cdn", full_html=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lotes", type=int, nargs="+", default=[12, 50, 200])
+    args = parser.parse_args()
+
+    # Cada iframe do caminho antigo baixa (ou tira do cache) e interpreta o plotly.min.js inteiro
+    plotly_js = os.path.getsize(os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js"))
+
+    print(f"plotly.min.js: {plotly_js / 2**20:.1f} MB interpretado por iframe no caminho antigo")
+    print(f"{'lotes':>6} {'antigo (ms)':>12} {'antigo (KB)':>12} {'iframes':>8} {'svg (ms)':>9} {'svg (KB)':>9} {'iframes':>8}")
+    for n in args.lotes:
+        lotes = [{"id": str(25000 + i), "progresso": (i * 37) % 101} for i in range(n)]
+
+        inicio = time.perf_counter()
+        antigo = sum(len(gauge_antigo(lote["progresso"]).encode()) for lote in lotes)
+        t_antigo = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        novo = len(gauges.html_lotes(lotes).encode())
+        t_novo = time.perf_counter() - inicio
+
+        print(f"{n:>6} {t_antigo * 1000:>12.1f} {antigo / 1024:>12.1f} {n:>8} {t_novo * 1000:>9.2f} {novo / 1024:>9.1f} {0:>8}")
+
+
+if __name__ == "__main__":
+    main()
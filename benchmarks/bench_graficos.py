@@ -0,0 +1,71 @@
+import argparse
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+from streamlit.elements.lib.streamlit_plotly_theme import configure_streamlit_plotly_theme
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import compacto, graficos, serie_temporal, setores
+
+# Uso: python -m benchmarks.bench_graficos --linhas 100000 1000000
+# Bytes do JSON de cada gráfico (o que vai ao navegador) e tempo de montagem, px x camada.
+
+
+def casos(df, hoje):
+    # nome -> (figura como era com o plotly.express, figura pela camada de gráficos)
+    cubo = serie_temporal.CuboFechadas(df)
+    fim = hoje.date()
+    anual = cubo.serie(fim - pd.Timedelta(days=serie_temporal.PERIODOS["Anual"]), fim, None, hoje)
+    painel = setores.PainelSetores(df)
+    vazao = painel.vazao(None, hoje, 365).reset_index()
+    colunas = ['Fechadas'] + [f"Média {janela} dias" for janela in setores.JANELAS]
+    historico = painel.vazao(None, hoje, 10 * 365).reset_index()
+    tipos = compacto.setores(df['Sub-g']).value_counts()
+
+    return {
+        "evolução anual": (
+            lambda: px.line(anual, x='Periodo', y='Quantidade', markers=True, line_shape='spline'),
+            lambda: graficos.linhas(anual['Periodo'], {'Quantidade': anual['Quantidade']}, None),
+        ),
+        "vazão 365 dias": (
+            lambda: px.line(vazao, x='Dia', y=colunas),
+            lambda: graficos.linhas(vazao['Dia'], {col: vazao[col] for col in colunas}, None),
+        ),
+        "vazão 10 anos": (
+            lambda: px.line(historico, x='Dia', y=colunas),
+            lambda: graficos.linhas(historico['Dia'], {col: historico[col] for col in colunas}, None),
+        ),
+        "pizza setores": (
+            lambda: px.pie(tipos, values=tipos.values, names=tipos.index),
+            lambda: graficos.pizza(tipos, None, {}),
+        ),
+    }
+
+
+def medir(montar):
+    inicio = time.perf_counter()
+    texto = pio.to_json(montar(), validate=False)
+    return (time.perf_counter() - inicio) * 1000, len(texto.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    # Tema do Streamlit como template padrão, o mesmo que as páginas usam
+    configure_streamlit_plotly_theme()
+    hoje = pd.Timestamp.today().normalize()
+    print(f"{'linhas':>10} {'gráfico':>28} {'px (ms)':>8} {'px (KB)':>8} {'camada (ms)':>12} {'camada (KB)':>12}")
+    for n in args.linhas:
+        df = compacto.compactar(gerar_dataframe(n))
+        for nome, (antigo, novo) in casos(df, hoje).items():
+            t_px, kb_px = medir(antigo)
+            # Como em _graficos.mostrar: template aparado
+            t_camada, kb_camada = medir(lambda: graficos.aparar_template(novo()))
+            print(f"{n:>10,} {nome:>28} {t_px:>8.1f} {kb_px / 1024:>8.1f} {t_camada:>12.1f} {kb_camada / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
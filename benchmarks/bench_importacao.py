@@ -0,0 +1,62 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Uso: python -m benchmarks.bench_importacao [--orcamento-ms 900]
+# Mede com -X importtime a partida a frio do app.py (que renderiza a página Início) e a
+# importação de cada página. Sai com código 1 se a partida passar do orçamento ou puxar
+# bibliotecas pesadas que só as páginas de dados precisam.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# plotly sozinho fica de fora: o próprio streamlit já importa o pacote base
+PESADOS = ['pandas', 'numpy', 'pyarrow', 'openpyxl', 'matplotlib', 'plotly.express']
+
+
+def medir_importacao(codigo):
+    # Devolve {módulo: tempo acumulado em ms} a partir da saída de -X importtime
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    tempos = {}
+    for linha in saida.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, modulo = linha[len("import time:"):].split("|")
+        tempos[modulo.strip()] = int(acumulado) / 1000
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orcamento-ms", type=float, default=900)
+    args = parser.parse_args()
+
+    sys.path.insert(0, RAIZ)
+    from paginas import PAGINAS
+
+    tempos = medir_importacao("import app")
+    partida = tempos.get("app", 0.0)
+    pesados = [modulo for modulo in PESADOS if modulo in tempos]
+
+    print(f"{'módulo':<28} {'importação (ms)':>16}  pesados")
+    print(f"{'app (partida + Início)':<28} {partida:>16.0f}  {', '.join(pesados) or '-'}")
+    for nome in PAGINAS:
+        tempos_pagina = medir_importacao(f"import streamlit, paginas.{nome}")
+        pesados_pagina = [modulo for modulo in PESADOS if modulo in tempos_pagina]
+        print(f"{'paginas.' + nome:<28} {tempos_pagina.get('paginas.' + nome, 0.0):>16.0f}  {', '.join(pesados_pagina) or '-'}")
+
+    falhas = []
+    if partida > args.orcamento_ms:
+        falhas.append(f"partida levou {partida:.0f} ms (orçamento {args.orcamento_ms:.0f} ms)")
+    if pesados:
+        falhas.append(f"partida importou {', '.join(pesados)}")
+    for falha in falhas:
+        print(f"FALHOU: {falha}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.sintetico import gerar_planilha
+from pcp import ingestao
+
+# Uso: python -m benchmarks.bench_ingestao --linhas 10000 100000
+
+
+def medir(n_linhas):
+    conteudo = gerar_planilha(n_linhas)
+    chave = ingestao.hash_conteudo(conteudo)
+
+    inicio = time.perf_counter()
+    df = ingestao.carregar_ofs(conteudo, chave)
+    frio = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    ingestao.carregar_ofs(conteudo, chave)
+    quente = time.perf_counter() - inicio
+
+    tamanho = os.path.getsize(ingestao.caminho_cache(chave))
+    return len(df), frio, quente, tamanho
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        ingestao.PASTA_CACHE = pasta
+        print(f"{'linhas':>10} {'frio (s)':>10} {'quente (s)':>11} {'ganho':>8} {'parquet (KB)':>13}")
+        for n in args.linhas:
+            linhas, frio, quente, tamanho = medir(n)
+            print(f"{linhas:>10,} {frio:>10.3f} {quente:>11.4f} {frio / quente:>7.0f}x {tamanho / 1024:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
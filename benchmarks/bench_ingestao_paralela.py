@@ -0,0 +1,38 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.sintetico import gerar_planilha
+from pcp import ingestao
+
+# Uso: python -m benchmarks.bench_ingestao_paralela --arquivos 8 --linhas 20000 --processos 1 2 4 8
+# Vários exports diários (mesmas OFs, sementes diferentes), convertidos a frio com N processos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--arquivos", type=int, default=8)
+    parser.add_argument("--linhas", type=int, default=20_000)
+    parser.add_argument("--processos", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    planilhas = [gerar_planilha(args.linhas, semente) for semente in range(args.arquivos)]
+    arquivos = [(ingestao.hash_conteudo(conteudo), conteudo) for conteudo in planilhas]
+    linhas_total = args.arquivos * args.linhas
+
+    print(f"CPUs: {os.cpu_count()} · {args.arquivos} arquivos x {args.linhas:,} linhas")
+    print(f"{'processos':>9} {'tempo (s)':>10} {'linhas/s':>10} {'speedup':>8} {'OFs únicas':>11}")
+    base = None
+    for processos in args.processos:
+        with tempfile.TemporaryDirectory() as pasta:
+            ingestao.PASTA_CACHE = pasta
+            inicio = time.perf_counter()
+            df = ingestao.carregar_varias(arquivos, max_processos=processos)
+            tempo = time.perf_counter() - inicio
+        base = base or tempo
+        print(f"{processos:>9} {tempo:>10.2f} {linhas_total / tempo:>10,.0f} {base / tempo:>7.2f}x {len(df):>11,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_delta import proximo_export
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, lotes
+
+# Uso: python -m benchmarks.bench_lotes --linhas 1000000 --lotes 5000 --mudancas 100 10000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--lotes", type=int, default=5_000)
+    parser.add_argument("--mudancas", type=int, nargs="+", default=[100, 10_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    # Espalha as OFs por milhares de lotes, bem mais que os 400 planos do sintético
+    base = gerar_dataframe(args.linhas)
+    base['Plano'] = (25000 + rng.integers(0, args.lotes, args.linhas)).astype(str).astype(object)
+
+    inicio = time.perf_counter()
+    progresso_base = lotes.ProgressoLotes(base)
+    t_montagem = time.perf_counter() - inicio
+    print(f"montagem: {args.linhas:,} OFs, {len(progresso_base.somas):,} lotes em {t_montagem * 1000:.0f} ms")
+
+    print(f"{'mudanças':>9} {'incremental (ms)':>17} {'do zero (ms)':>13}")
+    for n in args.mudancas:
+        with tempfile.TemporaryDirectory() as pasta:
+            loja = armazenamento.LojaOfs(pasta)
+            loja.aplicar_export(base, 'base')
+            novo = proximo_export(base, n, rng)
+            delta = loja.aplicar_export(novo, f'mudancas-{n}')
+
+            inicio = time.perf_counter()
+            progresso_base.atualizar(delta)
+            t_incremental = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            lotes.ProgressoLotes(novo)
+            t_zero = time.perf_counter() - inicio
+
+            print(f"{delta.alteradas:>9,} {t_incremental * 1000:>17.1f} {t_zero * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
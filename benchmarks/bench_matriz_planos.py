@@ -0,0 +1,86 @@
+import argparse
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_delta import proximo_export
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, classificacao, compacto, filtros, matriz_planos
+
+# Uso: python -m benchmarks.bench_matriz_planos --linhas 1000000 --planos 300 1000 3000
+
+
+def analise_antiga(df_filtrado):
+    # Código que ficava em Ofs.main, incluindo o _compute que o st.dataframe faz no Styler
+    df_25xxx = df_filtrado[df_filtrado['Plano_25xxx']]
+    contagem_por_plano = df_25xxx.groupby(['Plano', 'status'], observed=True).size().unstack(fill_value=0)
+    contagem_por_plano.columns = contagem_por_plano.columns.astype(str)
+    total_por_plano = contagem_por_plano.sum(axis=1)
+    contagem_porcentagem = (contagem_por_plano.div(total_por_plano, axis=0)) * 100
+    contagem_por_plano.style.background_gradient(cmap='Blues')._compute()
+    contagem_porcentagem.style.format("{:.1f}%").background_gradient(cmap='Greens')._compute()
+
+
+def analise_nova(matriz, selecoes):
+    contagem, porcentagem, css_contagem, css_porcentagem = matriz.tabelas(filtros.chave_filtros(selecoes), selecoes)
+    if css_contagem is not None:
+        contagem.style.apply(lambda _: css_contagem, axis=None)._compute()
+        porcentagem.style.format("{:.1f}%").apply(lambda _: css_porcentagem, axis=None)._compute()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--planos", type=int, nargs="+", default=[300, 1000, 3000])
+    args = parser.parse_args()
+    hoje = pd.to_datetime(date.today())
+    rng = np.random.default_rng(0)
+
+    # Aquecimento: o primeiro Styler importa o matplotlib
+    pequeno = gerar_dataframe(1000)
+    analise_antiga(pequeno.join(classificacao.classificar(pequeno, hoje)))
+
+    print(f"limite de estilo: {matriz_planos.LIMITE_ESTILO} planos (PCP_LIMITE_ESTILO)")
+    print(f"{'planos':>7} {'estilo':>7} {'antigo (ms)':>12} {'1º filtro (ms)':>15} {'filtro visto (ms)':>18} "
+          f"{'montagem (ms)':>14} {'delta 1k (ms)':>14}")
+    for n_planos in args.planos:
+        base = gerar_dataframe(args.linhas)
+        base['Plano'] = (25000 + rng.integers(0, n_planos, args.linhas)).astype(str).astype(object)
+        base = compacto.compactar(base)
+        df = base.join(classificacao.classificar(base, hoje))
+        selecoes = {'Tipo_Lote': [], 'Plano': [], 'status': ['aberta', 'fechada'], 'Situação': []}
+
+        inicio = time.perf_counter()
+        analise_antiga(df)
+        t_antigo = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        matriz = matriz_planos.MatrizPlanos(df, hoje)
+        t_montagem = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        analise_nova(matriz, selecoes)
+        t_primeiro = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        analise_nova(matriz, selecoes)
+        t_visto = time.perf_counter() - inicio
+
+        with tempfile.TemporaryDirectory() as pasta:
+            loja = armazenamento.LojaOfs(pasta)
+            loja.aplicar_export(base, 'base')
+            delta = loja.aplicar_export(compacto.compactar(proximo_export(base, 1000, rng)), 'novo')
+        inicio = time.perf_counter()
+        matriz.atualizar(delta)
+        t_delta = time.perf_counter() - inicio
+
+        estilo = 'sim' if n_planos <= matriz_planos.LIMITE_ESTILO else 'não'
+        print(f"{n_planos:>7} {estilo:>7} {t_antigo * 1000:>12.0f} {t_primeiro * 1000:>15.0f} {t_visto * 1000:>18.1f} "
+              f"{t_montagem * 1000:>14.0f} {t_delta * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.sintetico import gerar_planilha
+
+# Uso: python -m benchmarks.bench_memoria --linhas 20000 80000 200000
+# Cada medição roda num processo separado. O pico é o VmHWM do /proc (só Linux), zerado
+# depois dos imports pelo /proc/self/clear_refs: o ru_maxrss não serve, o processo filho
+# herda nele o pico do pai (o que gerou as planilhas).
+
+MEDIR = """
+import sys, time
+import pandas as pd
+from pcp import ingestao
+
+def memoria_mb(campo):
+    with open("/proc/self/status") as status:
+        linha = next(linha for linha in status if linha.startswith(campo))
+    return int(linha.split()[1]) / 1024
+
+modo, origem, destino = sys.argv[1:4]
+# "5" zera o VmHWM no RSS atual: o pico medido é só o da conversão
+with open("/proc/self/clear_refs", "w") as refs:
+    refs.write("5")
+base = memoria_mb("VmRSS:")
+inicio = time.perf_counter()
+if modo == "blocos":
+    ingestao.converter_em_blocos(origem, destino)
+else:
+    ingestao.gravar_parquet(ingestao.normalizar(pd.read_excel(origem, engine="openpyxl")), destino)
+duracao = time.perf_counter() - inicio
+print(duracao, memoria_mb("VmHWM:") - base)
+"""
+
+
+def medir(modo, origem, destino):
+    saida = subprocess.run(
+        [sys.executable, "-c", MEDIR, modo, origem, destino],
+        capture_output=True, text=True, check=True,
+    )
+    duracao, pico_mb = saida.stdout.split()
+    return float(duracao), float(pico_mb)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[20_000, 80_000, 200_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"{'linhas':>10} {'modo':>8} {'tempo (s)':>10} {'pico RSS (MB)':>14}")
+        for n in args.linhas:
+            origem = os.path.join(pasta, f"ofs_{n}.xlsx")
+            with open(origem, "wb") as arquivo:
+                arquivo.write(gerar_planilha(n))
+            for modo in ("pandas", "blocos"):
+                duracao, pico_mb = medir(modo, origem, os.path.join(pasta, f"{modo}_{n}.parquet"))
+                print(f"{n:>10,} {modo:>8} {duracao:>10.2f} {pico_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
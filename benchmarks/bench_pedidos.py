@@ -0,0 +1,83 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_delta import proximo_export
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, compacto, pedidos
+
+# Uso: python -m benchmarks.bench_pedidos --linhas 1000000 --pedidos 30000 --mudancas 100 10000
+
+
+def vencendo_por_varredura(df, hoje, dias):
+    # O que a página faria sem o índice: agrupar todas as OFs por plano a cada consulta
+    final = compacto.dias(df, 'Final').astype(np.float64)
+    final[final == compacto.SEM_DATA] = np.nan
+    por_plano = pd.DataFrame({
+        'Plano': df['Plano'].to_numpy(dtype=object),
+        'prazo': final,
+        'abertas': df['Saldo'].to_numpy() != 0,
+    }).groupby('Plano').agg(prazo=('prazo', 'max'), abertas=('abertas', 'sum'))
+    dia_hoje = compacto.dia_numero(hoje)
+    no_prazo = (por_plano['prazo'] > dia_hoje) & (por_plano['prazo'] <= dia_hoje + dias) & (por_plano['abertas'] > 0)
+    return por_plano[no_prazo].sort_values('prazo')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--pedidos", type=int, default=30_000)
+    parser.add_argument("--mudancas", type=int, nargs="+", default=[100, 10_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    hoje = pd.Timestamp.today().normalize()
+
+    # Dezenas de milhares de pedidos 25XXX/paralelos, bem mais que os 400 planos do sintético
+    base = gerar_dataframe(args.linhas)
+    base['Plano'] = (25000 + rng.integers(0, args.pedidos, args.linhas)).astype(str).astype(object)
+    base = compacto.compactar(base)
+
+    inicio = time.perf_counter()
+    indice = pedidos.IndicePedidos(base)
+    t_montagem = time.perf_counter() - inicio
+    print(f"montagem: {args.linhas:,} OFs, {len(indice.pedidos):,} pedidos em {t_montagem * 1000:.0f} ms")
+
+    print(f"{'janela (dias)':>14} {'pedidos':>8} {'varredura (ms)':>15} {'índice (ms)':>12}")
+    for dias in [7, 30, 90]:
+        inicio = time.perf_counter()
+        vencendo_por_varredura(base, hoje, dias)
+        t_varredura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtido = pd.concat([
+            indice.vencendo(tipo, hoje + pd.Timedelta(days=1), hoje + pd.Timedelta(days=dias))
+            for tipo in ['Pedido', 'Paralelo']
+        ])
+        t_indice = time.perf_counter() - inicio
+
+        print(f"{dias:>14} {len(obtido):>8,} {t_varredura * 1000:>15.1f} {t_indice * 1000:>12.2f}")
+
+    print(f"{'mudanças':>9} {'incremental (ms)':>17} {'do zero (ms)':>13}")
+    for n in args.mudancas:
+        with tempfile.TemporaryDirectory() as pasta:
+            loja = armazenamento.LojaOfs(pasta)
+            loja.aplicar_export(base, 'base')
+            novo = compacto.compactar(proximo_export(base, n, rng))
+            delta = loja.aplicar_export(novo, f'mudancas-{n}')
+
+            inicio = time.perf_counter()
+            indice.atualizar(delta)
+            t_incremental = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            pedidos.IndicePedidos(novo)
+            t_zero = time.perf_counter() - inicio
+
+            print(f"{delta.alteradas:>9,} {t_incremental * 1000:>17.1f} {t_zero * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
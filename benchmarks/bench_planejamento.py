@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+# Uso: python -m benchmarks.bench_planejamento --lotes 10 100 300 1000 2>/dev/null
+# (o código antigo registra um aviso de label vazio por checkbox no stderr)
+# Mede o custo de um rerun da página com N lotes: grade única x uma linha de widgets por lote
+
+PREPARO = """
+import sys
+sys.path.insert(0, {raiz!r})
+import streamlit as st
+registros = [
+    {{"Lote": str(24000 + i), "Descrição": f"LOTE {{i}}", "Cor": "pink", "Programar": i % 2 == 0,
+      "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": True}}
+    for i in range({n})
+]
+"""
+
+# Código que ficava em Planejamento.main: 8 colunas e 5 checkboxes por lote, gravando tudo a cada rerun
+ANTIGO = """
+if 'dados' not in st.session_state:
+    st.session_state.dados = registros
+for i, item in enumerate(st.session_state.dados):
+    cols = st.columns([0.8, 2, 1, 1, 1, 1, 1, 1])
+    with cols[0]: st.markdown(f"**{item['Lote']}**")
+    with cols[1]: st.markdown(item['Descrição'])
+    with cols[2]: st.markdown(f"<div style='width:25px;height:25px;background-color:{item['Cor']};border-radius:4px'></div>", unsafe_allow_html=True)
+    with cols[3]: st.session_state.dados[i]['Programar'] = st.checkbox("", value=item['Programar'], key=f"prog_{i}")
+    with cols[4]: st.session_state.dados[i]['Cálculo NEC'] = st.checkbox("", value=item['Cálculo NEC'], key=f"nec_{i}")
+    with cols[5]: st.session_state.dados[i]['Gerar SOC'] = st.checkbox("", value=item['Gerar SOC'], key=f"soc_{i}")
+    with cols[6]: st.session_state.dados[i]['E-mail SOC'] = st.checkbox("", value=item['E-mail SOC'], key=f"email_{i}")
+    with cols[7]: st.session_state.dados[i]['Gerar OF'] = st.checkbox("", value=item['Gerar OF'], key=f"of_{i}")
+"""
+
+NOVO = """
+import sys
+sys.path.insert(0, {raiz!r})
+from paginas import Planejamento
+Planejamento.main()
+"""
+
+
+def medir(script, repeticoes):
+    at = AppTest.from_string(script, default_timeout=600)
+    at.run()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        at.run()
+    assert not at.exception
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lotes", type=int, nargs="+", default=[10, 100, 300, 1000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    # A página nova lê do banco: um arquivo temporário que cresce até cada tamanho pedido
+    pasta = tempfile.mkdtemp()
+    os.environ["PCP_BANCO_PLANEJAMENTO"] = os.path.join(pasta, "planejamento.db")
+    from pcp import banco_planejamento
+    banco = banco_planejamento.BancoPlanejamento()
+
+    print(f"{'lotes':>6} {'antigo (ms)':>12} {'grade (ms)':>11}")
+    for n in sorted(args.lotes):
+        for i in range(len(banco.tabela()), n):
+            banco.adicionar({"Lote": str(30000 + i), "Descrição": f"LOTE {i}", "Cor": "pink", "Programar": i % 2 == 0,
+                             "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": True})
+        t_antigo = medir(PREPARO.format(raiz=raiz, n=n) + ANTIGO, args.repeticoes)
+        t_novo = medir(NOVO.format(raiz=raiz), args.repeticoes)
+        print(f"{n:>6} {t_antigo * 1000:>12.0f} {t_novo * 1000:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
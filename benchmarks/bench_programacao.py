@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import compacto, programacao, setores
+
+# Uso: python -m benchmarks.bench_programacao --ofs 1000 10000 50000 --dias 120
+
+
+def planta(n_ofs, dias, semente=0):
+    # n_ofs OFs abertas e capacidade por setor para zerar a carteira em 'dias' dias úteis
+    df = gerar_dataframe(n_ofs * 3 + 100, semente)
+    abertas = compacto.compactar(df[df['Saldo'] > 0].head(n_ofs).reset_index(drop=True))
+    saldo = abertas.groupby(abertas['Sub-g'].map(setores.nome_setor), observed=True)['Saldo'].sum()
+    return abertas, programacao.Calendario((saldo / dias).to_dict())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ofs", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--dias", type=int, default=120)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    hoje = pd.Timestamp.today().normalize()
+
+    # Reprogramar quando a prioridade de um lote muda, contra refazer tudo: subir um lote
+    # para o topo muda as escolhas desde a liberação; mandar um lote para o fim, só a partir
+    # da primeira OF dele que tinha sido escolhida
+    mudancas = {"sobe": 0, "desce": programacao.PRIORIDADE_PADRAO + 1}
+    print(f"{'OFs':>8} {'programação (ms)':>17} " + " ".join(f"{'lote ' + nome + ' (ms)':>16}" for nome in mudancas)
+          + f" {'atrasadas':>10}")
+    for n in args.ofs:
+        abertas, calendario = planta(n, args.dias)
+        lotes = abertas['Plano'].astype(str).unique()
+        prioridades = {lote: 1 for lote in lotes[:len(lotes) // 4]}
+
+        inicio = time.perf_counter()
+        base = programacao.Programacao(abertas, calendario, prioridades, hoje)
+        t_base = time.perf_counter() - inicio
+
+        tempos = {}
+        for nome, prioridade in mudancas.items():
+            t_incremental = []
+            for _ in range(args.repeticoes):
+                novas = dict(prioridades, **{rng.choice(lotes): prioridade})
+
+                inicio = time.perf_counter()
+                base.reprogramar(novas)
+                t_incremental.append(time.perf_counter() - inicio)
+            tempos[nome] = np.median(t_incremental)
+
+        atrasadas = int(base.resumo()['Atrasadas previstas'].sum())
+        print(f"{len(abertas):>8,} {t_base * 1000:>17.1f} "
+              + " ".join(f"{tempos[nome] * 1000:>16.1f}" for nome in mudancas) + f" {atrasadas:>10,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import classificacao, serie_temporal
+
+# Uso: python -m benchmarks.bench_serie_temporal --linhas 1000000
+
+
+def serie_antiga(df_filtrado, data_inicio, data_fim):
+    # Código que ficava em Ofs.main antes do cubo
+    df_fechadas = df_filtrado[df_filtrado['status'] == 'fechada'].copy()
+    df_fechadas = df_fechadas.dropna(subset=['Final'])
+    df_fechadas['Final'] = pd.to_datetime(df_fechadas['Final'], errors='coerce')
+    datas_completas = pd.date_range(start=data_inicio, end=data_fim).date
+    df_fechadas['Periodo'] = df_fechadas['Final'].dt.date
+    contagem_temporal = df_fechadas.groupby('Periodo').size()
+    contagem_temporal = contagem_temporal.reindex(datas_completas, fill_value=0).reset_index()
+    contagem_temporal.columns = ['Periodo', 'Quantidade']
+    return contagem_temporal
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1_000_000])
+    args = parser.parse_args()
+    hoje = date.today()
+
+    print(f"{'linhas':>10} {'período':>8} {'montagem (ms)':>14} {'antigo (ms)':>12} {'cubo (ms)':>10}")
+    for n in args.linhas:
+        df = gerar_dataframe(n)
+        classes = classificacao.classificar(df, pd.Timestamp(hoje))
+        for col in classificacao.COLUNAS:
+            df[col] = classes[col]
+
+        inicio = time.perf_counter()
+        cubo = serie_temporal.CuboFechadas(df)
+        montagem = time.perf_counter() - inicio
+
+        selecoes = {'Tipo_Lote': ['Pedido'], 'Plano': ['25001', '25002', '25150', '25300']}
+        df_filtrado = df[df['Tipo_Lote'].isin(selecoes['Tipo_Lote']) & df['Plano'].isin(selecoes['Plano'])]
+
+        for periodo, dias in serie_temporal.PERIODOS.items():
+            data_inicio = hoje - timedelta(days=dias)
+
+            inicio = time.perf_counter()
+            esperado = serie_antiga(df_filtrado, data_inicio, hoje)
+            t_antigo = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            for _ in range(100):
+                obtido = cubo.contagens(data_inicio, hoje, selecoes, hoje)
+            t_cubo = (time.perf_counter() - inicio) / 100
+
+            assert np.array_equal(esperado['Quantidade'].to_numpy(), obtido)
+            sem_filtro = serie_antiga(df, data_inicio, hoje)
+            assert np.array_equal(sem_filtro['Quantidade'].to_numpy(), cubo.contagens(data_inicio, hoje, {}, hoje))
+            print(f"{n:>10,} {periodo:>8} {montagem * 1000:>14.1f} {t_antigo * 1000:>12.1f} {t_cubo * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
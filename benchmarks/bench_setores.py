@@ -0,0 +1,77 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_delta import proximo_export
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, compacto, setores
+
+# Uso: python -m benchmarks.bench_setores --linhas 1000000 --mudancas 100 10000
+
+
+def pagina_por_varredura(df, subg, hoje):
+    # O que uma página de setor faria sem o painel: filtrar o dataset e agregar a cada abertura
+    dia_hoje = compacto.dia_numero(hoje)
+    setor = df[df['Sub-g'].to_numpy() == subg]
+    final = compacto.dias(setor, 'Final')
+    aberta = setor['Saldo'].to_numpy() != 0
+    fechadas = pd.Series(1, index=final[~aberta]).groupby(level=0).sum()
+    return aberta.sum(), (aberta & (final <= dia_hoje)).sum(), fechadas.loc[dia_hoje - 29:dia_hoje].sum()
+
+
+def pagina_pelo_painel(painel, setor, hoje):
+    painel.indicadores(setor, hoje)
+    painel.vazao(setor, hoje, 90)
+    painel.atraso(setor, hoje)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--mudancas", type=int, nargs="+", default=[100, 10_000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    hoje = pd.Timestamp.today().normalize()
+
+    base = compacto.compactar(gerar_dataframe(args.linhas))
+    inicio = time.perf_counter()
+    painel = setores.PainelSetores(base)
+    t_montagem = time.perf_counter() - inicio
+    print(f"montagem: {args.linhas:,} OFs -> {len(painel.somas):,} somas por setor e dia em {t_montagem * 1000:.0f} ms")
+
+    print(f"{'setor':>12} {'varredura (ms)':>15} {'painel (ms)':>12}")
+    for subg, setor in compacto.NOMES_SUBG.items():
+        inicio = time.perf_counter()
+        pagina_por_varredura(base, subg, hoje)
+        t_varredura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        pagina_pelo_painel(painel, setor, hoje)
+        t_painel = time.perf_counter() - inicio
+
+        print(f"{setor:>12} {t_varredura * 1000:>15.1f} {t_painel * 1000:>12.1f}")
+
+    print(f"{'mudanças':>9} {'incremental (ms)':>17} {'do zero (ms)':>13}")
+    for n in args.mudancas:
+        with tempfile.TemporaryDirectory() as pasta:
+            loja = armazenamento.LojaOfs(pasta)
+            loja.aplicar_export(base, 'base')
+            novo = compacto.compactar(proximo_export(base, n, rng))
+            delta = loja.aplicar_export(novo, f'mudancas-{n}')
+
+            inicio = time.perf_counter()
+            painel.atualizar(delta)
+            t_incremental = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            setores.PainelSetores(novo)
+            t_zero = time.perf_counter() - inicio
+
+            print(f"{delta.alteradas:>9,} {t_incremental * 1000:>17.1f} {t_zero * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+# Uso: python -m benchmarks.bench_suite --linhas 10000 100000 1000000 5000000 2>/dev/null
+#      python -m benchmarks.bench_suite --gravar-baseline   (regrava benchmarks/baseline.json)
+# Roda as páginas de verdade (Ofs, Lotes, Planejamento) sem navegador, com o perfil ligado,
+# sobre planilhas sintéticas de cada tamanho; mede tempo, pico de memória e payload por
+# seção e termina com código 1 se alguma seção piorou em relação à baseline gravada.
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Mesmo despacho do app.py. O AppTest não simula st.file_uploader: a planilha do tamanho
+# medido entra no lugar do upload, pelo mesmo caminho de load_data.
+SCRIPT = """
+import importlib
+import io
+import sys
+sys.path.insert(0, {raiz!r})
+import streamlit as st
+from paginas import _perfil
+
+class _Upload(io.BytesIO):
+    def __init__(self, caminho):
+        with open(caminho, "rb") as arquivo:
+            super().__init__(arquivo.read())
+        self.name = caminho.rsplit("/", 1)[-1]
+
+st.file_uploader = lambda *args, **kwargs: [_Upload({planilha!r})]
+
+pagina = st.session_state.setdefault("pagina", "Ofs")
+_perfil.iniciar(pagina)
+with _perfil.secao("importação"):
+    modulo = importlib.import_module(f"paginas.{{pagina}}")
+with _perfil.secao("main"):
+    modulo.main()
+_perfil.finalizar()
+"""
+
+
+def _widget(elementos, rotulo):
+    return next(elemento for elemento in elementos if elemento.label == rotulo)
+
+
+# Interações medidas, na ordem em que um usuário faria: cada uma é um rerun
+def _ofs_carga(at):
+    at.run()
+
+
+def _ofs_rerun(at):
+    at.run()
+
+
+def _ofs_filtro(at):
+    status = _widget(at.multiselect, "Status")
+    status.set_value(status.value[:1]).run()
+
+
+def _ofs_periodo(at):
+    _widget(at.selectbox, "Período").set_value("Anual").run()
+
+
+def _lotes(at):
+    at.session_state["pagina"] = "Lotes"
+    at.run()
+
+
+def _lotes_quantidade(at):
+    _widget(at.slider, "Lotes exibidos").set_value(48).run()
+
+
+def _planejamento(at):
+    at.session_state["pagina"] = "Planejamento"
+    at.run()
+
+
+INTERACOES = [
+    ("ofs: carga", _ofs_carga),
+    ("ofs: rerun", _ofs_rerun),
+    ("ofs: filtro status", _ofs_filtro),
+    ("ofs: período anual", _ofs_periodo),
+    ("lotes: abrir", _lotes),
+    ("lotes: 48 lotes", _lotes_quantidade),
+    ("planejamento: abrir", _planejamento),
+]
+
+
+def _lotes_planejamento(n_linhas):
+    # Tabela de planejamento proporcional ao tamanho da fábrica
+    return min(max(n_linhas // 1000, 50), 5000)
+
+
+def _registros(arquivo_perfil):
+    if not os.path.exists(arquivo_perfil):
+        return []
+    with open(arquivo_perfil, encoding="utf-8") as entrada:
+        return [json.loads(linha) for linha in entrada]
+
+
+def medir(planilha, raiz, arquivo_perfil):
+    # {interação: [seções do perfil]} de uma sessão percorrendo todas as interações
+    at = AppTest.from_string(SCRIPT.format(raiz=raiz, planilha=planilha), default_timeout=3600)
+    resultado = {}
+    for nome, interagir in INTERACOES:
+        lidos = len(_registros(arquivo_perfil))
+        inicio = time.perf_counter()
+        interagir(at)
+        total_ms = (time.perf_counter() - inicio) * 1000
+        if at.exception:
+            raise RuntimeError(f"{nome}: {at.exception[0].message}")
+        registro = _registros(arquivo_perfil)[lidos]
+        if not registro['payload_medido']:
+            # Sem o hook do Streamlit o payload sairia zerado e passaria em qualquer baseline
+            raise RuntimeError(f"{nome}: payload não medido nesta versão do Streamlit")
+        secoes = {item['secao']: item for item in registro['secoes']}
+        secoes['rerun'] = {'tempo_ms': total_ms, 'pico_bytes': secoes['main']['pico_bytes'],
+                           'payload_bytes': secoes['main']['payload_bytes']}
+        resultado[nome] = secoes
+    return resultado
+
+
+def comparar(atual, baseline, tolerancia, piso_ms, piso_mb, piso_kb):
+    # Piora = acima da baseline pela tolerância relativa E por um piso absoluto (ruído de medição)
+    pioras = []
+    limites = [('tempo_ms', piso_ms, 1, "ms"), ('pico_bytes', piso_mb, 2**20, "MB"), ('payload_bytes', piso_kb, 1024, "KB")]
+    for chave, medida in atual.items():
+        referencia = baseline.get(chave)
+        if referencia is None:
+            continue
+        for campo, piso, escala, unidade in limites:
+            valor, base = medida[campo] / escala, referencia[campo] / escala
+            if valor > base * (1 + tolerancia) and valor - base > piso:
+                pioras.append(f"{chave} {campo}: {base:,.1f} -> {valor:,.1f} {unidade}")
+    return pioras
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--gravar-baseline", action="store_true")
+    parser.add_argument("--tolerancia", type=float, default=0.5)
+    parser.add_argument("--piso-ms", type=float, default=50)
+    parser.add_argument("--piso-mb", type=float, default=5)
+    parser.add_argument("--piso-kb", type=float, default=10)
+    args = parser.parse_args()
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    # Cache de Parquet, banco e perfil isolados: lidos do ambiente na importação dos módulos
+    pasta = tempfile.mkdtemp(prefix="pcp_bench_")
+    pasta_cache = os.path.join(pasta, "cache")
+    arquivo_perfil = os.path.join(pasta, "perfil.jsonl")
+    os.environ.update(
+        PCP_CACHE_DIR=pasta_cache,
+        PCP_BANCO_PLANEJAMENTO=os.path.join(pasta, "planejamento.db"),
+        PCP_PERFIL="1",
+        PCP_PERFIL_ARQUIVO=arquivo_perfil,
+    )
+    import streamlit as st
+
+    from benchmarks.sintetico import gerar_planejamento, planilha_em_disco
+    from pcp import banco_planejamento
+
+    banco = banco_planejamento.BancoPlanejamento()
+
+    def sessao_fria(planilha):
+        # Cada sessão começa sem datasets em memória nem Parquet em disco: a carga é medida do zero.
+        # O AppTest roda no mesmo processo, então os memos de módulo (fora do cache_resource)
+        # também são zerados; senão os KPIs e os agregados incrementais viriam quentes.
+        from paginas import _dados
+        from pcp import indicadores, planejamento
+
+        st.cache_resource.clear()
+        with indicadores._trava:
+            indicadores._memo.clear()
+        with _dados._trava:
+            _dados._ultimos.clear()
+        planejamento.amostra_cor.cache_clear()
+        shutil.rmtree(pasta_cache, ignore_errors=True)
+        return medir(planilha, raiz, arquivo_perfil)
+
+    # Aquecimento: importações e compilações do primeiro uso ficam fora das medidas
+    sessao_fria(planilha_em_disco(1_000))
+
+    atual = {}
+    try:
+        for n in sorted(args.linhas):
+            planilha = planilha_em_disco(n)
+            existentes = set(banco.tabela()["Lote"])
+            for registro in gerar_planejamento(_lotes_planejamento(n)):
+                if registro["Lote"] not in existentes:
+                    banco.adicionar(registro)
+
+            # Mediana de sessões repetidas: uma medida isolada de plotly/Styler oscila bastante
+            medidas = {}
+            for _ in range(args.repeticoes):
+                for interacao, secoes in sessao_fria(planilha).items():
+                    for secao, medida in secoes.items():
+                        medidas.setdefault(f"{n}|{interacao}|{secao}", []).append(medida)
+            for chave, repetidas in medidas.items():
+                atual[chave] = {
+                    campo: statistics.median(medida[campo] for medida in repetidas)
+                    for campo in ('tempo_ms', 'pico_bytes', 'payload_bytes')
+                }
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as entrada:
+            baseline = json.load(entrada)
+
+    print(f"{'linhas':>9} {'interação':<22} {'seção':<26} {'ms':>9} {'base ms':>9} {'pico MB':>8} {'payload KB':>11}")
+    for chave, medida in atual.items():
+        n, interacao, secao = chave.split("|")
+        base = baseline.get(chave, {}).get('tempo_ms')
+        print(
+            f"{int(n):>9,} {interacao:<22} {secao:<26} {medida['tempo_ms']:>9.1f} "
+            f"{'-' if base is None else f'{base:.1f}':>9} {medida['pico_bytes'] / 2**20:>8.1f} "
+            f"{medida['payload_bytes'] / 1024:>11.1f}"
+        )
+
+    if args.gravar_baseline:
+        # Tamanhos não medidos nesta execução continuam com a baseline anterior
+        baseline.update(atual)
+        with open(args.baseline, "w", encoding="utf-8") as saida:
+            json.dump(baseline, saida, ensure_ascii=False, indent=1, sort_keys=True)
+        print(f"baseline gravada em {args.baseline}")
+        return
+
+    pioras = comparar(atual, baseline, args.tolerancia, args.piso_ms, args.piso_mb, args.piso_kb)
+    if pioras:
+        print(f"\n{len(pioras)} regressões em relação à baseline:")
+        for piora in pioras:
+            print(f"  {piora}")
+        raise SystemExit(1)
+    print("\nsem regressões em relação à baseline" if baseline else "\nsem baseline para comparar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from pcp import planejamento
+
+# Mesmo esquema do export do ERP lido por Ofs.load_data
+CABECALHO = ['ORDEM_F', 'PLANO', 'SUB-G', 'INICIO', 'FINAL', 'PROGRAMADO', 'PRODUZIDO', 'SALDO']
+
+
+def gerar_dataframe(n_linhas, semente=42):
+    # Frame já no formato devolvido por load_data (colunas renomeadas, datas convertidas)
+    rng = np.random.default_rng(semente)
+    hoje = pd.Timestamp.today().normalize()
+
+    planos_pedido = [str(25000 + i) for i in range(1, 301)]
+    planos_paralelo = [f"P{i:04d}" for i in range(1, 101)]
+    planos = np.array(planos_pedido + planos_paralelo, dtype=object)
+
+    inicio = hoje + pd.to_timedelta(rng.integers(-400, 30, n_linhas), unit='D')
+    final = inicio + pd.to_timedelta(rng.integers(1, 60, n_linhas), unit='D')
+    programado = rng.integers(1, 500, n_linhas)
+    fechada = rng.random(n_linhas) < 0.6
+    produzido = np.where(fechada, programado, (programado * rng.random(n_linhas)).astype(int))
+
+    return pd.DataFrame({
+        'Ordem F': np.arange(1_000_000, 1_000_000 + n_linhas),
+        'Plano': planos[rng.integers(0, len(planos), n_linhas)],
+        'Sub-g': rng.integers(1, 4, n_linhas),
+        'Inicio': inicio,
+        'Final': final,
+        'PROGRAMADO': programado,
+        'PRODUZIDO': produzido,
+        'Saldo': programado - produzido,
+    })
+
+
+def gerar_planilha(n_linhas, semente=42):
+    df = gerar_dataframe(n_linhas, semente)
+    df['Inicio'] = df['Inicio'].dt.strftime('%d/%m/%Y')
+    df['Final'] = df['Final'].dt.strftime('%d/%m/%Y')
+
+    # write_only mantém a geração leve mesmo para milhões de linhas
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(CABECALHO)
+    for linha in df.itertuples(index=False):
+        ws.append([valor.item() if isinstance(valor, np.generic) else valor for valor in linha])
+    saida = io.BytesIO()
+    wb.save(saida)
+    return saida.getvalue()
+
+
+def planilha_em_disco(n_linhas, semente=42, pasta=None):
+    # Gerar milhões de linhas em xlsx leva minutos: cada tamanho é gerado uma vez e reaproveitado
+    pasta = pasta or os.path.join(tempfile.gettempdir(), "pcp_sintetico")
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"ofs_{n_linhas}_{semente}.xlsx")
+    if not os.path.exists(caminho):
+        temporario = caminho + ".parcial"
+        with open(temporario, "wb") as saida:
+            saida.write(gerar_planilha(n_linhas, semente))
+        os.replace(temporario, caminho)
+    return caminho
+
+
+def gerar_planejamento(n_lotes, semente=42):
+    # Lotes de planejamento com os mesmos números dos planos 25XXX do sintético (e além deles)
+    rng = np.random.default_rng(semente)
+    cores = ["pink", "magenta", "lightblue", "lightgreen", "orange", "gold"]
+    flags = rng.random((n_lotes, len(planejamento.FLAGS))) < 0.5
+    return [
+        {
+            "Lote": str(25001 + i),
+            "Descrição": f"LOTE SINTÉTICO {i + 1}",
+            "Cor": cores[i % len(cores)],
+            **{flag: bool(valor) for flag, valor in zip(planejamento.FLAGS, flags[i])},
+        }
+        for i in range(n_lotes)
+    ]
@@ -1,9 +1,12 @@
 import streamlit as st
 
+from paginas import _setores
+
 def main():
     st.title("Estamparia")
     st.write("bem vindo a estamparia aqui voce acompanha o que estamos produzindo")
     st.markdown("---")
+    _setores.mostrar_setor("Estamparia")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,4 +1,6 @@
+import os
 import streamlit as st
+from datetime import date
 
 def main():
     st.title("🏠 Página Inicial")
@@ -15,8 +17,30 @@ def main():
     
     with col2:
         st.subheader("Estatísticas Rápidas")
-        st.metric("Pedidos Hoje", 15)
-        st.metric("Produção Diária", "85%", "3%")
+        # pandas e o motor de KPIs só são importados quando já existe um dataset carregado
+        # (por upload na sessão ou pela pasta do ERP)
+        df = None
+        if "ofs_versao" in st.session_state or os.environ.get("PCP_PASTA_ERP"):
+            from paginas import _dados
+            df = _dados.dataset_atual()
+
+        if df is None:
+            st.info("Carregue o arquivo de OFs na página 🧾 Ofs para ver os indicadores.")
+        else:
+            import pandas as pd
+            from pcp import indicadores, ingestao
+
+            # Mesmo motor dos cards do dashboard de OFs, sem filtros
+            hoje = pd.to_datetime(date.today())
+            versao = ingestao.versao_dataset(df)
+            df = _dados.preparar(df, hoje)
+            kpis = indicadores.kpis(
+                (versao, hoje, ()),
+                _dados.codigos_kpi(versao, hoje, df),
+            )
+            st.metric("OFs Abertas", f"{kpis['abertas']:,}")
+            st.metric("OFs Atrasadas", f"{kpis['atrasadas']:,}")
+            st.metric("OFs Fechadas Hoje", f"{kpis['fechadas_hoje']:,}")
     
 
 if __name__ == "__main__":
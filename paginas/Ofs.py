@@ -1,11 +1,13 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, date, timedelta
-import plotly.express as px
+from datetime import date, timedelta
 
-# Custom CSS for KPIs
-st.markdown("""
+from pcp import armazenamento, filtros, graficos, indicadores, ingestao, serie_temporal
+from paginas import _dados, _exportacao, _graficos, _perfil
+
+# Custom CSS for KPIs (injetado só quando a página de OFs é aberta)
+def aplicar_estilo():
+    st.markdown("""
 <style>
     .kpi-card {
         background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
@@ -49,52 +51,64 @@ st.markdown("""
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # Initialize the DataFrame at the start to prevent NameError
 df = pd.DataFrame()
 
+def chave_upload(uploaded_file):
+    # Hash do conteúdo uma vez por arquivo enviado (file_id): um rerun não copia nem relê o upload
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id is None:
+        return ingestao.hash_conteudo(uploaded_file.getvalue())
+    hashes = st.session_state.setdefault("hashes_upload", {})
+    if file_id not in hashes:
+        hashes[file_id] = ingestao.hash_conteudo(uploaded_file.getvalue())
+    return hashes[file_id]
+
 # Load data function with improved error handling
-@st.cache_data
-def load_data(uploaded_file):
+def load_data(uploaded_files):
     try:
-        if uploaded_file is not None:
-            # Try with different engines if needed
-            try:
-                df = pd.read_excel(uploaded_file, engine='openpyxl')
-            except:
-                df = pd.read_excel(uploaded_file, engine='xlrd')
-            
-            # Check for required columns and rename if needed
-            column_mapping = {
-                'FINAL': 'Final',
-                'SALDO': 'Saldo',
-                'PLANO': 'Plano',
-                'ORDEM_F': 'Ordem F',
-                'SUB-G': 'Sub-g',
-                'INICIO': 'Inicio'
-            }
-            
-            # Rename columns if they exist with different names
-            for old_name, new_name in column_mapping.items():
-                if old_name in df.columns and new_name not in df.columns:
-                    df.rename(columns={old_name: new_name}, inplace=True)
-            
-            # Convert dates - handle errors
-            date_columns = ['Final', 'Inicio']
-            for col in date_columns:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], format='%d/%m/%Y', errors='coerce')
-                else:
+        if uploaded_files:
+            # Ordem por nome: com exports diários datados, o mais recente vence no dedup por OF
+            uploaded_files = sorted(uploaded_files, key=lambda arquivo: arquivo.name)
+            chaves = [chave_upload(uploaded_file) for uploaded_file in uploaded_files]
+            chave = ingestao.chave_combinada(chaves)
+
+            # O conteúdo só é lido se o dataset não estiver no registro
+            def arquivos():
+                return [(c, uploaded_file.getvalue()) for c, uploaded_file in zip(chaves, uploaded_files)]
+
+            progresso = st.progress(0.0, text="Processando arquivos de OFs...")
+
+            def ao_progredir(concluidos, total):
+                progresso.progress(concluidos / total, text=f"Processando arquivos de OFs... {concluidos}/{total}")
+
+            linhagem = armazenamento.linhagem_uploads([uploaded_file.name for uploaded_file in uploaded_files])
+            df = _dados.carregar_dataset(chave, arquivos, linhagem, ao_progredir)
+            progresso.empty()
+            if len(chaves) > 1:
+                st.caption(f"{len(chaves)} arquivos combinados: {len(df):,} OFs únicas")
+
+            delta = _dados.lojas().delta(chave)
+            if delta is not None and delta.versao_anterior is not None:
+                st.caption(
+                    f"Atualização desde o último export: {delta.inseridas:,} OFs novas, "
+                    f"{delta.alteradas:,} alteradas ({delta.fechadas:,} fechadas), "
+                    f"{delta.removidas:,} removidas"
+                )
+
+            metricas = _dados.registro_datasets().metricas()
+            st.caption(
+                f"Datasets em memória: {metricas['itens']} "
+                f"({metricas['bytes'] / 2**20:,.0f} de {metricas['orcamento_bytes'] / 2**20:,.0f} MB) · "
+                f"acertos {metricas['acertos']:,} · faltas {metricas['faltas']:,} · despejos {metricas['despejos']:,}"
+            )
+
+            for col in ingestao.COLUNAS_DATA:
+                if col not in df.columns:
                     st.warning(f"Column '{col}' not found in the Excel file")
-            
-            # Create Saldo column if it doesn't exist but we have PROGRAMADO and PRODUZIDO
-            if 'Saldo' not in df.columns and all(col in df.columns for col in ['PROGRAMADO', 'PRODUZIDO']):
-                df['Saldo'] = df['PROGRAMADO'] - df['PRODUZIDO']
-            
-            # Remove rows with invalid dates
-            df = df.dropna(subset=date_columns)
-            
+
             return df
         else:
             return pd.DataFrame()
@@ -103,19 +117,198 @@ def load_data(uploaded_file):
         st.error(f"Failed to load data: {str(e)}")
         return pd.DataFrame()  # Return empty DataFrame on error
 
+def mostrar_metricas_erp():
+    metricas = _dados.monitor_erp().metricas()
+    st.caption(
+        f"Dados da pasta do ERP: {metricas['arquivo']} · ingerido em "
+        f"{metricas['ultima_ingestao']:%d/%m/%Y %H:%M:%S} · {metricas['linhas']:,} OFs em "
+        f"{metricas['duracao_s']:.1f} s · {metricas['ingestoes']} ingestões"
+    )
+    if metricas['ultimo_erro']:
+        st.warning(f"Última falha de ingestão: {metricas['ultimo_erro']}")
+
+def mostrar_matriz_paginada(contagem_por_plano, contagem_porcentagem, linhas_por_pagina=50):
+    # Muitos planos: sem Styler (cores célula a célula), uma página de cada vez
+    paginas = (len(contagem_por_plano) - 1) // linhas_por_pagina + 1
+    st.caption(f"{len(contagem_por_plano):,} planos: tabela sem cores, {linhas_por_pagina} planos por página")
+    pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1, key="pagina_planos")
+    inicio = (pagina - 1) * linhas_por_pagina
+    fatia = slice(inicio, inicio + linhas_por_pagina)
+
+    col9, col10 = st.columns(2)
+    with col9:
+        st.write("**Quantidade por Plano (25XXX)**")
+        st.dataframe(contagem_por_plano.iloc[fatia], use_container_width=True)
+    with col10:
+        st.write("**Porcentagem por Plano (25XXX)**")
+        st.dataframe(
+            contagem_porcentagem.iloc[fatia],
+            column_config={col: st.column_config.NumberColumn(col, format="%.1f%%") for col in contagem_porcentagem.columns},
+            use_container_width=True,
+        )
+
+def mostrar_kpis(versao, hoje, chave, df, posicoes):
+    _perfil.marcar("kpis")
+    # Todos os cards saem de um único bincount, memorizado por dataset + filtros
+    kpis = indicadores.kpis((versao, hoje, chave), _dados.codigos_kpi(versao, hoje, df), posicoes)
+
+    # KPI cards
+    st.markdown('<div class="section-title">Indicadores Principais</div>', unsafe_allow_html=True)
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <div class="kpi-title">OFs Totais</div>
+            <div class="kpi-value">{kpis['totais']:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <div class="kpi-title">OFs Abertas</div>
+            <div class="kpi-value">{kpis['abertas']:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <div class="kpi-title">OFs Atrasadas</div>
+            <div class="kpi-value negative">{kpis['atrasadas']:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <div class="kpi-title">OFs Fechadas</div>
+            <div class="kpi-value positive">{kpis['fechadas']:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col5:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <div class="kpi-title">OFs Fechadas Hoje</div>
+            <div class="kpi-value positive">{kpis['fechadas_hoje']:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Fragmento: entradas = versão, dia e filtros (o dataset vem do registro, não fica na
+# sessão); o Período é local e roda só esta seção
+@st.fragment
+def mostrar_evolucao(versao, hoje, selecoes):
+    _perfil.marcar("evolução")
+    # Time evolution chart
+    st.markdown('<div class="section-title">Evolução de OFs Fechadas</div>', unsafe_allow_html=True)
+
+    # Time period filter
+    col6, col7, col8 = st.columns(3)
+    with col6:
+        periodo = st.selectbox("Período", ["Semanal", "Mensal", "Anual"], index=1)
+
+    # Série servida pelo cubo diário de fechadas (montado uma vez por dataset):
+    # o período vira um intervalo de dias e os filtros viram máscaras sobre o cubo
+    def montar():
+        data_fim = date.today()
+        data_inicio = data_fim - timedelta(days=serie_temporal.PERIODOS[periodo])
+        contagem_temporal = _dados.cubo_fechadas(versao, _dados.visao(versao, hoje)).serie(data_inicio, data_fim, selecoes, hoje)
+        return graficos.linhas(contagem_temporal['Periodo'], {'Quantidade': contagem_temporal['Quantidade']},
+                               f"Evolução de OFs Fechadas - {periodo}", espessura=3)
+
+    # Figura em cache por dataset + filtros + período
+    _graficos.mostrar("evolução", (versao, hoje, filtros.chave_filtros(selecoes), periodo), montar)
+
+def mostrar_ultimas_entregues(versao, hoje, chave, df, posicoes):
+    _perfil.marcar("últimas OFs")
+    # Últimas OFs Entregues
+    st.markdown('<div class="section-title">Últimas OFs Entregues</div>', unsafe_allow_html=True)
+
+    # Fechadas mais recentes do filtro, em cache por dataset + filtros (só 10 linhas legíveis)
+    st.dataframe(
+        _dados.ultimas_entregues(versao, hoje, chave, df, posicoes),
+        use_container_width=True
+    )
+
+# Fragmento: entradas = versão, dia e filtros; a página da tabela é local
+@st.fragment
+def mostrar_analise_planos(versao, hoje, selecoes):
+    _perfil.marcar("análise por plano")
+    # Plan analysis section
+    st.markdown('<div class="section-title">Análise por Plano</div>', unsafe_allow_html=True)
+
+    # Matriz Plano x status dos planos 25XXX, mantida por versão; tabelas e cores em cache por filtro
+    matriz = _dados.matriz(versao, hoje, _dados.visao(versao, hoje))
+    contagem_por_plano, contagem_porcentagem, css_contagem, css_porcentagem = matriz.tabelas(
+        filtros.chave_filtros(selecoes), selecoes
+    )
+    if not contagem_por_plano.empty:
+        if css_contagem is not None:
+            col9, col10 = st.columns(2)
+            with col9:
+                st.write("**Quantidade por Plano (25XXX)**")
+                st.dataframe(contagem_por_plano.style.apply(lambda _: css_contagem, axis=None),
+                            use_container_width=True)
+
+            with col10:
+                st.write("**Porcentagem por Plano (25XXX)**")
+                st.dataframe(contagem_porcentagem.style.format("{:.1f}%").apply(lambda _: css_porcentagem, axis=None),
+                            use_container_width=True)
+        else:
+            mostrar_matriz_paginada(contagem_por_plano, contagem_porcentagem)
+    else:
+        st.warning("Nenhum plano 25XXX encontrado para análise.")
+
+def mostrar_distribuicao(versao, hoje, chave, df, posicoes):
+    _perfil.marcar("distribuição")
+    # Pie charts section
+    st.markdown('<div class="section-title">Distribuição de OFs</div>', unsafe_allow_html=True)
+
+    # Contagens por Tipo_Lote e por setor, em cache por dataset + filtros
+    tipo_lote_count, sub_g_count = _dados.distribuicao(versao, hoje, chave, df, posicoes)
+
+    # Create two columns
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Plotting the pie chart for Tipo_Lote
+        _graficos.mostrar("tipo de lote", (versao, hoje, chave), lambda: graficos.pizza(
+            tipo_lote_count, "Distribuição por Tipo de Lote",
+            {'Pedido': 'lightblue', 'Paralelo': 'lightgreen'},
+        ))
+
+    with col2:
+        # Plotting the pie chart for Sub-g
+        _graficos.mostrar("sub-grupo", (versao, hoje, chave), lambda: graficos.pizza(
+            sub_g_count, "Distribuição por Sub-grupo",
+            {'Montagem': 'lightcoral', 'Solda': 'lightblue', 'Estamparia': 'lightgreen'},
+        ))
+
 def main():
+    aplicar_estilo()
     st.title("🧾 Dashboard de Ordens de Fabricação")
     st.markdown("---")
     
+    _perfil.marcar("carga")
     # Upload file in main content (not sidebar)
     with st.expander("📤 Carregar Dados", expanded=True):
-        uploaded_file = st.file_uploader("Selecione o arquivo Excel com os dados das OFs", type=["xlsx", "xls"])
+        uploaded_files = st.file_uploader(
+            "Selecione um ou mais arquivos Excel com os dados das OFs",
+            type=["xlsx", "xls"],
+            accept_multiple_files=True,
+        )
         
-        if uploaded_file is not None:
-            df = load_data(uploaded_file)
+        if uploaded_files:
+            df = load_data(uploaded_files)
         else:
-            st.warning("Por favor, carregue um arquivo Excel para visualizar o dashboard")
-            return
+            # Sem upload, o dashboard segue o último export ingerido da pasta do ERP
+            df = _dados.dataset_erp()
+            if df is None:
+                st.warning("Por favor, carregue um arquivo Excel para visualizar o dashboard")
+                return
+            mostrar_metricas_erp()
 
     # Data processing
     if not df.empty:
@@ -129,13 +322,18 @@ def main():
             st.error(f"Colunas obrigatórias faltando: {', '.join(missing_columns)}")
             return
 
+        _perfil.marcar("preparo")
         # Process data
-        df['Situação'] = np.where(df["Final"] > hoje, 'futura', 'atrasada')
-        df['status'] = df['Saldo'].apply(lambda x: 'fechada' if x == 0 else 'aberta')
-        df['Tipo_Lote'] = df['Plano'].astype(str).apply(
-            lambda x: 'Pedido' if x.startswith('25') and len(x) == 5 else 'Paralelo'
-        )
+        versao = ingestao.versao_dataset(df)
+        df = _dados.preparar(df, hoje)
+        if uploaded_files:
+            _dados.guardar_dataset(versao)
+        else:
+            _dados.esquecer_dataset()
+
+        indice = _dados.indice_filtros(versao, hoje, df)
 
+        _perfil.marcar("filtros")
         # Filters in main content
         with st.expander("🔍 Filtros", expanded=True):
             col1, col2, col3, col4 = st.columns(4)
@@ -144,13 +342,13 @@ def main():
                 # Filter by lot type
                 tipo_lote = st.multiselect(
                     "Tipo de Lote",
-                    options=df['Tipo_Lote'].unique(),
-                    default=df['Tipo_Lote'].unique()
+                    options=indice.valores('Tipo_Lote'),
+                    default=indice.valores('Tipo_Lote')
                 )
             
             with col2:
                 # Filter by plan
-                planos_disponiveis = df['Plano'].unique()
+                planos_disponiveis = indice.valores('Plano')
                 plano_selecionado = st.multiselect(
                     "Plano",
                     options=planos_disponiveis,
@@ -159,7 +357,7 @@ def main():
             
             with col3:
                 # Filter by status
-                status_options = df['status'].unique()
+                status_options = indice.valores('status')
                 status_selecionado = st.multiselect(
                     "Status",
                     options=status_options,
@@ -168,184 +366,32 @@ def main():
             
             with col4:
                 # Filter by situation
-                situacao_options = df['Situação'].unique()
+                situacao_options = indice.valores('Situação')
                 situacao_selecionado = st.multiselect(
                     "Situação",
                     options=situacao_options,
                     default=situacao_options
                 )
 
-        # Apply filters
-        df_filtrado = df.copy()
-        if tipo_lote:
-            df_filtrado = df_filtrado[df_filtrado['Tipo_Lote'].isin(tipo_lote)]
-        if plano_selecionado:
-            df_filtrado = df_filtrado[df_filtrado['Plano'].isin(plano_selecionado)]
-        if status_selecionado:
-            df_filtrado = df_filtrado[df_filtrado['status'].isin(status_selecionado)]
-        if situacao_selecionado:
-            df_filtrado = df_filtrado[df_filtrado['Situação'].isin(situacao_selecionado)]
-
-        # KPI cards
-        st.markdown('<div class="section-title">Indicadores Principais</div>', unsafe_allow_html=True)
-        col1, col2, col3, col4, col5 = st.columns(5)
-
-        with col1:
-            st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-title">OFs Totais</div>
-                <div class="kpi-value">{len(df_filtrado):,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col2:
-            st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-title">OFs Abertas</div>
-                <div class="kpi-value">{(df_filtrado['status'] == 'aberta').sum():,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col3:
-            ofs_atrasadas_abertas = df_filtrado[
-                (df_filtrado['Situação'] == 'atrasada') & (df_filtrado['status'] == 'aberta')
-            ].shape[0]
-            
-            st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-title">OFs Atrasadas</div>
-                <div class="kpi-value negative">{ofs_atrasadas_abertas:,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col4:
-            st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-title">OFs Fechadas</div>
-                <div class="kpi-value positive">{(df_filtrado['status'] == 'fechada').sum():,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col5:
-            ofs_fechadas_hoje = df_filtrado[
-                (df_filtrado['status'] == 'fechada') & 
-                (df_filtrado['Final'].dt.date == date.today())
-            ].shape[0]
-            st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-title">OFs Fechadas Hoje</div>
-                <div class="kpi-value positive">{ofs_fechadas_hoje:,}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        # Time evolution chart
-        st.markdown('<div class="section-title">Evolução de OFs Fechadas</div>', unsafe_allow_html=True)
-
-        # Time period filter
-        col6, col7, col8 = st.columns(3)
-        with col6:
-            periodo = st.selectbox("Período", ["Semanal", "Mensal", "Anual"], index=1)
-
-        # Prepare data for the chart
-        df_fechadas = df_filtrado[df_filtrado['status'] == 'fechada'].copy()
-        df_fechadas = df_fechadas.dropna(subset=['Final'])
-        df_fechadas['Final'] = pd.to_datetime(df_fechadas['Final'], errors='coerce')
-
-        # Define o intervalo de datas
-        data_fim = date.today()
-        if periodo == "Semanal":
-            data_inicio = data_fim - timedelta(days=7)
-        elif periodo == "Mensal":
-            data_inicio = data_fim - timedelta(days=30)
-        else:  # Anual
-            data_inicio = data_fim - timedelta(days=365)
-
-        # Gera a série de datas
-        datas_completas = pd.date_range(start=data_inicio, end=data_fim).date
-
-        # Agrupa as OFs fechadas por data
-        df_fechadas['Periodo'] = df_fechadas['Final'].dt.date
-        contagem_temporal = df_fechadas.groupby('Periodo').size()
-
-        # Reindexa para incluir todas as datas no range
-        contagem_temporal = contagem_temporal.reindex(datas_completas, fill_value=0).reset_index()
-        contagem_temporal.columns = ['Periodo', 'Quantidade']
-
-        # Plotly chart
-        fig = px.line(contagem_temporal, x='Periodo', y='Quantidade',
-                    title=f"Evolução de OFs Fechadas - {periodo}",
-                    markers=True, line_shape='spline')
-        fig.update_traces(line=dict(width=3))
-        fig.update_layout(hovermode="x unified")
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Últimas OFs Entregues
-        st.markdown('<div class="section-title">Últimas OFs Entregues</div>', unsafe_allow_html=True)
-
-        # Filtro para fechadas, ordena pela data final decrescente
-        ultimas_entregues = df_filtrado[df_filtrado['status'] == 'fechada'].sort_values('Final', ascending=False).head(10)
-
-        # Exibe a tabela
-        st.dataframe(
-            ultimas_entregues[['Ordem F', 'Plano', 'Sub-g', 'status', 'Final']],
-            use_container_width=True
-        )
-
-        # Plan analysis section
-        st.markdown('<div class="section-title">Análise por Plano</div>', unsafe_allow_html=True)
-
-        # Filter only 25XXX plans for specific analysis
-        df_25xxx = df_filtrado[df_filtrado['Plano'].astype(str).str.match(r'^25\d{3}$')]
-        if not df_25xxx.empty:
-            contagem_por_plano = df_25xxx.groupby(['Plano', 'status']).size().unstack(fill_value=0)
-            total_por_plano = contagem_por_plano.sum(axis=1)
-            contagem_porcentagem = (contagem_por_plano.div(total_por_plano, axis=0)) * 100
-
-            col9, col10 = st.columns(2)
-            with col9:
-                st.write("**Quantidade por Plano (25XXX)**")
-                st.dataframe(contagem_por_plano.style.background_gradient(cmap='Blues'), 
-                            use_container_width=True)
-
-            with col10:
-                st.write("**Porcentagem por Plano (25XXX)**")
-                st.dataframe(contagem_porcentagem.style.format("{:.1f}%").background_gradient(cmap='Greens'), 
-                            use_container_width=True)
-        else:
-            st.warning("Nenhum plano 25XXX encontrado para análise.")
-
-        # Pie charts section
-        st.markdown('<div class="section-title">Distribuição de OFs</div>', unsafe_allow_html=True)
-
-        # Create two columns
-        col1, col2 = st.columns(2)
-
-        with col1:
-            # Count the occurrences of each Tipo_Lote
-            tipo_lote_count = df_filtrado['Tipo_Lote'].value_counts()
-
-            # Plotting the pie chart for Tipo_Lote
-            fig_tipo_lote = px.pie(tipo_lote_count, values=tipo_lote_count.values, names=tipo_lote_count.index, 
-                                title="Distribuição por Tipo de Lote", 
-                                color=tipo_lote_count.index, 
-                                color_discrete_map={'Pedido': 'lightblue', 'Paralelo': 'lightgreen'})
-            fig_tipo_lote.update_traces(textinfo='percent+label', pull=[0.1, 0.1])
-            st.plotly_chart(fig_tipo_lote, use_container_width=True)
-
-        with col2:
-            # Mapping sub-g values to the specific categories
-            df_filtrado['Sub-g'] = df_filtrado['Sub-g'].replace({1: 'Montagem', 2: 'Solda', 3: 'Estamparia'})
-
-            # Count the occurrences of each Sub-g category
-            sub_g_count = df_filtrado['Sub-g'].value_counts()
-
-            # Plotting the pie chart for Sub-g
-            fig_sub_g = px.pie(sub_g_count, values=sub_g_count.values, names=sub_g_count.index, 
-                            title="Distribuição por Sub-grupo", 
-                            color=sub_g_count.index, 
-                            color_discrete_map={'Montagem': 'lightcoral', 'Solda': 'lightblue', 'Estamparia': 'lightgreen'})
-            fig_sub_g.update_traces(textinfo='percent+label', pull=[0.1, 0.1, 0.1])
-            st.plotly_chart(fig_sub_g, use_container_width=True)
+        # Apply filters: operações de bitmap no índice devolvem as posições das linhas,
+        # sem copiar o frame inteiro a cada mudança de filtro
+        selecoes = {
+            'Tipo_Lote': tipo_lote,
+            'Plano': plano_selecionado,
+            'status': status_selecionado,
+            'Situação': situacao_selecionado,
+        }
+        posicoes = indice.filtrar(selecoes)
+        chave = filtros.chave_filtros(selecoes)
+        _exportacao.mostrar_exportacao(versao, hoje, selecoes)
+
+        # Cada seção recebe só o que usa; as que têm widget próprio são fragmentos
+        # e, ao mexer nesse widget, só elas rodam de novo
+        mostrar_kpis(versao, hoje, chave, df, posicoes)
+        mostrar_evolucao(versao, hoje, selecoes)
+        mostrar_ultimas_entregues(versao, hoje, chave, df, posicoes)
+        mostrar_analise_planos(versao, hoje, selecoes)
+        mostrar_distribuicao(versao, hoje, chave, df, posicoes)
     else:
         st.warning("Nenhum dado válido encontrado no arquivo carregado.")
 
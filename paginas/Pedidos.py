@@ -1,8 +1,11 @@
 import streamlit as st
 
+from paginas import _pedidos
+
 def main():
     st.title("Pedidos Maquinas")
     st.markdown("---")
-    st.write("adijwefiejfuiefijeiofiejfioeiojeiojfijeifji9ewjfiejwfijewifjiew9fji9ewjfi9ewj")
+    _pedidos.mostrar_pedidos("Pedido")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
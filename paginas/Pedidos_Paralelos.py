@@ -1,15 +1,11 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime
-import os
-
-
 
+from paginas import _pedidos
 
 def main():
     st.title("📊 Painel de Pedidos Paralelos")
     st.markdown("---")
-   
+    _pedidos.mostrar_pedidos("Paralelo")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,19 +1,159 @@
+from datetime import date
+
+import pandas as pd
 import streamlit as st
 
+from pcp import banco_planejamento, ingestao, planejamento, programacao
+from paginas import _dados
+
+ALTURA_GRADE = 600
+
+# Linhas da sequência mostradas por setor
+LINHAS_SEQUENCIA = 200
+
+
+def aplicar_edicoes():
+    # Callback da grade: grava só as células alteradas, numa transação, contra a versão lida
+    edicoes = st.session_state.grade_planejamento["edited_rows"]
+    mudancas = planejamento.mudancas(st.session_state.planejamento_lido, edicoes)
+    if mudancas:
+        st.session_state.conflitos_planejamento = _dados.banco().aplicar_mudancas(mudancas)
+
+
+def capacidades_padrao(df, hoje):
+    # Ponto de partida: produzido por dia nos últimos 30 dias, concentrado nos dias úteis.
+    # Sem produção registrada, a estimativa pelo saldo e prazo das OFs abertas.
+    painel = _dados.painel_setores(ingestao.versao_dataset(df), df)
+    dias_semana = 7 / len(programacao.DIAS_UTEIS)
+    capacidades = {
+        setor: round(float(painel.vazao(setor, hoje, 30)['Produzido'].mean()) * dias_semana)
+        for setor in painel.setores()
+    }
+    if not all(capacidade > 0 for capacidade in capacidades.values()):
+        estimadas = programacao.capacidades_estimadas(df)
+        capacidades = {
+            setor: capacidade if capacidade > 0 else estimadas.get(setor, 0)
+            for setor, capacidade in capacidades.items()
+        }
+    return pd.DataFrame(
+        {"Capacidade por dia útil": list(capacidades.values())},
+        index=pd.Index(list(capacidades), name="Setor"),
+    )
+
+
+def guardar_edicoes(chave, coluna):
+    # Callback dos editores do sequenciamento: as edições ficam na sessão por setor/lote.
+    # Os dados do editor mudam com o dataset e com a grade de lotes (e o Streamlit dá outra
+    # identidade ao widget), então as edições não podem morar só no estado do widget.
+    editadas = st.session_state.setdefault(f"{chave}_editadas", {})
+    mostradas = st.session_state[f"{chave}_mostradas"]
+    for linha, valores in st.session_state[chave]["edited_rows"].items():
+        if coluna not in valores:
+            continue
+        if valores[coluna] is None:
+            editadas.pop(mostradas[linha], None)
+        else:
+            editadas[mostradas[linha]] = valores[coluna]
+
+
+def com_edicoes(tabela, chave, coluna, identificador):
+    # Padrões do dataset com as edições da sessão por cima
+    editadas = st.session_state.get(f"{chave}_editadas", {})
+    tabela = tabela.copy()
+    tabela[coluna] = [
+        editadas.get(valor, padrao) for valor, padrao in zip(identificador(tabela), tabela[coluna])
+    ]
+    st.session_state[f"{chave}_mostradas"] = list(identificador(tabela))
+    return tabela
+
+
+def prioridades_padrao(lidos):
+    # Lotes marcados para programar vêm primeiro; os da planilha fora da tabela ficam no fim
+    return pd.DataFrame({
+        "Lote": lidos["Lote"],
+        "Descrição": lidos["Descrição"],
+        "Prioridade": [1 if programar else programacao.PRIORIDADE_PADRAO for programar in lidos["Programar"]],
+    })
+
+
+# Fragmento: editar capacidade ou prioridade só refaz o sequenciamento
+@st.fragment
+def mostrar_sequenciamento(lidos):
+    st.subheader("Sequenciamento com capacidade finita")
+    df = _dados.dataset_atual()
+    if df is None:
+        st.info("Carregue o arquivo de OFs na página 🧾 Ofs para sequenciar as OFs abertas.")
+        return
+
+    # Sob demanda: abrir a página (ou editar a grade de lotes) não roda o sequenciamento.
+    # Depois do primeiro pedido na sessão, cada programação fica em cache por dataset,
+    # capacidades e prioridades.
+    if not st.session_state.get("sequenciar_ofs"):
+        if not st.button("Sequenciar OFs abertas", key="botao_sequenciar"):
+            return
+        st.session_state.sequenciar_ofs = True
+
+    hoje = pd.Timestamp(date.today())
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        capacidades = st.data_editor(
+            com_edicoes(capacidades_padrao(df, hoje), "capacidade_setores", "Capacidade por dia útil",
+                        lambda tabela: tabela.index),
+            key="capacidade_setores",
+            on_change=guardar_edicoes,
+            args=("capacidade_setores", "Capacidade por dia útil"),
+            column_config={"Capacidade por dia útil": st.column_config.NumberColumn(min_value=0, format="%.0f")},
+            use_container_width=True,
+        )
+    with col2:
+        prioridades = st.data_editor(
+            com_edicoes(prioridades_padrao(lidos), "prioridades_lotes", "Prioridade", lambda tabela: tabela["Lote"]),
+            key="prioridades_lotes",
+            on_change=guardar_edicoes,
+            args=("prioridades_lotes", "Prioridade"),
+            column_config={"Prioridade": st.column_config.NumberColumn(min_value=0, step=1, help="Menor primeiro")},
+            disabled=["Lote", "Descrição"],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    resultado = _dados.programacao_finita(
+        ingestao.versao_dataset(df), hoje,
+        tuple(sorted(capacidades["Capacidade por dia útil"].fillna(0).items())),
+        tuple(sorted(zip(prioridades["Lote"], prioridades["Prioridade"].fillna(programacao.PRIORIDADE_PADRAO).astype(int)))),
+        df,
+    )
+    if resultado.sem_capacidade:
+        st.warning(f"Setores sem capacidade, não sequenciados: {', '.join(resultado.sem_capacidade)}")
+    resumo = resultado.resumo()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("OFs programadas", f"{int(resumo['OFs'].sum()):,}")
+    col2.metric("Atrasadas previstas", f"{int(resumo['Atrasadas previstas'].sum()):,}")
+    fim = resumo['Fim da carteira'].max()
+    col3.metric("Fim da carteira", "-" if pd.isna(fim) else fim.strftime("%d/%m/%Y"))
+    st.dataframe(resumo, use_container_width=True, column_config={
+        "Fim da carteira": st.column_config.DateColumn(format="DD/MM/YYYY"),
+    })
+
+    if len(resumo):
+        setor = st.selectbox("Setor", list(resumo.index), key="setor_sequenciamento")
+        sequencia = resultado.resultado()
+        sequencia = sequencia[sequencia['Setor'] == setor].head(LINHAS_SEQUENCIA)
+        st.dataframe(sequencia.drop(columns='Setor'), hide_index=True, use_container_width=True, column_config={
+            col: st.column_config.DateColumn(format="DD/MM/YYYY")
+            for col in ['Liberação', 'Início previsto', 'Fim previsto', 'Final']
+        })
+
+
 def main():
     st.title("Programação")
     st.markdown("---")
     
-    # Inicializar dados na session state se não existirem
-    if 'dados' not in st.session_state:
-        st.session_state.dados = [
-            {"Lote": "24328", "Descrição": "PLANTADEIRAS AGCO", "Cor": "pink", "Programar": True, "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": True},
-            {"Lote": "24431", "Descrição": "PLAINAS C", "Cor": "magenta", "Programar": True, "Cálculo NEC": True, "Gerar SOC": True, "E-mail SOC": True, "Gerar OF": True},
-        ]
-    
+    banco = _dados.banco()
+
     # Formulário para adicionar nova OF
     with st.expander("➕ Adicionar novo Lote"):
-        with st.form("nova_of"):
+        with st.form("nova_of", clear_on_submit=True):
             lote = st.text_input("Lote")
             descricao = st.text_input("Descrição")
             cor = st.color_picker("Cor do Lote", "#FF69B4")
@@ -36,40 +176,42 @@ def main():
                     "E-mail SOC": email_soc,
                     "Gerar OF": gerar_of
                 }
-                st.session_state.dados.append(novo_item)
-                st.success(f"Nova OF '{lote}' adicionada!")
-                st.rerun()
-    
-    # Cabeçalho da tabela
-    cabecario = st.columns([0.8, 2, 1, 1, 1, 1, 1, 1])
-
-    with cabecario[0]: st.markdown("**Lote**")
-    with cabecario[1]: st.markdown("**Descrição**")
-    with cabecario[2]: st.markdown("**Cor**")
-    with cabecario[3]: st.markdown("**Programar**")
-    with cabecario[4]: st.markdown("**Cálculo NEC**")
-    with cabecario[5]: st.markdown("**Gerar SOC**")
-    with cabecario[6]: st.markdown("**E-mail SOC**")
-    with cabecario[7]: st.markdown("**Gerar OF**")
-    
-    # Renderizar tabela com checkboxes editáveis
-    for i, item in enumerate(st.session_state.dados):
-        cols = st.columns([0.8, 2, 1, 1, 1, 1, 1, 1])
-
-        with cols[0]: st.markdown(f"**{item['Lote']}**")
-        with cols[1]: st.markdown(item['Descrição'])
-        with cols[2]: st.markdown(f"<div style='width:25px;height:25px;background-color:{item['Cor']};border-radius:4px'></div>", unsafe_allow_html=True)
-
-        with cols[3]:
-            st.session_state.dados[i]['Programar'] = st.checkbox("", value=item['Programar'], key=f"prog_{i}")
-        with cols[4]:
-            st.session_state.dados[i]['Cálculo NEC'] = st.checkbox("", value=item['Cálculo NEC'], key=f"nec_{i}")
-        with cols[5]:
-            st.session_state.dados[i]['Gerar SOC'] = st.checkbox("", value=item['Gerar SOC'], key=f"soc_{i}")
-        with cols[6]:
-            st.session_state.dados[i]['E-mail SOC'] = st.checkbox("", value=item['E-mail SOC'], key=f"email_{i}")
-        with cols[7]:
-            st.session_state.dados[i]['Gerar OF'] = st.checkbox("", value=item['Gerar OF'], key=f"of_{i}")
+                # A grade é montada depois do formulário, então já sai com o lote novo sem st.rerun()
+                try:
+                    banco.adicionar(novo_item)
+                    st.success(f"Nova OF '{lote}' adicionada!")
+                except banco_planejamento.LoteExistente:
+                    st.error(f"O lote '{lote}' já existe.")
+
+    conflitos = st.session_state.pop("conflitos_planejamento", [])
+    if conflitos:
+        st.warning(f"Lotes alterados por outro planejador, recarregados sem a sua edição: {', '.join(conflitos)}")
+
+    # Leitura em cache no banco; a versão de cada lote acompanha a tabela para a edição otimista
+    st.session_state.planejamento_lido = banco.tabela()
+
+    # Uma única grade editável (renderização virtualizada) no lugar de uma linha de widgets por lote
+    config_flags = {col: st.column_config.CheckboxColumn(col) for col in planejamento.FLAGS}
+    st.data_editor(
+        planejamento.visao_grade(st.session_state.planejamento_lido),
+        key="grade_planejamento",
+        on_change=aplicar_edicoes,
+        column_config={
+            "Lote": st.column_config.TextColumn("Lote"),
+            "Descrição": st.column_config.TextColumn("Descrição", width="large"),
+            "Cor": st.column_config.ImageColumn("Cor", width="small"),
+            **config_flags,
+        },
+        disabled=["Lote", "Descrição", "Cor"],
+        hide_index=True,
+        num_rows="fixed",
+        use_container_width=True,
+        column_order=planejamento.COLUNAS,
+        height=min(ALTURA_GRADE, 38 + 35 * len(st.session_state.planejamento_lido)),
+    )
+
+    st.markdown("---")
+    mostrar_sequenciamento(st.session_state.planejamento_lido)
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,11 @@
 import streamlit as st
 
+from paginas import _setores
+
 def main():
     st.title("Produção")
     st.markdown("---")
-    
+    _setores.mostrar_geral()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
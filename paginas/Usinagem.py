@@ -1,8 +1,11 @@
 import streamlit as st
 
+from paginas import _setores
+
 def main():
     st.title("Usinagem")
     st.markdown("---")
-    
+    _setores.mostrar_setor("Usinagem")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1 +1,29 @@
+# Registro das páginas: só metadados na partida. O módulo de cada página (e o que ele
+# importa: pandas, plotly...) só é carregado quando a página é aberta pela primeira vez.
+# Cada seção: (subtítulo, [(módulo, rótulo do botão, key do botão)], divisória no final)
+SECOES = [
+    (None, [
+        ("Inicio", "🏠 Página Inicial", "inicio"),
+    ], True),
+    ("📝 Acompanhar Pedidos", [
+        ("Pedidos", "📝 Pedidos", "pedidos"),
+        ("Pedidos_Paralelos", "📝 Pedidos Paralelos", "pedidos_paralelos"),
+    ], True),
+    ("🔎 Controle", [
+        ("Lotes", "📚 Lotes", "lotes"),
+        ("Ofs", "🧾 Ofs", "ofs"),
+        ("Estoque", "📦 Estoque", "estoque"),
+    ], False),
+    ("📋 Planejamento", [
+        ("Planejamento", "📋 Programação", "programação"),
+    ], False),
+    ("🏭 Produção", [
+        ("Producao_Geral", "📊 Produção Geral", "producao"),
+        ("Usinagem", "⚙️ Usinagem", "usinagem"),
+        ("Estamparia", "🪚 Estamparia", "estamparia"),
+        ("Solda", "🔧 Solda", "solda"),
+        ("Montagem", "🧩 Montagem", "montagem"),
+    ], False),
+]
 
+PAGINAS = {nome: rotulo for _, itens, _ in SECOES for nome, rotulo, _ in itens}
@@ -0,0 +1,258 @@
+import os
+import threading
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from pcp import armazenamento, banco_planejamento, classificacao, compacto, filtros, indicadores, ingestao, lotes, matriz_planos, monitor, pedidos, programacao, registro, serie_temporal, setores
+
+# Acesso ao dataset de OFs compartilhado entre as páginas.
+# Os caches ficam aqui para que todas as páginas reaproveitem os mesmos resultados.
+
+
+# Último agregado montado de cada tipo, para atualizar a partir do delta da loja
+_ultimos = {}
+_trava = threading.Lock()
+
+
+# Datasets compartilhados por todas as sessões do processo
+@st.cache_resource(show_spinner=False)
+def registro_datasets():
+    return registro.RegistroDatasets()
+
+
+# Uma loja de deltas por linhagem de dataset (pasta do ERP, família de uploads)
+@st.cache_resource(show_spinner=False)
+def lojas():
+    return armazenamento.LojasOfs()
+
+
+# Lotes de planejamento: um pool de conexões SQLite por processo
+@st.cache_resource(show_spinner=False)
+def banco():
+    return banco_planejamento.BancoPlanejamento()
+
+
+def registrar_export(df, versao, linhagem):
+    # Chamado uma vez por conteúdo novo (dentro do parse cacheado). A loja guarda só os
+    # hashes; as linhas antigas vêm do dataset anterior se ainda estiver no registro.
+    return lojas().aplicar_export(df, versao, linhagem, registro_datasets().residente)
+
+
+def _incremental(nome, versao, construir, atualizar, contexto=None):
+    # Se a versão pedida veio de um delta sobre a última montada, atualiza em vez de remontar.
+    # contexto: o que mais o agregado depende (ex.: o dia); se mudou, remonta.
+    delta = lojas().delta(versao)
+    with _trava:
+        anterior = _ultimos.get(nome)
+    if delta is not None and anterior is not None and anterior[0] == (delta.versao_anterior, contexto):
+        objeto = atualizar(anterior[1], delta)
+    else:
+        objeto = construir()
+    with _trava:
+        _ultimos[nome] = ((versao, contexto), objeto)
+    return objeto
+
+
+def carregar_dataset(chave, arquivos, linhagem, ao_progredir=None):
+    # arquivos: [(chave, conteúdo)], ou uma função que devolve essa lista (chamada só se o
+    # dataset não estiver em memória). Parse (ou Parquet já convertido) só na primeira sessão
+    # que pedir esta combinação; várias planilhas são convertidas em paralelo.
+    # linhagem: de onde vêm os exports; o delta é contra o último export da mesma linhagem
+    def carregar():
+        lista = arquivos() if callable(arquivos) else arquivos
+        # Em memória fica a forma compacta (category, dias int32, números reduzidos)
+        df = compacto.compactar(ingestao.carregar_varias(lista, ao_progredir))
+        # Diff contra a loja local: grava só as OFs que mudaram desde o último export
+        registrar_export(df, chave, linhagem)
+        return df
+    return registro_datasets().obter(chave, carregar)
+
+
+def recarregar_dataset(versao):
+    # Dataset que o registro despejou: volta do Parquet convertido, sem reler a planilha.
+    # Não passa pela loja: a versão já foi comparada quando entrou, e a loja pode estar
+    # numa versão mais nova. Sem o Parquet (cache apagado), None.
+    if not os.path.exists(ingestao.caminho_cache(versao)):
+        return registro_datasets().obter(versao)
+    return registro_datasets().obter(
+        versao, lambda: compacto.compactar(ingestao.carregar_varias([(versao, None)]))
+    )
+
+
+# Classificação por dataset e dia; mudar um filtro não recalcula nada
+@st.cache_resource(max_entries=8, show_spinner=False)
+def classificar(versao, hoje, _df):
+    return classificacao.classificar(_df, hoje)
+
+
+# Índice de filtros compartilhado (cache_resource não copia); só é lido depois de montado
+@st.cache_resource(max_entries=8, show_spinner=False)
+def indice_filtros(versao, hoje, _df):
+    return filtros.IndiceFiltro(_df)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def codigos_kpi(versao, hoje, _df):
+    return indicadores.codigos_kpi(_df, hoje)
+
+
+# O cubo só depende de status e Tipo_Lote, então não muda de um dia para o outro
+@st.cache_resource(max_entries=8, show_spinner=False)
+def cubo_fechadas(versao, _df):
+    return _incremental(
+        'cubo_fechadas', versao,
+        lambda: serie_temporal.CuboFechadas(_df),
+        lambda cubo, delta: cubo.atualizar(delta),
+    )
+
+
+# Progresso por lote: somas aditivas, então um export novo só recalcula os lotes tocados
+@st.cache_resource(max_entries=8, show_spinner=False)
+def progresso_lotes(versao, _df):
+    return _incremental(
+        'progresso_lotes', versao,
+        lambda: lotes.ProgressoLotes(_df),
+        lambda progresso, delta: progresso.atualizar(delta),
+    )
+
+
+# Somas por setor e dia do Final, já particionadas: as páginas de produção só leem a fatia do setor
+@st.cache_resource(max_entries=8, show_spinner=False)
+def painel_setores(versao, _df):
+    return _incremental(
+        'painel_setores', versao,
+        lambda: setores.PainelSetores(_df),
+        lambda painel, delta: painel.atualizar(delta),
+    )
+
+
+# Pedidos por plano ordenados por prazo: as páginas de pedidos consultam por busca binária
+@st.cache_resource(max_entries=8, show_spinner=False)
+def indice_pedidos(versao, _df):
+    return _incremental(
+        'indice_pedidos', versao,
+        lambda: pedidos.IndicePedidos(_df),
+        lambda indice, delta: indice.atualizar(delta),
+    )
+
+
+# Sequenciamento com capacidade finita (capacidades e prioridades como tuplas de itens).
+# Se só as prioridades mudaram desde a última programação, reprograma a partir dela.
+@st.cache_resource(max_entries=16, show_spinner=False)
+def programacao_finita(versao, hoje, capacidades, prioridades, _df):
+    base = (versao, hoje, capacidades)
+    with _trava:
+        anterior = _ultimos.get('programacao')
+    if anterior is not None and anterior[0] == base:
+        objeto = anterior[1].reprogramar(dict(prioridades))
+    else:
+        calendario = programacao.Calendario(dict(capacidades))
+        objeto = programacao.Programacao(_df, calendario, dict(prioridades), hoje)
+    with _trava:
+        _ultimos['programacao'] = (base, objeto)
+    return objeto
+
+
+# Situação depende do dia, então a matriz é por versão e dia
+@st.cache_resource(max_entries=8, show_spinner=False)
+def matriz(versao, hoje, _df):
+    return _incremental(
+        'matriz_planos', versao,
+        lambda: matriz_planos.MatrizPlanos(_df, hoje),
+        lambda matriz_anterior, delta: matriz_anterior.atualizar(delta),
+        contexto=hoje,
+    )
+
+
+# Saídas das seções do dashboard de OFs por dataset, dia e estado dos filtros (chave):
+# rerun sem mudar filtro, ou voltando a um filtro já visto, não refaz sort nem contagens
+@st.cache_resource(max_entries=64, show_spinner=False)
+def ultimas_entregues(versao, hoje, chave, _df, _posicoes, quantidade=10):
+    colunas = ['Ordem F', 'Plano', 'Sub-g', 'status', 'Final']
+    filtradas = _df[colunas].take(_posicoes)
+    fechadas = filtradas[filtradas['status'] == 'fechada']
+    return compacto.visao(fechadas.sort_values('Final', ascending=False).head(quantidade), colunas)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def distribuicao(versao, hoje, chave, _df, _posicoes):
+    # (OFs por Tipo_Lote, OFs por setor) do filtro, sem as categorias zeradas
+    tipo_lote = _df['Tipo_Lote'].take(_posicoes).value_counts()
+    # Só o dicionário da coluna category é renomeado para o nome do setor
+    setores = compacto.setores(_df['Sub-g'].take(_posicoes)).value_counts()
+    return tipo_lote[tipo_lote > 0], setores[setores > 0]
+
+
+def preparar(df, hoje):
+    # Visão da sessão: cópia rasa do dataset compartilhado + colunas de classificação.
+    # As colunas novas ficam só na visão; o dataset do registro nunca é alterado.
+    classes = classificar(ingestao.versao_dataset(df), hoje, df)
+    visao = df.copy(deep=False)
+    for col in classificacao.COLUNAS:
+        visao[col] = classes[col]
+    return visao
+
+
+def visao(versao, hoje):
+    # Visão preparada de uma versão, buscada no registro a cada execução. Para fragmentos:
+    # o Streamlit guarda os argumentos da chamada na sessão, e um DataFrame ali ficaria
+    # preso fora do orçamento do registro.
+    df = recarregar_dataset(versao)
+    return None if df is None else preparar(df, hoje)
+
+
+def aquecer(df):
+    # Monta fora do caminho da requisição tudo o que as páginas pedem para uma versão nova
+    hoje = pd.to_datetime(date.today())
+    versao = ingestao.versao_dataset(df)
+    visao = preparar(df, hoje)
+    indice_filtros(versao, hoje, visao)
+    codigos_kpi(versao, hoje, visao)
+    cubo_fechadas(versao, visao)
+    matriz(versao, hoje, visao)
+    progresso_lotes(versao, df)
+    painel_setores(versao, df)
+    indice_pedidos(versao, df)
+
+
+def _ingerir_export(chave, conteudo):
+    df = carregar_dataset(chave, [(chave, conteudo)], armazenamento.LINHAGEM_ERP)
+    aquecer(df)
+    return df
+
+
+# Monitor da pasta do ERP: um por processo, só quando PCP_PASTA_ERP está configurada
+@st.cache_resource(show_spinner=False)
+def monitor_erp():
+    if not monitor.PASTA_ERP:
+        return None
+    return monitor.MonitorPasta(monitor.PASTA_ERP, _ingerir_export).iniciar()
+
+
+def dataset_erp():
+    # Última versão ingerida da pasta do ERP; nunca espera uma ingestão em andamento.
+    # Se o registro já a despejou, volta do Parquet convertido (sem reler a planilha).
+    monitor_ativo = monitor_erp()
+    versao = monitor_ativo.atual() if monitor_ativo is not None else None
+    if versao is None:
+        return None
+    return recarregar_dataset(versao)
+
+
+def guardar_dataset(versao):
+    # A sessão guarda só a versão; o dataset fica no registro
+    st.session_state.ofs_versao = versao
+
+
+def esquecer_dataset():
+    # Sem upload próprio, a sessão passa a seguir a versão da pasta do ERP
+    st.session_state.pop("ofs_versao", None)
+
+
+def dataset_atual():
+    versao = st.session_state.get("ofs_versao")
+    if versao is None:
+        return dataset_erp()
+    return recarregar_dataset(versao)
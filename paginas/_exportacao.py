@@ -0,0 +1,66 @@
+from datetime import date
+
+import streamlit as st
+
+from pcp import exportacao, filtros
+from paginas import _dados
+
+# Exportação da visão filtrada do dashboard de OFs: o arquivo é gravado numa thread e a
+# sessão só acompanha o andamento; o download aparece quando o arquivo está completo
+
+# Intervalo (s) entre as consultas ao andamento enquanto a exportação roda
+INTERVALO_ANDAMENTO = 1.0
+
+
+# Só existe enquanto a exportação roda: ao terminar, uma rodada completa troca a barra pelo
+# botão de download e o fragmento deixa de ser chamado (para de consultar)
+@st.fragment(run_every=INTERVALO_ANDAMENTO)
+def _andamento():
+    _, atual = st.session_state.exportacao_ofs
+    if atual.terminada:
+        st.rerun()
+    st.progress(atual.andamento, text=f"Exportando... {atual.escritas:,} de {atual.total:,} OFs")
+
+
+# Fragmento: escolher o formato e gerar o arquivo não redesenham o dashboard. Recebe só a
+# versão e os filtros (o Streamlit guarda os argumentos na sessão); dataset e posições do
+# filtro são buscados a cada execução, no registro e no índice de filtros em cache
+@st.fragment
+def mostrar_exportacao(versao, hoje, selecoes):
+    df = _dados.visao(versao, hoje)
+    if df is None:
+        return
+    posicoes = _dados.indice_filtros(versao, hoje, df).filtrar(selecoes)
+    chave = filtros.chave_filtros(selecoes)
+    with st.expander("📥 Exportar OFs filtradas"):
+        col1, col2 = st.columns([1, 3], vertical_alignment="bottom")
+        with col1:
+            formato = st.selectbox("Formato", list(exportacao.FORMATOS), key="formato_exportacao")
+        with col2:
+            gerar = st.button(f"Gerar arquivo com {len(posicoes):,} OFs", key="gerar_exportacao")
+
+        if gerar:
+            anterior = st.session_state.get("exportacao_ofs")
+            if anterior is not None:
+                anterior[1].descartar()
+            st.session_state.exportacao_ofs = (chave, exportacao.Exportacao(df, posicoes, formato).iniciar())
+
+        if "exportacao_ofs" not in st.session_state:
+            return
+        chave_exportada, atual = st.session_state.exportacao_ofs
+        if not atual.terminada:
+            _andamento()
+        elif atual.erro is not None:
+            st.error(f"Falha ao exportar: {atual.erro}")
+        else:
+            if chave_exportada != chave:
+                st.caption("O arquivo foi gerado com outros filtros; gere de novo para a visão atual.")
+            extensao, mime = exportacao.FORMATOS[atual.formato]
+            with open(atual.caminho, "rb") as arquivo:
+                st.download_button(
+                    f"⬇️ Baixar {atual.total:,} OFs ({atual.formato})",
+                    data=arquivo,
+                    file_name=f"ofs_{date.today():%Y%m%d}{extensao}",
+                    mime=mime,
+                    key="baixar_exportacao",
+                )
@@ -0,0 +1,20 @@
+import streamlit as st
+
+from pcp import graficos
+from paginas import _perfil
+
+# Gráficos das páginas em cache por chave (versão do dataset + filtros + o que mais a seção
+# usa). Um rerun no mesmo estado não remonta a figura e manda ao navegador o mesmo JSON;
+# acima de 10 KB o Streamlit troca a mensagem repetida por uma referência ao hash.
+# Com o perfil ligado, cada gráfico é uma seção com os bytes enviados.
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _figura(nome, chave, _montar):
+    return graficos.aparar_template(_montar())
+
+
+def mostrar(nome, chave, montar):
+    # montar() -> go.Figure, chamado só na primeira vez de cada chave
+    with _perfil.secao(f"gráfico {nome}"):
+        st.plotly_chart(_figura(nome, chave, montar), use_container_width=True)
@@ -0,0 +1,64 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from pcp import ingestao
+from paginas import _dados
+
+# Seções comuns às páginas de pedidos (Pedido = planos 25XXX, Paralelo = os demais),
+# servidas pelo índice de pedidos ordenado por prazo
+
+MAIS_ATRASADOS = 20
+
+
+def _tabela(pedidos):
+    # Visão legível de uma fatia do índice: prazo como data e quanto das OFs já fechou
+    ofs = pedidos['ofs'].to_numpy()
+    return pd.DataFrame({
+        'Prazo': pd.to_datetime(pedidos['prazo'].to_numpy().astype('datetime64[D]')),
+        'OFs': ofs,
+        'OFs abertas': pedidos['abertas'].to_numpy(),
+        'Saldo': pedidos['saldo'].to_numpy(),
+        'OFs fechadas (%)': np.divide(ofs - pedidos['abertas'].to_numpy(), ofs, out=np.zeros(len(ofs)), where=ofs > 0) * 100,
+    }, index=pd.Index(pedidos.index.astype(str), name='Plano'))
+
+
+def _mostrar_tabela(pedidos):
+    st.dataframe(_tabela(pedidos), use_container_width=True, column_config={
+        'Prazo': st.column_config.DateColumn('Prazo', format="DD/MM/YYYY"),
+        'OFs fechadas (%)': st.column_config.ProgressColumn('OFs fechadas (%)', min_value=0, max_value=100, format="%.0f%%"),
+    })
+
+
+# Fragmento: a janela de dias só refaz a consulta de vencimentos
+@st.fragment
+def mostrar_vencimentos(indice, tipo, hoje):
+    st.subheader("Vencimentos")
+    dias = st.slider("Vencem nos próximos (dias)", min_value=1, max_value=180, value=30, key=f"vencimentos_{tipo}")
+    vencendo = indice.vencendo(tipo, hoje + pd.Timedelta(days=1), hoje + pd.Timedelta(days=dias))
+    st.caption(f"{len(vencendo):,} pedidos em aberto vencem nos próximos {dias} dias")
+    _mostrar_tabela(vencendo)
+
+
+def mostrar_pedidos(tipo):
+    df = _dados.dataset_atual()
+    if df is None:
+        st.info("Carregue o arquivo de OFs na página 🧾 Ofs para acompanhar os pedidos.")
+        return
+
+    indice = _dados.indice_pedidos(ingestao.versao_dataset(df), df)
+    hoje = pd.Timestamp(date.today())
+    resumo = indice.resumo(tipo, hoje)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Pedidos em aberto", f"{resumo['em_aberto']:,}")
+    col2.metric("Atrasados", f"{resumo['atrasados']:,}")
+    col3.metric("Vencem em 7 dias", f"{resumo['vencem_7d']:,}")
+    col4.metric("Vencem em 30 dias", f"{resumo['vencem_30d']:,}")
+
+    mostrar_vencimentos(indice, tipo, hoje)
+
+    st.subheader(f"{MAIS_ATRASADOS} mais atrasados")
+    _mostrar_tabela(indice.mais_atrasados(tipo, hoje, MAIS_ATRASADOS))
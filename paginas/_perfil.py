@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from pcp import perfil
+
+# Ligação do perfil com o Streamlit: a execução do rerun fica na session_state e os bytes
+# de cada ForwardMsg enviado ao navegador são somados nas seções abertas.
+# Ativo com PCP_PERFIL=1 ou com ?perfil=1 na URL; desligado, tudo aqui é no-op.
+# O payload é medido trocando ScriptRunContext._enqueue, que é privado: existe no Streamlit
+# 1.45 (versão fixada no requirements.txt). Se sumir numa versão nova, o perfil continua
+# medindo tempo e memória e marca o payload como não medido.
+
+
+class _ContadorPayload:
+
+    def __init__(self, enviar):
+        self.enviar = enviar
+        self.execucao = None
+
+    def __call__(self, msg):
+        if self.execucao is not None:
+            self.execucao.contar_payload(msg.ByteSize())
+        self.enviar(msg)
+
+
+def _ligar_payload(ctx, execucao):
+    # True se os ForwardMsg deste rerun passam a ser contados na execução
+    enviar = getattr(ctx, "_enqueue", None)
+    if not callable(enviar):
+        return False
+    if not isinstance(enviar, _ContadorPayload):
+        ctx._enqueue = enviar = _ContadorPayload(enviar)
+    enviar.execucao = execucao
+    return True
+
+
+def ativo():
+    return perfil.ATIVO or st.query_params.get("perfil") == "1"
+
+
+def _execucao():
+    return st.session_state.get("_perfil_execucao")
+
+
+def iniciar(pagina):
+    # Rerun anterior interrompido (st.rerun, exceção): descarta a execução que ficou aberta
+    anterior = st.session_state.pop("_perfil_execucao", None)
+    if anterior is not None:
+        anterior.finalizar()
+    if not ativo():
+        return None
+    execucao = perfil.Execucao(pagina)
+    st.session_state._perfil_execucao = execucao
+
+    ctx = get_script_run_ctx()
+    execucao.payload_medido = ctx is not None and _ligar_payload(ctx, execucao)
+    return execucao
+
+
+@contextmanager
+def secao(nome):
+    execucao = _execucao()
+    if execucao is None:
+        yield
+        return
+    aberta = execucao.abrir(nome)
+    try:
+        yield
+    finally:
+        execucao.fechar(aberta)
+
+
+def marcar(nome):
+    # Início de uma seção sequencial do main() da página (vai até a próxima marca)
+    execucao = _execucao()
+    if execucao is not None:
+        execucao.marcar(nome)
+
+
+def finalizar():
+    execucao = st.session_state.pop("_perfil_execucao", None)
+    if execucao is None:
+        return
+    enviar = getattr(get_script_run_ctx(), "_enqueue", None)
+    if isinstance(enviar, _ContadorPayload):
+        enviar.execucao = None
+
+    registro = execucao.finalizar()
+    perfil.exportar(registro)
+
+    with st.sidebar.expander("⏱️ Perfil da execução", expanded=True):
+        st.caption(f"{registro['pagina']} · {registro['quando']} · exportado em {perfil.ARQUIVO}")
+        if not registro['payload_medido']:
+            st.caption("Payload não medido nesta versão do Streamlit")
+        st.dataframe(
+            [
+                {
+                    'Seção': "└ " * item['nivel'] + item['secao'].rsplit("/", 1)[-1],
+                    'ms': round(item['tempo_ms'], 1),
+                    'Pico (MB)': round(item['pico_bytes'] / 2**20, 2),
+                    'Payload (KB)': round(item['payload_bytes'] / 1024, 1) if registro['payload_medido'] else None,
+                }
+                for item in registro['secoes']
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
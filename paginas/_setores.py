@@ -0,0 +1,103 @@
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from pcp import graficos, ingestao, setores
+from paginas import _dados, _graficos
+
+# Seções comuns às páginas de produção, todas servidas pelo painel de setores do dataset atual
+
+
+def _painel():
+    # (versão, painel) do dataset atual, ou (None, None) sem dataset
+    df = _dados.dataset_atual()
+    if df is None:
+        st.info("Carregue o arquivo de OFs na página 🧾 Ofs para acompanhar a produção.")
+        return None, None
+    versao = ingestao.versao_dataset(df)
+    return versao, _dados.painel_setores(versao, df)
+
+
+def mostrar_indicadores(indicadores):
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("OFs em aberto (WIP)", f"{indicadores['wip_ofs']:,}")
+    col2.metric("Saldo em aberto", f"{indicadores['wip_saldo']:,.0f}")
+    col3.metric("OFs atrasadas", f"{indicadores['atrasadas']:,}")
+    col4.metric("Atraso médio (dias)", f"{indicadores['atraso_medio_dias']:,.0f}")
+
+    col5, col6, col7, col8 = st.columns(4)
+    col5.metric("Fechadas nos últimos 7 dias", f"{indicadores['fechadas_7d']:,}")
+    col6.metric("Vazão média (OFs/dia, 30 dias)", f"{indicadores['vazao_30d']:,.1f}")
+    cobertura = indicadores['cobertura_dias']
+    col7.metric("Cobertura do WIP (dias)", "-" if cobertura == float('inf') else f"{cobertura:,.0f}")
+    col8.metric("Saldo atrasado", f"{indicadores['saldo_atrasado']:,.0f}")
+
+
+# Fragmento: o Período só redesenha o gráfico de vazão
+@st.fragment
+def mostrar_vazao(versao, painel, setor, hoje):
+    st.subheader("Vazão")
+    col1, _, _ = st.columns(3)
+    with col1:
+        periodo = st.selectbox("Período", list(setores.PERIODOS), index=1, key=f"periodo_vazao_{setor or 'geral'}")
+
+    def montar():
+        vazao = painel.vazao(setor, hoje, setores.PERIODOS[periodo])
+        colunas = ['Fechadas'] + [f"Média {janela} dias" for janela in setores.JANELAS]
+        return graficos.linhas(vazao.index, {col: vazao[col] for col in colunas},
+                               f"OFs fechadas por dia - {periodo}")
+
+    _graficos.mostrar("vazão", (versao, setor, hoje, periodo), montar)
+
+
+def mostrar_atraso(versao, painel, setor, hoje):
+    st.subheader("Atraso das OFs abertas")
+
+    def montar():
+        atraso = painel.atraso(setor, hoje)
+        return graficos.barras(atraso.index, atraso, None, rotulo_x="Atraso", rotulo_y="OFs")
+
+    _graficos.mostrar("atraso", (versao, setor, hoje), montar)
+
+
+def mostrar_setor(setor):
+    versao, painel = _painel()
+    if painel is None:
+        return
+    if setor not in painel.setores():
+        st.info(f"O arquivo carregado não tem OFs de {setor} (setores no Sub-g: {', '.join(painel.setores())}).")
+        return
+
+    hoje = pd.Timestamp(date.today())
+    mostrar_indicadores(painel.indicadores(setor, hoje))
+    mostrar_vazao(versao, painel, setor, hoje)
+    mostrar_atraso(versao, painel, setor, hoje)
+
+
+def mostrar_geral():
+    versao, painel = _painel()
+    if painel is None:
+        return
+
+    hoje = pd.Timestamp(date.today())
+    mostrar_indicadores(painel.indicadores(None, hoje))
+
+    st.subheader("Por setor")
+    # Sem vazão no período a cobertura é infinita: aparece vazia na tabela
+    resumo = painel.resumo(hoje).replace(float('inf'), float('nan')).rename(columns={
+        'wip_ofs': "WIP (OFs)",
+        'wip_saldo': "Saldo em aberto",
+        'atrasadas': "Atrasadas",
+        'saldo_atrasado': "Saldo atrasado",
+        'atraso_medio_dias': "Atraso médio (dias)",
+        'fechadas_7d': "Fechadas 7 dias",
+        'vazao_30d': "Vazão 30 dias (OFs/dia)",
+        'cobertura_dias': "Cobertura (dias)",
+    })
+    st.dataframe(resumo, use_container_width=True, column_config={
+        col: st.column_config.NumberColumn(col, format="%.1f" if "Vazão" in col else "%.0f")
+        for col in resumo.columns
+    })
+
+    mostrar_vazao(versao, painel, None, hoje)
@@ -0,0 +1,241 @@
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from pcp import ingestao
+
+# Loja local das OFs: um snapshot base + partições delta em Parquet, chaveadas por 'Ordem F'
+PASTA_LOJA = os.environ.get("PCP_LOJA_DIR", os.path.join(ingestao.PASTA_CACHE, "loja"))
+
+CHAVE = 'Ordem F'
+
+# Depois de tantos deltas o snapshot é regravado, para a leitura não crescer sem limite
+MAX_DELTAS = 20
+
+# Muda quando a forma do hash das linhas muda: uma loja gravada com outra forma recomeça
+VERSAO_HASH = 2
+
+# Linhagem dos exports ingeridos da pasta do ERP
+LINHAGEM_ERP = "erp"
+
+# antigas: versão anterior das linhas alteradas/removidas; novas: linhas inseridas/alteradas
+Delta = namedtuple('Delta', ['versao_anterior', 'versao', 'antigas', 'novas', 'inseridas', 'alteradas', 'removidas', 'fechadas'])
+
+
+def _normalizada(serie):
+    # Mesmo valor, mesmo hash, qualquer que seja o tipo reduzido de cada export
+    # (int16 x int32, float32 x float64, category x valores)
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = _normalizada(pd.Series(serie.cat.categories))
+        if categorias.is_unique:
+            return serie.cat.rename_categories(categorias.to_numpy())
+        return _normalizada(serie.astype(serie.cat.categories.dtype))
+    if pd.api.types.is_bool_dtype(serie):
+        return serie
+    if pd.api.types.is_integer_dtype(serie):
+        return serie.astype(np.int64)
+    if pd.api.types.is_float_dtype(serie):
+        # Pelo float32: um export guardado em float32 e outro em float64 dão o mesmo valor
+        return serie.astype(np.float32).astype(np.float64)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.astype('datetime64[ns]')
+    return serie
+
+
+def hash_linhas(df):
+    normalizado = pd.DataFrame({col: _normalizada(df[col]) for col in df.columns})
+    return pd.util.hash_pandas_object(normalizado, index=False).to_numpy()
+
+
+def linhagem_uploads(nomes):
+    # Exports da mesma origem mudam só a data ou o número no nome ("ofs_20261018.xlsx"):
+    # viram a mesma linhagem e são comparados entre si; arquivos de outra origem, não
+    padrao = "|".join(sorted(re.sub(r"\d+", "#", os.path.basename(nome).lower()) for nome in nomes))
+    return "upload-" + ingestao.hash_conteudo(padrao.encode())[:16]
+
+
+class LojaOfs:
+
+    def __init__(self, pasta=PASTA_LOJA):
+        self.pasta = pasta
+        self.ultimo_delta = None
+        self._trava = threading.Lock()
+        self._manifesto = self._ler_manifesto()
+        # Estado atual: só o hash de cada OF da última versão e as colunas do export. O dataset
+        # fica no registro (com o orçamento de memória); as linhas antigas de um delta vêm de lá
+        # ou, se já foi despejado, das partições em disco.
+        self._hashes = self._carregar_hashes()
+        self._colunas = self._manifesto.get('colunas', [])
+
+    @property
+    def versao(self):
+        return self._manifesto.get('versao')
+
+    def _caminho(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def _ler_manifesto(self):
+        try:
+            with open(self._caminho('manifesto.json'), encoding='utf-8') as arquivo:
+                manifesto = json.load(arquivo)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifesto = {}
+        if manifesto.get('versao_hash') != VERSAO_HASH:
+            # Hashes de outra forma não casam com os novos: recomeça com um snapshot
+            return {'versao': None, 'base': None, 'deltas': [], 'colunas': [],
+                    'sequencia': manifesto.get('sequencia', 0), 'versao_hash': VERSAO_HASH}
+        return manifesto
+
+    def _gravar_manifesto(self):
+        temporario = self._caminho(f'manifesto.json.{os.getpid()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(self._manifesto, arquivo)
+        os.replace(temporario, self._caminho('manifesto.json'))
+
+    def _partes(self):
+        base = self._manifesto['base']
+        return [base] + self._manifesto['deltas'] if base else []
+
+    def _replay(self, colunas=None, chaves=None):
+        # Replay de base + deltas: o último registro de cada OF vence e '_removida' apaga.
+        # chaves: lê só essas OFs de cada partição
+        filtros = None if chaves is None else [(CHAVE, 'in', list(chaves))]
+        frames = [ingestao.ler_parquet(self._caminho(nome), colunas, filtros) for nome in self._partes()]
+        estado = pd.concat(frames, ignore_index=True).drop_duplicates(CHAVE, keep='last')
+        return estado[~estado['_removida']].reset_index(drop=True)
+
+    def _carregar_hashes(self):
+        if not self._partes():
+            return pd.Series(dtype=np.uint64)
+        estado = self._replay([CHAVE, '_hash', '_removida'])
+        return pd.Series(estado['_hash'].to_numpy(), index=estado[CHAVE].to_numpy())
+
+    def _linhas_anteriores(self, chaves, anterior, novo):
+        # Versão guardada destas OFs: do dataset anterior se ainda estiver em memória
+        df = anterior(self.versao) if anterior is not None and self.versao is not None else None
+        if df is not None:
+            posicoes = pd.Index(df[CHAVE]).get_indexer(chaves)
+            if (posicoes >= 0).all():
+                return df.iloc[posicoes][self._colunas].reset_index(drop=True)
+        if not self._partes():
+            return pd.DataFrame()
+        estado = self._replay(self._colunas + ['_removida'], chaves)
+        antigas = estado.iloc[pd.Index(estado[CHAVE]).get_indexer(chaves)][self._colunas].reset_index(drop=True)
+        # O Parquet não devolve todo category (ex.: Sub-g); volta ao tipo que o export tem
+        for col in antigas.columns.intersection(novo.columns):
+            if isinstance(novo[col].dtype, pd.CategoricalDtype):
+                antigas[col] = antigas[col].astype('category')
+        return antigas
+
+    def _gravar_parte(self, prefixo, df, hashes, removida):
+        self._manifesto['sequencia'] += 1
+        nome = f"{prefixo}-{self._manifesto['sequencia']:06d}.parquet"
+        os.makedirs(self.pasta, exist_ok=True)
+        ingestao.gravar_parquet(df.assign(_hash=hashes, _removida=removida), self._caminho(nome))
+        return nome
+
+    def delta(self, versao):
+        # Delta que produziu esta versão, se foi a última ingestão deste processo
+        delta = self.ultimo_delta
+        return delta if delta is not None and delta.versao == versao else None
+
+    def aplicar_export(self, df, versao, anterior=None):
+        # Compara o export novo com o estado guardado e grava só as OFs que mudaram.
+        # Sem 'Ordem F' única não há como casar as linhas, então não há delta.
+        # anterior(versão) -> DataFrame ou None: o dataset da versão guardada, se ainda estiver
+        # em memória (evita ler as linhas antigas do disco)
+        if CHAVE not in df.columns or df[CHAVE].duplicated().any():
+            return None
+
+        with self._trava:
+            if versao == self.versao:
+                return self.ultimo_delta
+
+            colunas = list(df.columns)
+            hashes = pd.Series(hash_linhas(df), index=df[CHAVE].to_numpy())
+            anteriores = self._hashes
+
+            comuns = hashes.index.intersection(anteriores.index)
+            mudou = hashes.loc[comuns].to_numpy() != anteriores.loc[comuns].to_numpy()
+            alteradas = comuns[mudou]
+            inseridas = hashes.index.difference(anteriores.index)
+            removidas = anteriores.index.difference(hashes.index)
+
+            pos_novas = np.concatenate([hashes.index.get_indexer(inseridas), hashes.index.get_indexer(alteradas)])
+            novas = df.iloc[pos_novas][colunas].reset_index(drop=True)
+            antigas = self._linhas_anteriores(np.concatenate([alteradas, removidas]), anterior, df)
+
+            # Snapshot novo só na primeira carga ou para compactar; senão, uma partição pequena
+            descartar = []
+            if self._manifesto['base'] is None or len(self._manifesto['deltas']) >= MAX_DELTAS:
+                descartar = self._partes()
+                base = self._gravar_parte('snapshot', df[colunas], hashes.to_numpy(), False)
+                self._manifesto.update(base=base, deltas=[])
+            elif len(pos_novas) or len(removidas):
+                registros = pd.concat([novas, antigas.iloc[len(alteradas):]], ignore_index=True) if len(removidas) else novas
+                marcas = np.r_[hashes.to_numpy()[pos_novas], anteriores.loc[removidas].to_numpy()]
+                removida = np.r_[np.zeros(len(novas), dtype=bool), np.ones(len(removidas), dtype=bool)]
+                self._manifesto['deltas'].append(self._gravar_parte('delta', registros, marcas, removida))
+
+            versao_anterior = self.versao
+            self._manifesto.update(versao=versao, colunas=colunas)
+            self._gravar_manifesto()
+            for nome in descartar:
+                os.remove(self._caminho(nome))
+
+            self._colunas = colunas
+            self._hashes = hashes
+
+            # Fechadas: OFs alteradas cujo saldo zerou nesta versão
+            fechadas = 0
+            if 'Saldo' in colunas and len(alteradas):
+                saldo_novo = novas['Saldo'].to_numpy()[len(inseridas):]
+                saldo_antigo = antigas['Saldo'].to_numpy()[:len(alteradas)]
+                fechadas = int(((saldo_novo == 0) & (saldo_antigo != 0)).sum())
+
+            self.ultimo_delta = Delta(
+                versao_anterior=versao_anterior,
+                versao=versao,
+                antigas=antigas,
+                novas=novas,
+                inseridas=len(inseridas),
+                alteradas=len(alteradas),
+                removidas=len(removidas),
+                fechadas=fechadas,
+            )
+            return self.ultimo_delta
+
+
+class LojasOfs:
+    # Uma loja por linhagem de dataset, cada uma na sua pasta: só exports da mesma origem
+    # (a pasta do ERP, ou uploads com o mesmo padrão de nome) são comparados entre si.
+    # Sessões que carregam arquivos sem relação não geram deltas uma contra a outra.
+
+    def __init__(self, pasta=PASTA_LOJA):
+        self.pasta = pasta
+        self._lojas = {}
+        self._trava = threading.Lock()
+
+    def loja(self, linhagem):
+        with self._trava:
+            if linhagem not in self._lojas:
+                self._lojas[linhagem] = LojaOfs(os.path.join(self.pasta, linhagem))
+            return self._lojas[linhagem]
+
+    def aplicar_export(self, df, versao, linhagem, anterior=None):
+        return self.loja(linhagem).aplicar_export(df, versao, anterior)
+
+    def delta(self, versao):
+        # Delta que produziu esta versão, em qualquer linhagem
+        with self._trava:
+            lojas = list(self._lojas.values())
+        for loja in lojas:
+            delta = loja.delta(versao)
+            if delta is not None:
+                return delta
+        return None
@@ -0,0 +1,143 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from pcp import ingestao, planejamento
+
+# Lotes de planejamento persistidos em SQLite (WAL), compartilhados entre planejadores
+CAMINHO_BANCO = os.environ.get("PCP_BANCO_PLANEJAMENTO", os.path.join(ingestao.PASTA_CACHE, "planejamento.db"))
+
+TAMANHO_POOL = int(os.environ.get("PCP_POOL_BANCO", 4))
+
+# Coluna da tabela -> coluna do banco
+CAMPOS = {
+    "Lote": "lote",
+    "Descrição": "descricao",
+    "Cor": "cor",
+    "Programar": "programar",
+    "Cálculo NEC": "calculo_nec",
+    "Gerar SOC": "gerar_soc",
+    "E-mail SOC": "email_soc",
+    "Gerar OF": "gerar_of",
+}
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS lotes (
+    lote TEXT PRIMARY KEY,
+    descricao TEXT NOT NULL,
+    cor TEXT NOT NULL,
+    {', '.join(f'{CAMPOS[flag]} INTEGER NOT NULL' for flag in planejamento.FLAGS)},
+    versao INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('versao', 0);
+"""
+
+
+class LoteExistente(Exception):
+    pass
+
+
+class BancoPlanejamento:
+    # Versionamento otimista: cada lote tem uma versão; uma edição só vale se o lote
+    # ainda estiver na versão que o planejador leu. O contador 'versao' em meta muda
+    # a cada escrita e invalida o cache de leitura de todos os processos.
+
+    def __init__(self, caminho=CAMINHO_BANCO, tamanho_pool=TAMANHO_POOL):
+        self.caminho = caminho
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._pool = queue.Queue()
+        for _ in range(tamanho_pool):
+            self._pool.put(self._conectar())
+        self._cache = None
+        self._trava_cache = threading.Lock()
+        with self._conexao() as conexao:
+            conexao.executescript(ESQUEMA)
+        with self._transacao() as conexao:
+            if conexao.execute("SELECT COUNT(*) FROM lotes").fetchone()[0] == 0:
+                self._inserir(conexao, planejamento.REGISTROS_INICIAIS)
+
+    def _conectar(self):
+        # isolation_level=None: as transações são abertas explicitamente com BEGIN IMMEDIATE
+        conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None, check_same_thread=False)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    @contextmanager
+    def _conexao(self):
+        conexao = self._pool.get()
+        try:
+            yield conexao
+        finally:
+            self._pool.put(conexao)
+
+    @contextmanager
+    def _transacao(self):
+        with self._conexao() as conexao:
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                yield conexao
+            except BaseException:
+                conexao.execute("ROLLBACK")
+                raise
+            conexao.execute("UPDATE meta SET valor = valor + 1 WHERE chave = 'versao'")
+            conexao.execute("COMMIT")
+        with self._trava_cache:
+            self._cache = None
+
+    def _inserir(self, conexao, registros):
+        colunas = list(CAMPOS.values())
+        conexao.executemany(
+            f"INSERT INTO lotes ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+            [[registro[campo] for campo in CAMPOS] for registro in planejamento.tabela(registros).to_dict("records")],
+        )
+
+    def versao(self):
+        with self._conexao() as conexao:
+            return conexao.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()[0]
+
+    def tabela(self):
+        # Leitura em cache: só relê os lotes quando alguém (deste ou de outro processo) escreveu.
+        # O DataFrame devolvido é compartilhado e não deve ser alterado.
+        versao = self.versao()
+        with self._trava_cache:
+            if self._cache is not None and self._cache[0] == versao:
+                return self._cache[1]
+        with self._conexao() as conexao:
+            linhas = conexao.execute(
+                f"SELECT {', '.join(CAMPOS.values())}, versao FROM lotes ORDER BY rowid"
+            ).fetchall()
+        df = planejamento.tabela([linha[:-1] for linha in linhas])
+        df["versao"] = pd.array([linha[-1] for linha in linhas], dtype="int64")
+        with self._trava_cache:
+            self._cache = (versao, df)
+        return df
+
+    def adicionar(self, registro):
+        try:
+            with self._transacao() as conexao:
+                self._inserir(conexao, [registro])
+        except sqlite3.IntegrityError as erro:
+            raise LoteExistente(registro["Lote"]) from erro
+
+    def aplicar_mudancas(self, mudancas):
+        # mudancas: [(lote, versão lida, {flag: valor})], gravadas numa única transação.
+        # Devolve os lotes em conflito (alterados por outro planejador desde a leitura).
+        conflitos = []
+        with self._transacao() as conexao:
+            for lote, versao, valores in mudancas:
+                atribuicoes = ", ".join(f"{CAMPOS[flag]} = ?" for flag in valores)
+                cursor = conexao.execute(
+                    f"UPDATE lotes SET {atribuicoes}, versao = versao + 1 WHERE lote = ? AND versao = ?",
+                    [int(bool(valor)) for valor in valores.values()] + [lote, int(versao)],
+                )
+                if cursor.rowcount == 0:
+                    conflitos.append(lote)
+        return conflitos
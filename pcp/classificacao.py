@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from pcp import compacto
+
+STATUS = ['aberta', 'fechada']
+SITUACOES = ['futura', 'atrasada']
+TIPOS_LOTE = ['Pedido', 'Paralelo']
+
+COLUNAS = ['Situação', 'status', 'Tipo_Lote', 'Plano_25xxx']
+
+# Colunas derivadas só para os agregados (a matriz de planos), sem significado para o usuário
+INTERNAS = ['Plano_25xxx']
+
+
+def classificar_planos(planos):
+    # Regras de Plano aplicadas só aos valores distintos (centenas), não às linhas
+    texto = pd.Index(planos).astype(str)
+    pedido = np.asarray(texto.str.startswith('25') & (texto.str.len() == 5), dtype=bool)
+    plano_25xxx = np.asarray(texto.str.match(r'^25\d{3}$'), dtype=bool)
+    return pedido, plano_25xxx
+
+
+def classificar(df, hoje):
+    # status: fechada quando o saldo zerou
+    status = (df['Saldo'].to_numpy() == 0).astype(np.int8)
+
+    # Situação: futura quando o prazo ainda não chegou (data ausente cai em atrasada)
+    final = compacto.dias(df, 'Final')
+    situacao = np.where(final > compacto.dia_numero(hoje), 0, 1).astype(np.int8)
+
+    # Tipo_Lote e a categoria 25XXX saem do mesmo factorize de Plano
+    codigos, planos = pd.factorize(df['Plano'], use_na_sentinel=False)
+    pedido, plano_25xxx = classificar_planos(planos)
+    tipo_lote = np.where(pedido, 0, 1).astype(np.int8)[codigos]
+
+    return pd.DataFrame({
+        'Situação': pd.Categorical.from_codes(situacao, SITUACOES),
+        'status': pd.Categorical.from_codes(status, STATUS),
+        'Tipo_Lote': pd.Categorical.from_codes(tipo_lote, TIPOS_LOTE),
+        'Plano_25xxx': plano_25xxx[codigos],
+    }, index=df.index)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from pcp import ingestao
+
+# Representação compacta das OFs em memória:
+#  - texto repetido (Plano, Sub-g, ...) como category: um código por linha + o dicionário
+#  - datas como int32 de dias desde 1970-01-01 (SEM_DATA no lugar de NaT)
+#  - quantidades e chaves com o menor tipo numérico que comporta os valores
+# As páginas leem pelas funções abaixo, que aceitam tanto o frame compacto quanto o original.
+
+SEM_DATA = np.iinfo(np.int32).min
+
+# Sempre category: poucos valores distintos repetidos em milhões de linhas
+COLUNAS_CATEGORIA = ['Plano', 'Sub-g']
+
+# Outras colunas de texto com mais distintos do que isso (fração das linhas) ficam como estão
+LIMITE_CARDINALIDADE = 0.5
+
+# Sub-g como vem do ERP -> setor
+NOMES_SUBG = {1: 'Montagem', 2: 'Solda', 3: 'Estamparia'}
+
+
+def _para_dias(serie):
+    dias = serie.to_numpy(dtype='datetime64[D]')
+    nulos = np.isnat(dias)
+    resultado = dias.astype(np.int64)
+    resultado[nulos] = SEM_DATA
+    return resultado.astype(np.int32)
+
+
+def compactar(df):
+    colunas = {}
+    for col in df.columns:
+        serie = df[col]
+        if col in ingestao.COLUNAS_DATA and pd.api.types.is_datetime64_any_dtype(serie):
+            colunas[col] = _para_dias(serie)
+        elif isinstance(serie.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(serie):
+            colunas[col] = serie
+        elif col in COLUNAS_CATEGORIA:
+            colunas[col] = serie.astype('category')
+        elif pd.api.types.is_integer_dtype(serie):
+            colunas[col] = pd.to_numeric(serie, downcast='integer')
+        elif pd.api.types.is_float_dtype(serie):
+            colunas[col] = pd.to_numeric(serie, downcast='float')
+        elif serie.dtype == object and len(serie) and serie.nunique(dropna=False) <= LIMITE_CARDINALIDADE * len(serie):
+            colunas[col] = serie.astype('category')
+        else:
+            colunas[col] = serie
+    compacto = pd.DataFrame(colunas, index=df.index)
+    compacto.attrs.update(df.attrs)
+    return compacto
+
+
+def dias(df, col):
+    # Dias desde 1970-01-01 (int32), com SEM_DATA para datas ausentes
+    serie = df[col]
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return _para_dias(serie)
+    return serie.to_numpy(dtype=np.int32)
+
+
+def dia_numero(dia):
+    return int((pd.Timestamp(dia).to_datetime64().astype('datetime64[D]')).astype(np.int64))
+
+
+def datas(df, col):
+    # datetime64 só quando uma seção precisa mostrar a data
+    serie = df[col]
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    valores = serie.to_numpy(dtype=np.int64).astype('datetime64[D]')
+    valores[serie.to_numpy() == SEM_DATA] = np.datetime64('NaT')
+    return pd.Series(valores.astype('datetime64[ns]'), index=serie.index, name=col)
+
+
+def visao(df, colunas=None):
+    # Frame legível (datas como datetime, categorias como valores) para tabelas pequenas da tela
+    colunas = list(df.columns) if colunas is None else colunas
+    resultado = df[colunas].copy()
+    for col in colunas:
+        if col in ingestao.COLUNAS_DATA:
+            resultado[col] = datas(df, col)
+        elif isinstance(resultado[col].dtype, pd.CategoricalDtype) and col not in ('status', 'Situação', 'Tipo_Lote'):
+            resultado[col] = resultado[col].astype(resultado[col].cat.categories.dtype)
+    return resultado
+
+
+def setores(serie):
+    # Sub-g com o nome do setor; numa coluna category só o dicionário é renomeado
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.rename_categories(lambda valor: NOMES_SUBG.get(valor, valor))
+    return serie.replace(NOMES_SUBG)
+
+
+def bytes_por_coluna(df):
+    return df.memory_usage(index=False, deep=True)
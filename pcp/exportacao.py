@@ -0,0 +1,196 @@
+import glob
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from pcp import classificacao, compacto, ingestao
+
+# Exportação da visão filtrada das OFs numa thread própria. As linhas saem do frame
+# compartilhado em blocos (take das posições do filtro), cada bloco vira valores legíveis
+# e vai para o arquivo antes do próximo: a memória fica em um bloco, qualquer que seja o
+# tamanho da exportação. CSV e Parquet acrescentam um bloco (um row group) por vez; o
+# Excel usa o modo write-only do openpyxl, que grava as linhas direto no arquivo.
+
+LINHAS_POR_BLOCO = int(os.environ.get("PCP_EXPORTACAO_BLOCO", 50_000))
+
+PASTA_EXPORTACAO = os.path.join(ingestao.PASTA_CACHE, "exportacoes")
+
+# Arquivos exportados mais velhos que isso são apagados ao iniciar uma exportação nova
+IDADE_MAXIMA_S = float(os.environ.get("PCP_EXPORTACAO_IDADE_S", 24 * 3600))
+
+# Linhas de dados que cabem numa aba do Excel; acima disso a exportação abre outra aba
+LINHAS_POR_ABA = 1_048_575
+
+# formato -> (extensão, tipo MIME)
+FORMATOS = {
+    "CSV": (".csv", "text/csv"),
+    "Excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def colunas_exportadas(df):
+    # Colunas internas (ex.: _hash da loja, Plano_25xxx da classificação) ficam de fora
+    return [col for col in df.columns if not str(col).startswith("_") and col not in classificacao.INTERNAS]
+
+
+def _conversores(df, colunas):
+    # Decidido uma vez pelo frame inteiro, para todos os blocos saírem com os mesmos tipos
+    conversores = {}
+    for col in colunas:
+        serie = df[col]
+        if col in ingestao.COLUNAS_DATA:
+            conversores[col] = lambda bloco, col=col: compacto.datas(bloco, col).to_numpy()
+        elif isinstance(serie.dtype, pd.CategoricalDtype) and serie.cat.categories.dtype != object:
+            # Category numérica (ex.: Sub-g): volta ao tipo dos valores, float se houver ausentes
+            if serie.isna().any():
+                conversores[col] = lambda bloco, col=col: bloco[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                tipo = serie.cat.categories.dtype
+                conversores[col] = lambda bloco, col=col, tipo=tipo: bloco[col].to_numpy(dtype=tipo)
+        elif isinstance(serie.dtype, pd.CategoricalDtype) or serie.dtype == object:
+            # Texto (ou valores misturados, como Plano 25201 e "25201A") sai sempre como texto
+            conversores[col] = lambda bloco, col=col: _texto(bloco[col])
+        else:
+            conversores[col] = lambda bloco, col=col: bloco[col].to_numpy()
+    return conversores
+
+
+def _texto(serie):
+    valores = serie.astype(object)
+    return valores.where(valores.isna(), valores.astype(str)).to_numpy(dtype=object)
+
+
+def _gravar_csv(blocos, caminho):
+    # Separadores do Excel em português; o BOM faz o Excel reconhecer o UTF-8
+    with open(caminho, "w", encoding="utf-8-sig", newline="") as saida:
+        for i, bloco in enumerate(blocos):
+            bloco.to_csv(saida, sep=";", decimal=",", index=False, header=i == 0, date_format="%d/%m/%Y")
+
+
+def _gravar_parquet(blocos, caminho):
+    escritor = None
+    try:
+        for bloco in blocos:
+            if escritor is None:
+                tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                # Texto todo ausente no primeiro bloco viria como null; fixa string para os próximos
+                esquema = pa.schema([
+                    campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo
+                    for campo in tabela.schema
+                ])
+                escritor = pq.ParquetWriter(caminho, esquema)
+            escritor.write_table(pa.Table.from_pandas(bloco, schema=escritor.schema, preserve_index=False))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+def _gravar_xlsx(blocos, caminho):
+    wb = Workbook(write_only=True)
+    aba = None
+    linhas_aba = 0
+    for bloco in blocos:
+        cabecalho = [str(col) for col in bloco.columns]
+        if aba is None:
+            aba = wb.create_sheet("OFs")
+            aba.append(cabecalho)
+        valores = bloco.astype(object).where(bloco.notna(), None)
+        for linha in valores.itertuples(index=False, name=None):
+            if linhas_aba == LINHAS_POR_ABA:
+                aba = wb.create_sheet(f"OFs {len(wb.worksheets) + 1}")
+                aba.append(cabecalho)
+                linhas_aba = 0
+            aba.append(linha)
+            linhas_aba += 1
+    wb.save(caminho)
+
+
+GRAVADORES = {"CSV": _gravar_csv, "Excel": _gravar_xlsx, "Parquet": _gravar_parquet}
+
+
+def _limpar(pasta, idade_maxima=IDADE_MAXIMA_S):
+    # Sessões encerradas deixam o último arquivo para trás
+    limite = time.time() - idade_maxima
+    for caminho in glob.glob(os.path.join(pasta, "ofs-*")):
+        try:
+            if os.path.getmtime(caminho) < limite:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+class Exportacao:
+    # Uma exportação em andamento: a sessão consulta o andamento e, no fim, pega o arquivo
+
+    def __init__(self, df, posicoes, formato, pasta=None, linhas_por_bloco=LINHAS_POR_BLOCO):
+        pasta = pasta or PASTA_EXPORTACAO
+        os.makedirs(pasta, exist_ok=True)
+        _limpar(pasta)
+        extensao, self.mime = FORMATOS[formato]
+        self.formato = formato
+        self.caminho = os.path.join(pasta, f"ofs-{uuid.uuid4().hex}{extensao}")
+        self.total = len(posicoes)
+        self.escritas = 0
+        self.erro = None
+        self.pronta = False
+        self._cancelada = False
+        self._df = df
+        self._posicoes = posicoes
+        self._linhas_por_bloco = linhas_por_bloco
+        self._thread = threading.Thread(target=self._trabalhar, name="pcp-exportacao", daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    @property
+    def terminada(self):
+        return self.pronta or self.erro is not None
+
+    @property
+    def andamento(self):
+        return self.escritas / self.total if self.total else 1.0
+
+    def _blocos(self):
+        colunas = colunas_exportadas(self._df)
+        indices = [self._df.columns.get_loc(col) for col in colunas]
+        conversores = _conversores(self._df, colunas)
+        # Sem linhas no filtro ainda sai um bloco vazio, para o arquivo ter o cabeçalho
+        for inicio in range(0, max(self.total, 1), self._linhas_por_bloco):
+            if self._cancelada:
+                return
+            bruto = self._df.iloc[self._posicoes[inicio:inicio + self._linhas_por_bloco], indices]
+            yield pd.DataFrame({col: conversores[col](bruto) for col in colunas})
+            self.escritas += len(bruto)
+
+    def _trabalhar(self):
+        # Grava num temporário e troca no fim: o arquivo só aparece completo
+        temporario = f"{self.caminho}.tmp"
+        try:
+            GRAVADORES[self.formato](self._blocos(), temporario)
+            if self._cancelada:
+                os.remove(temporario)
+                return
+            os.replace(temporario, self.caminho)
+            self.pronta = True
+        except Exception as erro:
+            self.erro = str(erro)
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        finally:
+            # A thread não segura o dataset depois de terminar
+            self._df = self._posicoes = None
+
+    def descartar(self):
+        # Ainda rodando: para no próximo bloco e não deixa arquivo
+        self._cancelada = True
+        if self.pronta and os.path.exists(self.caminho):
+            os.remove(self.caminho)
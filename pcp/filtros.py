@@ -0,0 +1,75 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_FILTRO = ['Tipo_Lote', 'Plano', 'status', 'Situação']
+
+# Acima disso um bitmap por valor pesa demais (ex.: centenas de planos x milhões de linhas);
+# a coluna guarda as posições ordenadas por valor e o bitmap é montado só na consulta
+LIMITE_BITMAP = 32
+
+
+def chave_filtros(selecoes):
+    # Forma hashável e estável do estado dos filtros, para chaves de cache
+    return tuple(
+        (col, tuple(sorted(map(str, selecionados))))
+        for col, selecionados in sorted(selecoes.items())
+    )
+
+
+class IndiceFiltro:
+    # Montado uma vez por dataset: valor -> linhas, para filtrar sem copiar o frame
+
+    def __init__(self, df, colunas=COLUNAS_FILTRO):
+        self.n = len(df)
+        self._valores = {}
+        self._bitmaps = {}
+        self._posicoes = {}
+        for col in colunas:
+            codigos, valores = pd.factorize(df[col], use_na_sentinel=False)
+            valores = list(valores)
+            self._valores[col] = valores
+            if len(valores) <= LIMITE_BITMAP:
+                self._bitmaps[col] = {
+                    valor: np.packbits(codigos == k) for k, valor in enumerate(valores)
+                }
+            else:
+                ordem = np.argsort(codigos, kind='stable')
+                limites = np.concatenate([[0], np.cumsum(np.bincount(codigos, minlength=len(valores)))])
+                fatias = {valor: (limites[k], limites[k + 1]) for k, valor in enumerate(valores)}
+                self._posicoes[col] = (ordem, fatias)
+
+    def valores(self, col):
+        # Mesma ordem de df[col].unique(), usada nas opções dos multiselects
+        return list(self._valores[col])
+
+    def bitmap(self, col, selecionados):
+        # OR dos bitmaps dos valores escolhidos na coluna
+        if col in self._bitmaps:
+            mapas = self._bitmaps[col]
+            escolhidos = [mapas[valor] for valor in selecionados if valor in mapas]
+            if not escolhidos:
+                return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+            return reduce(np.bitwise_or, escolhidos)
+
+        ordem, fatias = self._posicoes[col]
+        bits = np.zeros(self.n, dtype=bool)
+        for valor in selecionados:
+            if valor in fatias:
+                inicio, fim = fatias[valor]
+                bits[ordem[inicio:fim]] = True
+        return np.packbits(bits)
+
+    def filtrar(self, selecoes):
+        # AND entre colunas; lista vazia significa "sem filtro", como nos multiselects
+        resultado = None
+        for col, selecionados in selecoes.items():
+            if not selecionados or len(set(selecionados)) >= len(self._valores[col]):
+                continue
+            bits = self.bitmap(col, selecionados)
+            resultado = bits.copy() if resultado is None else np.bitwise_and(resultado, bits, out=resultado)
+
+        if resultado is None:
+            return np.arange(self.n)
+        return np.flatnonzero(np.unpackbits(resultado, count=self.n))
@@ -0,0 +1,49 @@
+from html import escape
+
+# Gauges dos lotes em SVG puro: um único bloco HTML para todos os lotes,
+# sem plotly.js, sem CDN e sem um iframe por lote
+
+COR_BARRA = "#FFD700"
+COR_FUNDO = "lightgray"
+
+
+def gerar_gradiente(index, total):
+    if index < total / 3:
+        return "linear-gradient(135deg, #00cc66, #ccff66)"  # verde
+    elif index < 2 * total / 3:
+        return "linear-gradient(135deg, #ffcc00, #ff9966)"  # amarelo
+    else:
+        return "linear-gradient(135deg, #ff6666, #cc0000)"  # vermelho
+
+
+def svg_gauge(valor):
+    # Semicírculo com pathLength=100: o traço da barra é o próprio percentual
+    valor = max(0.0, min(100.0, float(valor)))
+    arco = "M 15 75 A 60 60 0 0 1 135 75"
+    return (
+        f"<svg viewBox='0 0 150 90' width='100%' height='130' role='img' aria-label='{valor:.0f}%'>"
+        f"<path d='{arco}' pathLength='100' fill='none' stroke='{COR_FUNDO}' stroke-width='22'/>"
+        f"<path d='{arco}' pathLength='100' fill='none' stroke='{COR_BARRA}' stroke-width='16' "
+        f"stroke-dasharray='{valor:.2f} 100'/>"
+        f"<text x='75' y='72' text-anchor='middle' font-size='22' font-weight='bold' fill='white'>{valor:.0f}%</text>"
+        f"</svg>"
+    )
+
+
+def html_lotes(lotes, colunas=4):
+    # lotes: sequência de {"id": ..., "progresso": ...}, na ordem de exibição
+    total = len(lotes)
+    cartoes = []
+    for i, lote in enumerate(lotes):
+        cartoes.append(
+            f"<div style='background: {gerar_gradiente(i, total)}; padding: 15px; border-radius: 20px; "
+            f"text-align: center; color: white;'>"
+            f"<div style='font-size: 16px; font-weight: bold; margin-bottom: 10px;'>Lote {escape(str(lote['id']))}</div>"
+            f"{svg_gauge(lote['progresso'])}"
+            f"</div>"
+        )
+    return (
+        f"<div style='display: grid; grid-template-columns: repeat({colunas}, minmax(0, 1fr)); gap: 10px 16px;'>"
+        + "".join(cartoes)
+        + "</div>"
+    )
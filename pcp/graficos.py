@@ -0,0 +1,96 @@
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import plotly.colors
+import plotly.graph_objects as go
+
+# Camada de gráficos das páginas: figuras montadas direto com graph_objects (sem o
+# plotly.express) e com os pontos reduzidos no servidor à resolução da tela antes de
+# virarem JSON. Séries longas ficam com o mínimo e o máximo de cada coluna de pixel.
+# Traços grandes vão para WebGL.
+
+# Largura (px) de um gráfico com use_container_width no layout largo
+LARGURA_PX = int(os.environ.get("PCP_LARGURA_GRAFICO", 1200))
+
+# Pontos por traço a partir dos quais o navegador desenha com Scattergl
+LIMITE_WEBGL = 1000
+
+# Curva suavizada e marcadores só em séries curtas (semana, mês); no ano, linha simples
+LIMITE_DETALHE = 60
+
+
+def indices_serie(y, largura=LARGURA_PX):
+    # Mínimo e máximo de cada coluna de pixel, mais as pontas: a linha desenhada não muda
+    n = len(y)
+    if n <= 2 * largura:
+        return np.arange(n)
+    balde = np.arange(n) * largura // n
+    ordem = np.lexsort((y, balde))
+    inicio = np.searchsorted(balde, np.arange(largura))
+    fim = np.r_[inicio[1:] - 1, n - 1]
+    return np.unique(np.concatenate([ordem[inicio], ordem[fim], [0, n - 1]]))
+
+
+def _eixo_x(x):
+    # Datas vão como milissegundos (float64 em base64) em vez de texto ISO em cada ponto
+    indice = pd.Index(x)
+    if indice.inferred_type in ('date', 'datetime', 'datetime64'):
+        return pd.to_datetime(indice).to_numpy('datetime64[ms]').astype(np.int64).astype(np.float64), True
+    return indice.to_numpy(), False
+
+
+def _traco(x, y, nome, **kwargs):
+    classe = go.Scattergl if len(x) > LIMITE_WEBGL else go.Scatter
+    return classe(x=x, y=y, name=nome, **kwargs)
+
+
+def linhas(x, series, titulo, largura=LARGURA_PX, espessura=2):
+    # series: {nome: valores}, todas sobre o mesmo x
+    x, datas = _eixo_x(x)
+    # float32 basta para desenhar e leva metade dos bytes
+    valores = {
+        nome: np.asarray(y, dtype=np.float32) if np.asarray(y).dtype == np.float64 else np.asarray(y)
+        for nome, y in series.items()
+    }
+    indices = reduce(np.union1d, [indices_serie(y.astype(np.float64), largura) for y in valores.values()])
+    detalhe = len(indices) <= LIMITE_DETALHE
+    estilo = {'mode': 'lines+markers', 'line': {'width': espessura, 'shape': 'spline'}} if detalhe \
+        else {'mode': 'lines', 'line': {'width': espessura}}
+    fig = go.Figure([_traco(x[indices], y[indices], nome, **estilo) for nome, y in valores.items()])
+    fig.update_layout(title=titulo, hovermode="x unified", showlegend=len(series) > 1, legend_title_text="")
+    if datas:
+        fig.update_xaxes(type='date')
+    return fig
+
+
+def barras(x, y, titulo, rotulo_x=None, rotulo_y=None):
+    fig = go.Figure([go.Bar(x=list(x), y=np.asarray(y))])
+    fig.update_layout(title=titulo, xaxis_title=rotulo_x, yaxis_title=rotulo_y)
+    return fig
+
+
+def pizza(contagem, titulo, cores):
+    # contagem: Series valor -> quantidade; cores: {valor: cor}, os outros valores na paleta padrão
+    rotulos = [str(valor) for valor in contagem.index]
+    paleta = plotly.colors.qualitative.Plotly
+    fig = go.Figure([go.Pie(
+        labels=rotulos,
+        values=contagem.to_numpy(),
+        marker={'colors': [cores.get(rotulo, paleta[i % len(paleta)]) for i, rotulo in enumerate(rotulos)]},
+        textinfo='percent+label',
+        pull=[0.1] * len(rotulos),
+        sort=False,
+    )])
+    fig.update_layout(title=titulo, legend_title_text="")
+    return fig
+
+
+def aparar_template(fig):
+    # O template do tema vai junto em cada gráfico; ficam só os padrões dos tipos de traço usados
+    template = fig.layout.template
+    tipos = {traco.type for traco in fig.data}
+    dados = {tipo: getattr(template.data, tipo) for tipo in tipos if getattr(template.data, tipo, None)}
+    fig.layout.template = go.layout.Template(layout=template.layout, data=dados)
+    return fig
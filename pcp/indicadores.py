@@ -0,0 +1,49 @@
+import threading
+
+import numpy as np
+from cachetools import LRUCache
+
+from pcp import classificacao, compacto
+
+CHAVES = ['totais', 'abertas', 'atrasadas', 'fechadas', 'fechadas_hoje']
+
+# Bits do código por linha: status (fechada) | Situação (atrasada) | Final == hoje
+_FECHADA = 4
+_ATRASADA = 2
+_HOJE = 1
+
+_memo = LRUCache(maxsize=512)
+_trava = threading.Lock()
+
+
+def codigos_kpi(df, hoje):
+    # Um código de 3 bits por linha, montado uma vez por dataset e dia
+    fechada = df['status'].cat.codes.to_numpy() == classificacao.STATUS.index('fechada')
+    atrasada = df['Situação'].cat.codes.to_numpy() == classificacao.SITUACOES.index('atrasada')
+    final_hoje = compacto.dias(df, 'Final') == compacto.dia_numero(hoje)
+    return (fechada * _FECHADA + atrasada * _ATRASADA + final_hoje * _HOJE).astype(np.int8)
+
+
+def calcular_kpis(codigos, posicoes=None):
+    # Um único bincount sobre as posições filtradas responde todos os cards
+    selecionados = codigos if posicoes is None else codigos[posicoes]
+    contagem = np.bincount(selecionados, minlength=8)
+    fechadas = contagem[_FECHADA:].sum()
+    return {
+        'totais': int(contagem.sum()),
+        'abertas': int(contagem.sum() - fechadas),
+        'atrasadas': int(contagem[_ATRASADA] + contagem[_ATRASADA | _HOJE]),
+        'fechadas': int(fechadas),
+        'fechadas_hoje': int(contagem[_FECHADA | _HOJE] + contagem[_FECHADA | _ATRASADA | _HOJE]),
+    }
+
+
+def kpis(chave, codigos, posicoes=None):
+    # chave = (versão do dataset, dia, estado dos filtros); voltar a um filtro já visto é só um lookup
+    with _trava:
+        resultado = _memo.get(chave)
+    if resultado is None:
+        resultado = calcular_kpis(codigos, posicoes)
+        with _trava:
+            _memo[chave] = resultado
+    return resultado
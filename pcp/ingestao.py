@@ -0,0 +1,266 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+# Pasta onde ficam os Parquet já convertidos (um arquivo por conteúdo de planilha)
+PASTA_CACHE = os.environ.get("PCP_CACHE_DIR", ".cache_pcp")
+
+# Linhas por bloco na leitura em streaming; limita o pico de memória do parse
+TAMANHO_BLOCO = int(os.environ.get("PCP_TAMANHO_BLOCO", 10_000))
+
+# Processos para converter várias planilhas de uma vez (o parse do openpyxl prende o GIL)
+MAX_PROCESSOS = int(os.environ.get("PCP_PROCESSOS", os.cpu_count() or 1))
+
+# Incrementar sempre que a normalização mudar, para invalidar os Parquet antigos
+VERSAO_ESQUEMA = 2
+
+COLUNAS = {
+    'FINAL': 'Final',
+    'SALDO': 'Saldo',
+    'PLANO': 'Plano',
+    'ORDEM_F': 'Ordem F',
+    'SUB-G': 'Sub-g',
+    'INICIO': 'Inicio'
+}
+COLUNAS_DATA = ['Final', 'Inicio']
+
+
+def hash_conteudo(conteudo):
+    return hashlib.blake2b(conteudo, digest_size=16).hexdigest()
+
+
+def versao_dataset(df):
+    return df.attrs.get("versao")
+
+
+def chave_combinada(chaves):
+    # Um arquivo mantém a própria chave; vários viram uma chave da sequência (a ordem importa no dedup)
+    return chaves[0] if len(chaves) == 1 else hash_conteudo("\n".join(chaves).encode())
+
+
+def caminho_cache(chave):
+    return os.path.join(PASTA_CACHE, f"ofs-v{VERSAO_ESQUEMA}-{chave}.parquet")
+
+
+def normalizar(df):
+    # Renomeia as colunas do ERP para os nomes usados no dashboard
+    renomear = {
+        antigo: novo for antigo, novo in COLUNAS.items()
+        if antigo in df.columns and novo not in df.columns
+    }
+    if renomear:
+        df.rename(columns=renomear, inplace=True)
+
+    datas_presentes = [col for col in COLUNAS_DATA if col in df.columns]
+    for col in datas_presentes:
+        df[col] = pd.to_datetime(df[col], format='%d/%m/%Y', errors='coerce')
+
+    # Saldo derivado quando o export só traz PROGRAMADO e PRODUZIDO
+    if 'Saldo' not in df.columns and all(col in df.columns for col in ['PROGRAMADO', 'PRODUZIDO']):
+        df['Saldo'] = df['PROGRAMADO'] - df['PRODUZIDO']
+
+    # Remove linhas com datas inválidas
+    if datas_presentes:
+        df = df.dropna(subset=datas_presentes)
+    return df.reset_index(drop=True)
+
+
+def _tipar_para_arrow(df):
+    # Parquet exige nomes de coluna texto e colunas de tipo único;
+    # colunas object com tipos misturados (ex.: Plano 25201 e "25201A") viram texto
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def gravar_parquet(df, caminho):
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    tabela = pa.Table.from_pandas(_tipar_para_arrow(df), preserve_index=False)
+    # Grava em arquivo temporário e troca de uma vez, para nunca servir um Parquet pela metade
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    pq.write_table(tabela, temporario)
+    os.replace(temporario, caminho)
+
+
+def _nomes_colunas(cabecalho):
+    # Mesmos nomes que o pd.read_excel daria: "Unnamed: i" para vazios e ".1" para repetidos
+    nomes = []
+    vistos = {}
+    for i, valor in enumerate(cabecalho):
+        nome = f"Unnamed: {i}" if valor is None else valor
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+
+def ler_blocos(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    # read_only itera as linhas direto do XML, sem montar a planilha inteira na memória
+    wb = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = wb.worksheets[0].iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return
+        colunas = _nomes_colunas(cabecalho)
+        n_colunas = len(colunas)
+
+        bloco = []
+        emitiu = False
+        for linha in linhas:
+            if linha.count(None) == len(linha):
+                continue
+            if len(linha) != n_colunas:
+                linha = (tuple(linha) + (None,) * n_colunas)[:n_colunas]
+            bloco.append(linha)
+            if len(bloco) == tamanho_bloco:
+                yield pd.DataFrame(bloco, columns=colunas)
+                bloco = []
+                emitiu = True
+        if bloco or not emitiu:
+            yield pd.DataFrame(bloco, columns=colunas)
+    finally:
+        wb.close()
+
+
+def _bloco_para_arrow(df):
+    colunas = []
+    for col in df.columns:
+        try:
+            colunas.append(pa.array(df[col], from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            texto = df[col].where(df[col].isna(), df[col].astype(str))
+            colunas.append(pa.array(texto, from_pandas=True, type=pa.string()))
+    return pa.Table.from_arrays(colunas, names=[str(col) for col in df.columns])
+
+
+def _unificar_tipo(tipos):
+    tipos = {tipo for tipo in tipos if not pa.types.is_null(tipo)}
+    if not tipos:
+        return pa.null()
+    if len(tipos) == 1:
+        return tipos.pop()
+    if all(pa.types.is_integer(tipo) for tipo in tipos):
+        return pa.int64()
+    if all(pa.types.is_integer(tipo) or pa.types.is_floating(tipo) for tipo in tipos):
+        return pa.float64()
+    if all(pa.types.is_timestamp(tipo) for tipo in tipos):
+        return pa.timestamp('ns')
+    return pa.string()
+
+
+def converter_em_blocos(arquivo, caminho, tamanho_bloco=TAMANHO_BLOCO):
+    # Cada bloco passa por renomear/datas/Saldo e vai para um Parquet parcial em disco.
+    # Só no final os tipos são unificados (ex.: Plano numérico num bloco e texto em outro)
+    # e as partes são regravadas uma a uma no arquivo final, então a memória fica
+    # limitada a um bloco independente do tamanho do export.
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(caminho) or ".") as pasta:
+        partes = []
+        tipos = {}
+        for i, bloco in enumerate(ler_blocos(arquivo, tamanho_bloco)):
+            tabela = _bloco_para_arrow(normalizar(bloco))
+            for campo in tabela.schema:
+                tipos.setdefault(campo.name, set()).add(campo.type)
+            parte = os.path.join(pasta, f"{i:06d}.parquet")
+            pq.write_table(tabela, parte)
+            partes.append(parte)
+            del bloco, tabela
+
+        esquema = pa.schema([(nome, _unificar_tipo(t)) for nome, t in tipos.items()])
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with pq.ParquetWriter(temporario, esquema) as escritor:
+            for parte in partes:
+                escritor.write_table(pq.read_table(parte).cast(esquema))
+        os.replace(temporario, caminho)
+
+
+def converter_planilha(conteudo, caminho):
+    try:
+        converter_em_blocos(io.BytesIO(conteudo), caminho)
+    except (InvalidFileException, zipfile.BadZipFile):
+        # .xls antigo: o openpyxl não lê, então cai para o xlrd carregando a planilha inteira
+        df = pd.read_excel(io.BytesIO(conteudo), engine='xlrd')
+        gravar_parquet(normalizar(df), caminho)
+
+
+def ler_parquet(caminho, colunas=None, filtros=None):
+    return pq.read_table(caminho, columns=colunas, filters=filtros, memory_map=True).to_pandas()
+
+
+def _converter(conteudo, caminho):
+    # Executado nos processos de trabalho: devolve só o caminho, o DataFrame não volta por pickle
+    if not os.path.exists(caminho):
+        converter_planilha(conteudo, caminho)
+    return caminho
+
+
+def converter_em_paralelo(arquivos, ao_progredir=None, max_processos=None):
+    # arquivos: [(chave, conteúdo)]; cada planilha ainda sem Parquet é convertida num processo
+    max_processos = max_processos or MAX_PROCESSOS
+    pendentes = [(chave, conteudo) for chave, conteudo in arquivos if not os.path.exists(caminho_cache(chave))]
+    total = len(arquivos)
+    concluidos = total - len(pendentes)
+    if ao_progredir:
+        ao_progredir(concluidos, total)
+
+    if len(pendentes) <= 1 or max_processos <= 1:
+        for chave, conteudo in pendentes:
+            _converter(conteudo, caminho_cache(chave))
+            concluidos += 1
+            if ao_progredir:
+                ao_progredir(concluidos, total)
+        return
+
+    # spawn: o processo do servidor tem threads, e fork com threads pode travar os filhos
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(len(pendentes), max_processos), mp_context=contexto) as executor:
+        futuros = [executor.submit(_converter, conteudo, caminho_cache(chave)) for chave, conteudo in pendentes]
+        for futuro in as_completed(futuros):
+            futuro.result()
+            concluidos += 1
+            if ao_progredir:
+                ao_progredir(concluidos, total)
+
+
+def carregar_varias(arquivos, ao_progredir=None, max_processos=None):
+    # Junta vários exports num dataset só; a mesma OF em mais de um arquivo fica com a
+    # linha do último arquivo da lista (o export mais recente, se vierem em ordem)
+    chaves = [chave for chave, _ in arquivos]
+    chave = chave_combinada(chaves)
+    caminho = caminho_cache(chave)
+
+    if not os.path.exists(caminho):
+        converter_em_paralelo(arquivos, ao_progredir, max_processos)
+        if len(arquivos) > 1:
+            df = pd.concat([ler_parquet(caminho_cache(c)) for c in dict.fromkeys(chaves)], ignore_index=True)
+            if COLUNAS['ORDEM_F'] in df.columns:
+                df = df.drop_duplicates(COLUNAS['ORDEM_F'], keep='last').reset_index(drop=True)
+            gravar_parquet(df, caminho)
+
+    # Sempre lê do Parquet, assim carga fria e quente devolvem exatamente os mesmos tipos
+    df = ler_parquet(caminho)
+    df.attrs["versao"] = chave
+    return df
+
+
+def carregar_ofs(conteudo, chave=None):
+    return carregar_varias([(chave or hash_conteudo(conteudo), conteudo)])
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from pcp import classificacao
+
+# Somas aditivas por lote (Plano): um delta só mexe nas linhas dos lotes que tocou
+SOMAS = ['ofs', 'fechadas', 'programado', 'produzido']
+
+
+def _agregar(df):
+    # Um único groupby vetorizado sobre o dataset (ou sobre as linhas de um delta)
+    saldo = df['Saldo'].to_numpy()
+    colunas = {
+        'Plano': df['Plano'].to_numpy(dtype=object),
+        'ofs': np.ones(len(df), dtype=np.int64),
+        'fechadas': (saldo == 0).astype(np.int64),
+    }
+    # Sem PROGRAMADO/PRODUZIDO no export, o progresso cai para a fração de OFs fechadas
+    if 'PROGRAMADO' in df.columns and 'PRODUZIDO' in df.columns:
+        colunas['programado'] = df['PROGRAMADO'].to_numpy(dtype=np.float64)
+        colunas['produzido'] = df['PRODUZIDO'].to_numpy(dtype=np.float64)
+    else:
+        colunas['programado'] = np.zeros(len(df))
+        colunas['produzido'] = np.zeros(len(df))
+    return pd.DataFrame(colunas).groupby('Plano', sort=False)[SOMAS].sum()
+
+
+def _progresso(somas):
+    # Percentual produzido sobre programado; sem quantidades, OFs fechadas sobre total
+    programado = somas['programado'].to_numpy()
+    por_quantidade = np.divide(somas['produzido'].to_numpy(), programado,
+                               out=np.zeros(len(somas)), where=programado > 0)
+    por_ofs = np.divide(somas['fechadas'].to_numpy(), somas['ofs'].to_numpy(),
+                        out=np.zeros(len(somas)), where=somas['ofs'].to_numpy() > 0)
+    return np.clip(np.where(programado > 0, por_quantidade, por_ofs) * 100, 0, 100)
+
+
+class ProgressoLotes:
+    # Conclusão de cada lote a partir das OFs, montada uma vez por versão do dataset
+
+    def __init__(self, df):
+        somas = _agregar(df)
+        somas['progresso'] = _progresso(somas)
+        self.somas = somas
+
+    def atualizar(self, delta):
+        # Progresso da versão seguinte a partir do delta da loja: só os lotes que
+        # aparecem nas linhas antigas/novas são recalculados. O objeto atual não muda.
+        diferenca = _agregar(delta.novas).sub(_agregar(delta.antigas), fill_value=0)
+        novo = ProgressoLotes.__new__(ProgressoLotes)
+        somas = self.somas.reindex(self.somas.index.union(diferenca.index, sort=False), fill_value=0)
+        tocados = diferenca.index
+        for col in SOMAS:
+            atual = somas.loc[tocados, col]
+            somas.loc[tocados, col] = (atual + diferenca[col]).astype(atual.dtype)
+        somas.loc[tocados, 'progresso'] = _progresso(somas.loc[tocados])
+        novo.somas = somas[somas['ofs'] > 0]
+        return novo
+
+    def lotes(self, apenas_25xxx=True, limite=None):
+        # Lista no formato usado por gauges.html_lotes, do lote mais recente para o mais antigo
+        somas = self.somas
+        if apenas_25xxx:
+            _, plano_25xxx = classificacao.classificar_planos(somas.index)
+            somas = somas[plano_25xxx]
+        ordem = np.argsort(somas.index.astype(str).to_numpy())[::-1]
+        if limite is not None:
+            ordem = ordem[:limite]
+        somas = somas.iloc[ordem]
+        return [
+            {"id": str(plano), "progresso": float(progresso), "ofs": int(ofs)}
+            for plano, progresso, ofs in zip(somas.index, somas['progresso'], somas['ofs'])
+        ]
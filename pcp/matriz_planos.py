@@ -0,0 +1,114 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from pcp import classificacao
+
+# Acima desse número de planos a tabela sai sem cores e paginada
+LIMITE_ESTILO = int(os.environ.get("PCP_LIMITE_ESTILO", 300))
+
+NIVEIS = ['Plano', 'Tipo_Lote', 'Situação', 'status']
+
+# Mesmo limiar de luminância do Styler.background_gradient
+_LIMIAR_TEXTO = 0.408
+
+
+class MatrizPlanos:
+    # Contagem de OFs dos planos 25XXX por (Plano, Tipo_Lote, Situação, status), montada
+    # uma vez por versão e dia. Cada estado de filtro vira só uma soma sobre essa matriz
+    # (centenas de planos x 8 combinações), sem passar pelas linhas do dataset.
+
+    def __init__(self, df, hoje):
+        self.hoje = hoje
+        self.contagens = self._agregar(df)
+        self._tabelas = LRUCache(maxsize=64)
+        self._trava = threading.Lock()
+
+    def _agregar(self, df):
+        if 'status' not in df.columns:
+            df = df.join(classificacao.classificar(df, self.hoje))
+        planos = df[df['Plano_25xxx'].to_numpy()]
+        contagens = planos.groupby(NIVEIS, observed=True).size()
+        # Níveis como valores simples: categorias de versões diferentes não precisam casar
+        contagens.index = pd.MultiIndex.from_arrays(
+            [contagens.index.get_level_values(nivel).astype(object) for nivel in NIVEIS], names=NIVEIS
+        )
+        return contagens[contagens > 0]
+
+    def atualizar(self, delta):
+        # Matriz da versão seguinte: tira as linhas antigas do delta e soma as novas
+        novo = MatrizPlanos.__new__(MatrizPlanos)
+        novo.hoje = self.hoje
+        soma = pd.concat([self.contagens, -self._agregar(delta.antigas), self._agregar(delta.novas)])
+        soma = soma.groupby(level=NIVEIS, sort=False).sum()
+        novo.contagens = soma[soma > 0]
+        novo._tabelas = LRUCache(maxsize=64)
+        novo._trava = threading.Lock()
+        return novo
+
+    def contagem(self, selecoes):
+        # Quantidade por Plano x status, como groupby(['Plano', 'status']).size().unstack()
+        contagens = self.contagens
+        mascara = np.ones(len(contagens), dtype=bool)
+        for nivel in NIVEIS:
+            selecionados = selecoes.get(nivel)
+            if selecionados:
+                mascara &= contagens.index.get_level_values(nivel).isin(selecionados)
+        selecionadas = contagens[mascara]
+        if selecionadas.empty:
+            return pd.DataFrame()
+
+        tabela = selecionadas.groupby(level=['Plano', 'status']).sum().unstack(fill_value=0)
+        tabela = tabela[[status for status in classificacao.STATUS if status in tabela.columns]]
+        tabela.columns = tabela.columns.astype(str)
+        tabela.columns.name = 'status'
+        return tabela.sort_index()
+
+    def tabelas(self, chave, selecoes):
+        # Por estado de filtro: contagem, porcentagem e o CSS do gradiente de cada uma.
+        # Voltar a um filtro já visto não refaz nem a soma nem as cores.
+        with self._trava:
+            resultado = self._tabelas.get(chave)
+        if resultado is None:
+            contagem = self.contagem(selecoes)
+            if contagem.empty:
+                resultado = (contagem, contagem, None, None)
+            else:
+                porcentagem = contagem.div(contagem.sum(axis=1), axis=0) * 100
+                estilizar = len(contagem) <= LIMITE_ESTILO
+                resultado = (
+                    contagem,
+                    porcentagem,
+                    gradiente(contagem, 'Blues') if estilizar else None,
+                    gradiente(porcentagem, 'Greens') if estilizar else None,
+                )
+            with self._trava:
+                self._tabelas[chave] = resultado
+        return resultado
+
+
+def _luminancia(rgba):
+    canais = rgba[..., :3]
+    linear = np.where(canais <= 0.04045, canais / 12.92, ((canais + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def gradiente(tabela, cmap):
+    # CSS célula a célula igual ao background_gradient (normalização por coluna),
+    # calculado em lote uma vez; o Styler só aplica o resultado pronto
+    import matplotlib
+
+    mapa = matplotlib.colormaps[cmap]
+    valores = tabela.to_numpy(dtype=float)
+    minimo = np.nanmin(valores, axis=0)
+    faixa = np.nanmax(valores, axis=0) - minimo
+    normalizado = np.divide(valores - minimo, faixa, out=np.zeros_like(valores), where=faixa > 0)
+    rgba = mapa(normalizado)
+
+    hexa = np.vectorize(matplotlib.colors.rgb2hex, signature='(n)->()')(rgba)
+    texto = np.where(_luminancia(rgba) < _LIMIAR_TEXTO, "#f1f1f1", "#000000")
+    css = np.char.add(np.char.add(np.char.add("background-color: ", hexa.astype(str)), ";color: "), texto)
+    return pd.DataFrame(np.char.add(css, ";"), index=tabela.index, columns=tabela.columns)
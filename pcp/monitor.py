@@ -0,0 +1,155 @@
+import glob
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from pcp import ingestao
+
+# Pasta onde o ERP deixa os exports de OFs; vazia desliga o monitor
+PASTA_ERP = os.environ.get("PCP_PASTA_ERP", "")
+
+# Tempo sem mudança de tamanho para considerar que o ERP terminou de gravar o arquivo
+ESPERA_ESTAVEL_S = float(os.environ.get("PCP_ESPERA_ESTAVEL_S", 2.0))
+
+EXTENSOES = (".xlsx",)
+
+
+def _e_export(caminho):
+    nome = os.path.basename(caminho)
+    # "~$arquivo.xlsx" é o arquivo de trava do Excel, não um export
+    return nome.lower().endswith(EXTENSOES) and not nome.startswith("~$")
+
+
+class _Eventos(FileSystemEventHandler):
+
+    def __init__(self, fila):
+        self._fila = fila
+
+    def on_created(self, event):
+        if not event.is_directory and _e_export(event.src_path):
+            self._fila.put(event.src_path)
+
+    def on_modified(self, event):
+        self.on_created(event)
+
+    def on_moved(self, event):
+        if not event.is_directory and _e_export(event.dest_path):
+            self._fila.put(event.dest_path)
+
+
+class MonitorPasta:
+    # Ingestão em segundo plano: cada export novo na pasta é lido, convertido e indexado
+    # numa thread própria; só quando tudo está pronto a versão atual é trocada (uma
+    # atribuição), então as sessões nunca esperam um parse. O monitor guarda só a versão:
+    # o dataset fica no registro, dentro do orçamento de memória.
+
+    def __init__(self, pasta, carregar, espera_estavel=ESPERA_ESTAVEL_S):
+        # carregar(chave, conteúdo) -> DataFrame, já registrado e indexado
+        self.pasta = pasta
+        self.espera_estavel = espera_estavel
+        self._carregar = carregar
+        self._fila = queue.Queue()
+        self._trava = threading.Lock()
+        self._atual = None
+        self._mtime_atual = None
+        self._observador = None
+        self._metricas = {
+            'arquivo': None,
+            'ultima_ingestao': None,
+            'linhas': 0,
+            'duracao_s': 0.0,
+            'ingestoes': 0,
+            'erros': 0,
+            'ultimo_erro': None,
+        }
+
+    def iniciar(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        self._observador = Observer()
+        self._observador.daemon = True
+        self._observador.schedule(_Eventos(self._fila), self.pasta, recursive=False)
+        self._observador.start()
+        threading.Thread(target=self._trabalhar, name="pcp-monitor-erp", daemon=True).start()
+
+        # O export mais recente que já estava na pasta entra como estado inicial
+        existentes = [c for c in glob.glob(os.path.join(self.pasta, "*")) if _e_export(c)]
+        if existentes:
+            self._fila.put(max(existentes, key=os.path.getmtime))
+        return self
+
+    def parar(self):
+        if self._observador is not None:
+            self._observador.stop()
+
+    def atual(self):
+        # Versão da última ingestão concluída, ou None
+        return self._atual
+
+    def metricas(self):
+        with self._trava:
+            return dict(self._metricas)
+
+    def _trabalhar(self):
+        while True:
+            pendentes = {self._fila.get(): None}
+            # Junta os eventos em rajada (o ERP costuma gerar vários por arquivo)
+            while True:
+                try:
+                    pendentes[self._fila.get(timeout=self.espera_estavel)] = None
+                except queue.Empty:
+                    break
+
+            # Cada export é uma foto completa: só o mais recente interessa
+            existentes = [c for c in pendentes if os.path.exists(c)]
+            if not existentes:
+                continue
+            caminho = max(existentes, key=os.path.getmtime)
+            if self._aguardar_estavel(caminho):
+                self._ingerir(caminho)
+
+    def _aguardar_estavel(self, caminho):
+        tamanho = -1
+        while os.path.exists(caminho):
+            novo = os.path.getsize(caminho)
+            if novo == tamanho:
+                return True
+            tamanho = novo
+            time.sleep(self.espera_estavel)
+        return False
+
+    def _ingerir(self, caminho):
+        mtime = os.path.getmtime(caminho)
+        if self._mtime_atual is not None and mtime < self._mtime_atual:
+            return
+
+        inicio = time.perf_counter()
+        try:
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+            chave = ingestao.hash_conteudo(conteudo)
+            if self._atual == chave:
+                return
+            df = self._carregar(chave, conteudo)
+        except Exception as erro:
+            with self._trava:
+                self._metricas['erros'] += 1
+                self._metricas['ultimo_erro'] = f"{os.path.basename(caminho)}: {erro}"
+            return
+
+        with self._trava:
+            self._metricas.update(
+                arquivo=os.path.basename(caminho),
+                ultima_ingestao=datetime.now(),
+                linhas=len(df),
+                duracao_s=time.perf_counter() - inicio,
+                ingestoes=self._metricas['ingestoes'] + 1,
+            )
+            # Troca atômica, depois das métricas: quem vê a versão nova já vê as métricas dela
+            # (nunca uma versão com ultima_ingestao ainda None)
+            self._atual = chave
+            self._mtime_atual = mtime
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from pcp import classificacao, compacto
+
+# Acompanhamento de pedidos: cada Plano é um pedido, com prazo = maior Final das suas OFs.
+# Somas aditivas por (Plano, dia do Final) permitem atualizar pelo delta de um export;
+# por tipo (Pedido/Paralelo) os pedidos em aberto ficam num arranjo ordenado por prazo,
+# então "vencem nos próximos N dias" e os mais atrasados são searchsorted + fatia.
+# Como na Situação das OFs, prazo até hoje (inclusive) já é atraso.
+SOMAS = ['ofs', 'abertas', 'saldo', 'programado', 'produzido']
+
+
+def _agregar(df):
+    saldo = df['Saldo'].to_numpy(dtype=np.float64)
+    colunas = {
+        'Plano': df['Plano'].to_numpy(dtype=object),
+        'dia': compacto.dias(df, 'Final').astype(np.int64),
+        'ofs': np.ones(len(df), dtype=np.int64),
+        'abertas': (saldo != 0).astype(np.int64),
+        'saldo': saldo,
+    }
+    for col, origem in [('programado', 'PROGRAMADO'), ('produzido', 'PRODUZIDO')]:
+        colunas[col] = df[origem].to_numpy(dtype=np.float64) if origem in df.columns else np.zeros(len(df))
+    return pd.DataFrame(colunas).groupby(['Plano', 'dia'], sort=False)[SOMAS].sum()
+
+
+def _resumir(somas):
+    # Uma linha por pedido a partir das somas por (Plano, dia)
+    planos = somas.groupby(level='Plano', sort=False)
+    pedidos = planos[SOMAS].sum()
+    dias = pd.Series(somas.index.get_level_values('dia'), index=somas.index)
+    # Datas ausentes não definem prazo; pedido só com OFs sem data fica com SEM_DATA
+    pedidos['prazo'] = dias.where(dias != compacto.SEM_DATA).groupby(level='Plano', sort=False).max()
+    pedidos['prazo'] = pedidos['prazo'].fillna(compacto.SEM_DATA).astype(np.int64)
+    pedido, _ = classificacao.classificar_planos(pedidos.index)
+    pedidos['Tipo_Lote'] = np.where(pedido, 'Pedido', 'Paralelo')
+    return pedidos
+
+
+class _Ordenados:
+    # Pedidos em aberto de um tipo, ordenados por (prazo, plano); o plano como texto
+    # desempata prazos iguais e fica guardado para não ser convertido a cada export
+
+    def __init__(self, prazos, planos, chaves=None):
+        chaves = planos.astype(str) if chaves is None else chaves
+        ordem = np.lexsort((chaves, prazos))
+        self.prazos = prazos[ordem]
+        self.planos = planos[ordem]
+        self.chaves = chaves[ordem]
+
+    def trocar(self, remover, prazos, planos):
+        # Tira os pedidos tocados e junta os novos valores pela mesma chave (prazo, plano)
+        # da ordenação completa, então empates saem na mesma ordem de remontar do zero.
+        # Só os planos novos viram texto; a ordenação é sobre os pedidos em aberto, não as OFs.
+        manter = ~pd.Index(self.planos).isin(remover)
+        return _Ordenados(
+            np.concatenate([self.prazos[manter], prazos]),
+            np.concatenate([self.planos[manter], planos]),
+            np.concatenate([self.chaves[manter], planos.astype(str)]),
+        )
+
+    def faixa(self, inicio, fim):
+        # Planos com prazo em [inicio, fim], do mais próximo ao mais distante
+        esquerda = np.searchsorted(self.prazos, inicio, side='left')
+        direita = np.searchsorted(self.prazos, fim, side='right')
+        return self.planos[esquerda:direita]
+
+
+class IndicePedidos:
+    # Montado uma vez por versão do dataset; um export novo só refaz os planos que tocou
+
+    def __init__(self, df):
+        self.somas = _agregar(df)
+        self.pedidos = _resumir(self.somas)
+        self._ordenados = {
+            tipo: _Ordenados(*self._em_aberto(self.pedidos[self.pedidos['Tipo_Lote'] == tipo]))
+            for tipo in classificacao.TIPOS_LOTE
+        }
+
+    @staticmethod
+    def _em_aberto(pedidos):
+        em_aberto = pedidos[(pedidos['abertas'] > 0) & (pedidos['prazo'] != compacto.SEM_DATA)]
+        return em_aberto['prazo'].to_numpy(), em_aberto.index.to_numpy(dtype=object)
+
+    def atualizar(self, delta):
+        diferenca = _agregar(delta.novas).sub(_agregar(delta.antigas), fill_value=0)
+        tocados = diferenca.index.get_level_values('Plano').unique()
+
+        somas = self.somas.reindex(self.somas.index.union(diferenca.index, sort=False), fill_value=0)
+        somas.loc[diferenca.index, SOMAS] = somas.loc[diferenca.index, SOMAS] + diferenca[SOMAS]
+        somas = somas[somas['ofs'] > 0]
+
+        novo = IndicePedidos.__new__(IndicePedidos)
+        novo.somas = somas
+        # Pelos códigos do nível Plano: comparar inteiros em vez de texto em cada linha das somas
+        codigos = somas.index.levels[0].get_indexer(tocados)
+        refeitos = _resumir(somas[np.isin(somas.index.codes[0], codigos[codigos >= 0])])
+        novo.pedidos = pd.concat([self.pedidos.drop(tocados, errors='ignore'), refeitos])
+        novo._ordenados = {
+            tipo: ordenados.trocar(tocados.to_numpy(dtype=object), *self._em_aberto(refeitos[refeitos['Tipo_Lote'] == tipo]))
+            for tipo, ordenados in self._ordenados.items()
+        }
+        return novo
+
+    def _tabela(self, planos):
+        return self.pedidos.loc[planos]
+
+    def vencendo(self, tipo, inicio, fim):
+        # Pedidos em aberto com prazo entre as duas datas (inclusive), por prazo
+        planos = self._ordenados[tipo].faixa(compacto.dia_numero(inicio), compacto.dia_numero(fim))
+        return self._tabela(planos)
+
+    def mais_atrasados(self, tipo, hoje, k):
+        # Os k pedidos em aberto com prazo vencido há mais tempo
+        ordenados = self._ordenados[tipo]
+        fim = np.searchsorted(ordenados.prazos, compacto.dia_numero(hoje), side='right')
+        return self._tabela(ordenados.planos[:min(k, fim)])
+
+    def resumo(self, tipo, hoje, janelas=(7, 30)):
+        ordenados = self._ordenados[tipo]
+        dia_hoje = compacto.dia_numero(hoje)
+        resultado = {
+            'em_aberto': len(ordenados.prazos),
+            'atrasados': int(np.searchsorted(ordenados.prazos, dia_hoje, side='right')),
+        }
+        for janela in janelas:
+            resultado[f'vencem_{janela}d'] = len(ordenados.faixa(dia_hoje + 1, dia_hoje + janela))
+        return resultado
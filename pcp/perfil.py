@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# Perfil de execução (opt-in): tempo, pico de memória e bytes enviados ao navegador por seção.
+# Sem dependências pesadas, porque o app.py importa isso antes de qualquer página.
+
+ATIVO = os.environ.get("PCP_PERFIL", "") not in ("", "0")
+
+ARQUIVO = os.environ.get(
+    "PCP_PERFIL_ARQUIVO", os.path.join(os.environ.get("PCP_CACHE_DIR", ".cache_pcp"), "perfil.jsonl")
+)
+
+# O tracemalloc deixa as alocações bem mais lentas: fica ligado só enquanto houver
+# alguma execução perfilada em andamento (várias sessões podem perfilar ao mesmo tempo)
+_trava = threading.Lock()
+_em_andamento = 0
+
+
+def _ligar_rastreio():
+    global _em_andamento
+    with _trava:
+        if _em_andamento == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _em_andamento += 1
+
+
+def _desligar_rastreio():
+    global _em_andamento
+    with _trava:
+        _em_andamento -= 1
+        if _em_andamento == 0:
+            tracemalloc.stop()
+
+
+class _Secao:
+
+    def __init__(self, nome, e_marco):
+        self.nome = nome
+        self.e_marco = e_marco
+        self.inicio = time.perf_counter()
+        self.memoria_inicio = tracemalloc.get_traced_memory()[0]
+        self.pico = self.memoria_inicio
+        self.payload = 0
+        self.registro = None
+
+
+class Execucao:
+    # Uma por rerun. As seções formam uma pilha: o payload e o pico de uma seção
+    # também contam para as seções que a contêm.
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.quando = datetime.now()
+        self.secoes = []
+        self._pilha = []
+        self._finalizada = False
+        # Falso quando não há como interceptar as mensagens enviadas ao navegador
+        self.payload_medido = True
+        _ligar_rastreio()
+
+    def _atualizar_pico(self):
+        # O pico do tracemalloc é global: repassa para todas as seções abertas antes de zerar
+        pico = tracemalloc.get_traced_memory()[1]
+        for secao in self._pilha:
+            secao.pico = max(secao.pico, pico)
+        tracemalloc.reset_peak()
+
+    def abrir(self, nome, e_marco=False):
+        self._atualizar_pico()
+        caminho = "/".join([s.nome for s in self._pilha] + [nome])
+        secao = _Secao(nome, e_marco)
+        # Registra já na ordem de abertura; os números são preenchidos no fechamento
+        secao.registro = {'secao': caminho, 'nivel': len(self._pilha)}
+        self.secoes.append(secao.registro)
+        self._pilha.append(secao)
+        return secao
+
+    def fechar(self, secao=None):
+        # Fecha a seção (e o que ainda estiver aberto dentro dela); sem argumento, a do topo
+        secao = secao or self._pilha[-1]
+        if secao not in self._pilha:
+            return
+        self._atualizar_pico()
+        while self._pilha:
+            topo = self._pilha.pop()
+            topo.registro.update(
+                tempo_ms=(time.perf_counter() - topo.inicio) * 1000,
+                pico_bytes=max(topo.pico - topo.memoria_inicio, 0),
+                payload_bytes=topo.payload,
+            )
+            if topo is secao:
+                break
+
+    def marcar(self, nome):
+        # Seção sequencial dentro da seção atual: fecha a marca anterior e abre a próxima,
+        # sem precisar reindentar o corpo de um main() linear
+        if not self._pilha:
+            return
+        if self._pilha[-1].e_marco:
+            self.fechar()
+        self.abrir(nome, e_marco=True)
+
+    def contar_payload(self, n_bytes):
+        for secao in self._pilha:
+            secao.payload += n_bytes
+
+    def finalizar(self):
+        while self._pilha:
+            self.fechar()
+        if not self._finalizada:
+            self._finalizada = True
+            _desligar_rastreio()
+        return {
+            'quando': self.quando.isoformat(timespec='seconds'),
+            'pagina': self.pagina,
+            'payload_medido': self.payload_medido,
+            'secoes': self.secoes,
+        }
+
+
+def exportar(registro, arquivo=ARQUIVO):
+    # Uma linha JSON por rerun, acrescentada ao arquivo
+    os.makedirs(os.path.dirname(arquivo) or ".", exist_ok=True)
+    with open(arquivo, "a", encoding="utf-8") as saida:
+        saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
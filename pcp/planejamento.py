@@ -0,0 +1,48 @@
+from functools import lru_cache
+from urllib.parse import quote
+
+import pandas as pd
+
+# Tabela de planejamento dos lotes: um DataFrame tipado editado numa única grade
+FLAGS = ["Programar", "Cálculo NEC", "Gerar SOC", "E-mail SOC", "Gerar OF"]
+COLUNAS = ["Lote", "Descrição", "Cor"] + FLAGS
+
+REGISTROS_INICIAIS = [
+    {"Lote": "24328", "Descrição": "PLANTADEIRAS AGCO", "Cor": "pink", "Programar": True, "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": True},
+    {"Lote": "24431", "Descrição": "PLAINAS C", "Cor": "magenta", "Programar": True, "Cálculo NEC": True, "Gerar SOC": True, "E-mail SOC": True, "Gerar OF": True},
+]
+
+
+def tabela(registros):
+    df = pd.DataFrame(list(registros), columns=COLUNAS)
+    for col in ["Lote", "Descrição", "Cor"]:
+        df[col] = df[col].astype(str)
+    for col in FLAGS:
+        df[col] = df[col].fillna(False).astype(bool)
+    return df
+
+
+def mudancas(df, edicoes):
+    # edicoes: {linha: {coluna: valor}} como em st.session_state[chave]["edited_rows"].
+    # Só as células de flag que de fato mudaram viram escrita: [(lote, versão lida, {flag: valor})]
+    resultado = []
+    for linha, valores in edicoes.items():
+        registro = df.iloc[int(linha)]
+        alteradas = {
+            col: bool(valor) for col, valor in valores.items()
+            if col in FLAGS and registro[col] != bool(valor)
+        }
+        if alteradas:
+            resultado.append((registro["Lote"], registro["versao"], alteradas))
+    return resultado
+
+
+@lru_cache(maxsize=256)
+def amostra_cor(cor):
+    # Quadrado da cor como imagem SVG embutida, para a coluna de imagem da grade
+    svg = f"<svg xmlns='http://www.w3.org/2000/svg' width='25' height='25'><rect width='25' height='25' rx='4' fill='{cor}'/></svg>"
+    return "data:image/svg+xml," + quote(svg)
+
+
+def visao_grade(df):
+    return df.assign(Cor=df["Cor"].map(amostra_cor))
@@ -0,0 +1,303 @@
+import heapq
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from pcp import compacto, setores
+
+# Sequenciamento das OFs abertas com capacidade finita por setor.
+# Cada setor é um recurso com capacidade diária (em unidades de Saldo) dada pelo calendário.
+# Lista por prioridade: a cada dia o setor termina a OF em andamento e puxa do heap a próxima
+# liberada (prioridade do lote, Final, liberação, Ordem F), até gastar a capacidade do dia.
+# Uma OF começada vai até o fim (sem preempção) e pode atravessar vários dias.
+
+DIAS_UTEIS = (0, 1, 2, 3, 4)
+
+# Lotes sem prioridade informada entram depois dos priorizados
+PRIORIDADE_PADRAO = 9
+
+# Limite do horizonte: OFs que não cabem nele ficam sem data prevista
+HORIZONTE_DIAS = int(os.environ.get("PCP_HORIZONTE_PROGRAMACAO", 3650))
+
+# Prazo (dias úteis) assumido para OFs abertas sem Inicio ou Final na estimativa de capacidade
+PRAZO_PADRAO = 20
+
+_SEM_PRAZO = np.iinfo(np.int32).max
+
+
+class Calendario:
+    # capacidade: {setor: unidades por dia útil}; feriados: datas sem produção em nenhum setor
+
+    def __init__(self, capacidade, dias_uteis=DIAS_UTEIS, feriados=()):
+        self.capacidade = dict(capacidade)
+        self.dias_uteis = tuple(dias_uteis)
+        self.feriados = frozenset(compacto.dia_numero(dia) for dia in feriados)
+
+    def capacidades(self, setor, inicio, dias):
+        # Capacidade de cada dia a partir de 'inicio' (número do dia), como lista
+        numeros = np.arange(inicio, inicio + dias)
+        # 1970-01-01 foi uma quinta-feira (weekday 3)
+        util = np.isin((numeros + 3) % 7, self.dias_uteis)
+        if self.feriados:
+            util &= ~np.isin(numeros, list(self.feriados))
+        return np.where(util, float(self.capacidade.get(setor, 0)), 0.0).tolist()
+
+
+def capacidades_estimadas(df, dias_uteis=DIAS_UTEIS):
+    # Capacidade por dia útil quando não há produção registrada (export sem PRODUZIDO ou nada
+    # fechado na janela): o saldo aberto do setor dividido pelo prazo médio das OFs abertas,
+    # em dias úteis entre Inicio e Final. Setores sem saldo aberto ficam de fora.
+    abertas = df[df['Saldo'].to_numpy() > 0]
+    inicio = compacto.dias(abertas, 'Inicio').astype(np.int64)
+    final = compacto.dias(abertas, 'Final').astype(np.int64)
+    com_datas = (inicio != compacto.SEM_DATA) & (final != compacto.SEM_DATA) & (final >= inicio)
+    prazo = np.full(len(abertas), PRAZO_PADRAO, dtype=np.int64)
+    mascara = "".join("1" if dia in dias_uteis else "0" for dia in range(7))
+    prazo[com_datas] = np.busday_count(
+        inicio[com_datas].astype('datetime64[D]'), final[com_datas].astype('datetime64[D]') + 1, weekmask=mascara,
+    )
+    codigos, valores = pd.factorize(abertas['Sub-g'], use_na_sentinel=False)
+    nomes = np.array([setores.nome_setor(valor) for valor in valores], dtype=object)
+    tabela = pd.DataFrame({
+        'setor': nomes[codigos],
+        'saldo': abertas['Saldo'].to_numpy(dtype=np.float64),
+        'prazo': np.maximum(prazo, 1),
+    }).groupby('setor', sort=False).agg(saldo=('saldo', 'sum'), prazo=('prazo', 'mean'))
+    return (tabela['saldo'] / tabela['prazo']).round().clip(lower=1).to_dict()
+
+
+class _Linha:
+    # Programação de um setor: início/fim previstos por OF e, por dia simulado, a OF em
+    # andamento no começo do dia com o que faltava dela. Com isso dá para retomar a
+    # simulação de qualquer dia sem refazer os anteriores.
+
+    def __init__(self, indices):
+        self.indices = indices
+        self.inicio = {}
+        self.fim = {}
+        self.estado = {}
+
+    def antes(self, dia):
+        # Cópia só com o que aconteceu antes do dia (os dicionários são preenchidos em ordem cronológica)
+        copia = _Linha(self.indices)
+        copia.inicio = _antes(self.inicio, self.inicio.values(), dia)
+        copia.fim = _antes(self.fim, self.fim.values(), dia)
+        copia.estado = _antes(self.estado, self.estado.keys(), dia)
+        return copia
+
+
+def _antes(dicionario, dias, dia):
+    dias = np.fromiter(dias, dtype=np.int64, count=len(dicionario))
+    return dict(itertools.islice(dicionario.items(), int(np.searchsorted(dias, dia))))
+
+
+class Programacao:
+
+    def __init__(self, df, calendario, prioridades, hoje):
+        # df: OFs (todas ou só as abertas) com Ordem F, Plano, Sub-g, Inicio, Final, Saldo
+        # prioridades: {lote: número}, menor primeiro
+        self.calendario = calendario
+        self.hoje = compacto.dia_numero(hoje)
+        self.prioridades = dict(prioridades)
+
+        abertas = df[df['Saldo'].to_numpy() > 0]
+        self.ordem_f = abertas['Ordem F'].to_numpy()
+        # Plano como texto, igual ao Lote da tabela de planejamento
+        self.planos = abertas['Plano'].astype(str).to_numpy(dtype=object)
+        self._plano, self._lotes = pd.factorize(self.planos)
+        self._prioridades_lotes = self._tabela_prioridades()
+        self.saldo = abertas['Saldo'].to_numpy(dtype=np.float64)
+        inicio = compacto.dias(abertas, 'Inicio').astype(np.int64)
+        self.liberacao = np.maximum(np.where(inicio == compacto.SEM_DATA, self.hoje, inicio), self.hoje)
+        final = compacto.dias(abertas, 'Final').astype(np.int64)
+        self.final = np.where(final == compacto.SEM_DATA, _SEM_PRAZO, final)
+
+        codigos, valores = pd.factorize(abertas['Sub-g'], use_na_sentinel=False)
+        nomes = np.array([setores.nome_setor(valor) for valor in valores], dtype=object)
+        self.setor = nomes[codigos]
+
+        # Índices das OFs de cada setor
+        codigos, nomes = pd.factorize(self.setor)
+        self._por_setor = {setor: np.flatnonzero(codigos == k) for k, setor in enumerate(nomes)}
+        # Sem capacidade o setor não seria simulado até o fim do horizonte à toa: as OFs
+        # dele ficam sem data prevista
+        self.sem_capacidade = [
+            setor for setor in self._por_setor if not self.calendario.capacidade.get(setor, 0) > 0
+        ]
+        self._tabela = None
+        self._linhas = {}
+        for setor, indices in self._por_setor.items():
+            linha = _Linha(indices)
+            if setor not in self.sem_capacidade:
+                self._simular(setor, linha, self.hoje, None, 0.0, indices)
+            self._linhas[setor] = linha
+
+    def _tabela_prioridades(self):
+        # Prioridade de cada lote distinto, indexada pelo código do plano
+        return np.array([self.prioridades.get(lote, PRIORIDADE_PADRAO) for lote in self._lotes], dtype=np.int64)
+
+    def _prioridade(self, indices):
+        return self._prioridades_lotes[self._plano[indices]]
+
+    def _simular(self, setor, linha, dia, atual, resta, pendentes):
+        # Lista por prioridade a partir de 'dia', com 'atual' em andamento (faltando 'resta')
+        # e 'pendentes' ainda não começadas
+        # Fila por liberação; a ordem entre as liberadas é a do heap
+        prioridade = self._prioridade(pendentes)
+        liberacao = self.liberacao[pendentes]
+        ordem = np.argsort(liberacao, kind='stable')
+        fila = list(zip(
+            liberacao[ordem].tolist(),
+            prioridade[ordem].tolist(),
+            self.final[pendentes][ordem].tolist(),
+            self.ordem_f[pendentes][ordem].tolist(),
+            pendentes[ordem].tolist(),
+        ))
+        saldo = self.saldo
+        limite = self.hoje + HORIZONTE_DIAS
+        capacidades = self.calendario.capacidades(setor, self.hoje, HORIZONTE_DIAS)
+        inicio, fim, estado = linha.inicio, linha.fim, linha.estado
+        heap = []
+        proxima = 0
+
+        while dia < limite and (atual is not None or heap or proxima < len(fila)):
+            while proxima < len(fila) and fila[proxima][0] <= dia:
+                liberacao_of, prioridade_of, final_of, ordem_of, indice = fila[proxima]
+                heapq.heappush(heap, (prioridade_of, final_of, liberacao_of, ordem_of, indice))
+                proxima += 1
+            if atual is None and not heap:
+                # Nada liberado: pula direto para a próxima liberação
+                dia = fila[proxima][0]
+                continue
+
+            estado[dia] = (atual, resta)
+            capacidade = capacidades[dia - self.hoje]
+            while capacidade > 0:
+                if atual is None:
+                    if not heap:
+                        break
+                    atual = heapq.heappop(heap)[-1]
+                    resta = saldo[atual]
+                    inicio[atual] = dia
+                usado = min(capacidade, resta)
+                capacidade -= usado
+                resta -= usado
+                if resta <= 1e-9:
+                    fim[atual] = dia
+                    atual = None
+            dia += 1
+
+    def _primeira_decisao(self, linha, mudadas):
+        # Primeiro dia em que alguma escolha do heap muda com as novas prioridades das OFs
+        # 'mudadas': o dia em que uma delas foi escolhida, ou o primeiro dia, depois de
+        # liberada, em que se escolheu uma OF que agora perde para ela. Antes disso a
+        # programação é a mesma e não precisa ser refeita.
+        escolhidas = np.fromiter(linha.inicio.keys(), dtype=np.int64, count=len(linha.inicio))
+        dias = np.fromiter(linha.inicio.values(), dtype=np.int64, count=len(linha.inicio))
+        chaves = [self._prioridade(escolhidas), self.final[escolhidas],
+                  self.liberacao[escolhidas], self.ordem_f[escolhidas]]
+        primeiro = None
+        for i, prioridade in zip(mudadas.tolist(), self._prioridade(mudadas).tolist()):
+            candidatos = [linha.inicio[i]] if i in linha.inicio else []
+            # As escolhas ficam em ordem cronológica no dicionário
+            de = np.searchsorted(dias, self.liberacao[i])
+            ate = len(dias) if i not in linha.inicio else np.searchsorted(dias, linha.inicio[i])
+            perde = np.zeros(ate - de, dtype=bool)
+            empate = np.ones(ate - de, dtype=bool)
+            for chave, valor in zip(chaves, (prioridade, self.final[i], self.liberacao[i], self.ordem_f[i])):
+                perde |= empate & (chave[de:ate] > valor)
+                empate &= chave[de:ate] == valor
+            if perde.any():
+                candidatos.append(dias[de + perde.argmax()])
+            if candidatos:
+                primeiro = min(candidatos) if primeiro is None else min(primeiro, *candidatos)
+        return primeiro
+
+    def reprogramar(self, prioridades):
+        # Nova programação com as prioridades dadas, refazendo só o necessário: os setores
+        # com OFs dos lotes que mudaram, a partir da primeira escolha que muda
+        mudaram = {
+            lote for lote in set(self.prioridades) | set(prioridades)
+            if self.prioridades.get(lote, PRIORIDADE_PADRAO) != prioridades.get(lote, PRIORIDADE_PADRAO)
+        }
+        novo = Programacao.__new__(Programacao)
+        novo.__dict__.update(self.__dict__)
+        novo.prioridades = dict(prioridades)
+        novo._prioridades_lotes = novo._tabela_prioridades()
+        novo._linhas = dict(self._linhas)
+        novo._tabela = None
+        if not mudaram:
+            return novo
+
+        afetadas = pd.Index(self.planos).isin(list(mudaram))
+        for setor, indices in self._por_setor.items():
+            if setor in self.sem_capacidade:
+                continue
+            mudadas = indices[afetadas[indices]]
+            dia = novo._primeira_decisao(self._linhas[setor], mudadas) if len(mudadas) else None
+            if dia is None:
+                continue
+            dia = int(dia)
+            atual, resta = self._linhas[setor].estado[dia]
+            # Fica o que começou antes do dia (inclusive a OF em andamento); o resto volta para a fila
+            linha = self._linhas[setor].antes(dia)
+            pendentes = indices[~np.isin(indices, np.fromiter(linha.inicio, dtype=np.int64, count=len(linha.inicio)))]
+            novo._simular(setor, linha, dia, atual, resta, pendentes)
+            novo._linhas[setor] = linha
+        return novo
+
+    def resultado(self):
+        # Uma linha por OF aberta, na sequência de cada setor (montada uma vez por programação)
+        if self._tabela is None:
+            self._tabela = self._montar_resultado()
+        return self._tabela
+
+    def _montar_resultado(self):
+        n = len(self.ordem_f)
+        inicio = np.full(n, compacto.SEM_DATA, dtype=np.int64)
+        fim = np.full(n, compacto.SEM_DATA, dtype=np.int64)
+        for linha in self._linhas.values():
+            if linha.inicio:
+                inicio[list(linha.inicio)] = list(linha.inicio.values())
+            if linha.fim:
+                fim[list(linha.fim)] = list(linha.fim.values())
+
+        def data(dias):
+            sem_data = (dias == compacto.SEM_DATA) | (dias == _SEM_PRAZO)
+            valores = np.where(sem_data, 0, dias).astype('datetime64[D]').astype('datetime64[ns]')
+            valores[sem_data] = np.datetime64('NaT')
+            return valores
+
+        tabela = pd.DataFrame({
+            'Ordem F': self.ordem_f,
+            'Plano': self.planos,
+            'Setor': self.setor,
+            'Prioridade': self._prioridade(np.arange(n)),
+            'Saldo': self.saldo,
+            'Liberação': data(self.liberacao),
+            'Início previsto': data(inicio),
+            'Fim previsto': data(fim),
+            'Final': data(self.final),
+            'Atraso previsto (dias)': np.where(
+                (fim != compacto.SEM_DATA) & (self.final != _SEM_PRAZO), fim - self.final, 0
+            ).clip(min=0),
+        })
+        # Sequência: ordem de início no setor (as que não couberam no horizonte ficam no fim)
+        chave = np.where(inicio == compacto.SEM_DATA, np.iinfo(np.int64).max, inicio)
+        tabela = tabela.iloc[np.lexsort((self.ordem_f, chave, self.setor.astype(str)))]
+        tabela.insert(0, 'Sequência', tabela.groupby('Setor', sort=False).cumcount().to_numpy() + 1)
+        return tabela.reset_index(drop=True)
+
+    def resumo(self):
+        # Por setor: OFs, saldo, atrasadas previstas e fim previsto da carteira
+        tabela = self.resultado()
+        agrupado = tabela.groupby('Setor', sort=False)
+        return pd.DataFrame({
+            'OFs': agrupado.size(),
+            'Saldo': agrupado['Saldo'].sum(),
+            'Atrasadas previstas': agrupado['Atraso previsto (dias)'].apply(lambda atraso: int((atraso > 0).sum())),
+            'Sem data no horizonte': agrupado['Fim previsto'].apply(lambda fim: int(fim.isna().sum())),
+            'Fim da carteira': agrupado['Fim previsto'].max(),
+        })
@@ -0,0 +1,85 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Orçamento de memória para os datasets compartilhados entre sessões
+ORCAMENTO_MB = int(os.environ.get("PCP_ORCAMENTO_MB", 2048))
+
+
+def tamanho_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class RegistroDatasets:
+    # Uma única cópia imutável de cada dataset por processo, com LRU por orçamento de memória.
+    # As sessões guardam só a chave (versão) e montam visões rasas por cima.
+
+    def __init__(self, orcamento_bytes=ORCAMENTO_MB * 2**20):
+        self.orcamento_bytes = orcamento_bytes
+        self._itens = OrderedDict()
+        self._tamanhos = {}
+        self._carregando = {}
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        self.despejos = 0
+
+    def obter(self, chave, carregar=None):
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.faltas += 1
+            if carregar is None:
+                return None
+            trava_chave = self._carregando.setdefault(chave, threading.Lock())
+
+        # Uma sessão carrega, as outras que pedirem a mesma chave esperam por ela
+        try:
+            with trava_chave:
+                with self._trava:
+                    if chave in self._itens:
+                        self._itens.move_to_end(chave)
+                        return self._itens[chave]
+                df = carregar()
+                self.inserir(chave, df)
+                return df
+        finally:
+            with self._trava:
+                self._carregando.pop(chave, None)
+
+    def residente(self, chave):
+        # Dataset se ainda estiver em memória, sem contar acesso nem mexer na ordem do LRU
+        with self._trava:
+            return self._itens.get(chave)
+
+    def inserir(self, chave, df):
+        tamanho = tamanho_bytes(df)
+        with self._trava:
+            if chave in self._itens:
+                self._remover(chave)
+            # Despeja os menos usados até caber; o dataset novo sempre entra
+            while self._itens and self.bytes_em_uso() + tamanho > self.orcamento_bytes:
+                self._remover(next(iter(self._itens)))
+                self.despejos += 1
+            self._itens[chave] = df
+            self._tamanhos[chave] = tamanho
+
+    def _remover(self, chave):
+        del self._itens[chave]
+        del self._tamanhos[chave]
+
+    def bytes_em_uso(self):
+        return sum(self._tamanhos.values())
+
+    def metricas(self):
+        with self._trava:
+            return {
+                'itens': len(self._itens),
+                'bytes': self.bytes_em_uso(),
+                'orcamento_bytes': self.orcamento_bytes,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'despejos': self.despejos,
+            }
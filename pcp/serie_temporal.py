@@ -0,0 +1,150 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from pcp import classificacao, compacto
+
+PERIODOS = {"Semanal": 7, "Mensal": 30, "Anual": 365}
+
+def dia_numero(dia):
+    return compacto.dia_numero(dia)
+
+
+def _niveis(agregado, nome, dtype):
+    return agregado.index.get_level_values(nome).to_numpy(dtype=dtype)
+
+
+class CuboFechadas:
+    # Contagem diária de OFs fechadas por (dia, Plano, Tipo_Lote, Sub-g), montada uma vez
+    # por dataset. Só as combinações que existem são guardadas, em dois arranjos:
+    #  - por (Plano, dia): com filtro de plano, cada plano escolhido é uma fatia contígua
+    #  - por dia, já somado sobre os planos: atende o caso sem filtro de plano
+    # Qualquer intervalo de datas vira searchsorted + bincount em aritmética de dias.
+
+    def __init__(self, df):
+        self.valores = {
+            'Plano': pd.Index([], dtype=object),
+            'Tipo_Lote': pd.Index(classificacao.TIPOS_LOTE),
+            'Sub-g': pd.Index([], dtype=object),
+        }
+        self._montar(self._agregar(df))
+
+    def _codigos(self, col, serie):
+        # Códigos estáveis entre versões: valores novos entram no fim do índice
+        codigos = self.valores[col].get_indexer(serie)
+        if (codigos < 0).any():
+            novos = pd.Index(pd.unique(serie[codigos < 0]))
+            self.valores[col] = self.valores[col].append(novos)
+            codigos = self.valores[col].get_indexer(serie)
+        return codigos
+
+    def _agregar(self, df):
+        if 'status' not in df.columns:
+            df = df.join(classificacao.classificar(df, date.today()))
+        fechada = df['status'].cat.codes.to_numpy() == classificacao.STATUS.index('fechada')
+        dias = compacto.dias(df, 'Final')
+        fechada &= dias != compacto.SEM_DATA
+        fechadas = df[fechada]
+
+        return pd.DataFrame({
+            'plano': self._codigos('Plano', fechadas['Plano'].to_numpy(dtype=object)),
+            'dia': dias[fechada].astype(np.int64),
+            'tipo': fechadas['Tipo_Lote'].cat.codes.to_numpy(),
+            'subg': self._codigos('Sub-g', fechadas['Sub-g'].to_numpy(dtype=object)),
+        }).groupby(['plano', 'dia', 'tipo', 'subg'], sort=True).size()
+
+    def _montar(self, por_plano):
+        self._por_plano = por_plano
+        self.plano = {
+            'dia': _niveis(por_plano, 'dia', np.int32),
+            'Tipo_Lote': _niveis(por_plano, 'tipo', np.int8),
+            'Sub-g': _niveis(por_plano, 'subg', np.int32),
+            'quantidade': por_plano.to_numpy(dtype=np.int32),
+        }
+        contagem_planos = np.bincount(_niveis(por_plano, 'plano', np.int64), minlength=len(self.valores['Plano']))
+        self.limites_plano = np.concatenate([[0], np.cumsum(contagem_planos)])
+
+        por_dia = por_plano.groupby(level=['dia', 'tipo', 'subg'], sort=True).sum()
+        self.total = {
+            'dia': _niveis(por_dia, 'dia', np.int32),
+            'Tipo_Lote': _niveis(por_dia, 'tipo', np.int8),
+            'Sub-g': _niveis(por_dia, 'subg', np.int32),
+            'quantidade': por_dia.to_numpy(dtype=np.int32),
+        }
+
+    def atualizar(self, delta):
+        # Cubo da versão seguinte a partir do delta da loja: tira a contribuição das
+        # linhas antigas, soma a das novas; o custo depende do delta e do tamanho do
+        # cubo, não do dataset. O cubo atual não muda (outras sessões podem estar nele).
+        novo = CuboFechadas.__new__(CuboFechadas)
+        novo.valores = dict(self.valores)
+        partes = [self._por_plano, -novo._agregar(delta.antigas), novo._agregar(delta.novas)]
+        soma = pd.concat(partes).groupby(level=['plano', 'dia', 'tipo', 'subg'], sort=True).sum()
+        novo._montar(soma[soma != 0])
+        return novo
+
+    def _permitidos(self, selecoes):
+        permitidos = {}
+        for col in ('Tipo_Lote', 'Sub-g'):
+            selecionados = selecoes.get(col)
+            if selecionados:
+                permitidos[col] = self.valores[col].isin(selecionados)
+        return permitidos
+
+    def _somar(self, arranjo, a, b, d0, d1, permitidos, dia_hoje, situacoes, quantidade):
+        # Soma no vetor diário as entradas [a, b) de um arranjo ordenado por dia
+        dias = arranjo['dia'][a:b]
+        inicio, fim = np.searchsorted(dias, [d0, d1 + 1])
+        if inicio == fim:
+            return
+        dias = dias[inicio:fim]
+        pesos = arranjo['quantidade'][a + inicio:a + fim]
+
+        mascara = None
+        for col, lut in permitidos.items():
+            parcial = lut[arranjo[col][a + inicio:a + fim]]
+            mascara = parcial if mascara is None else mascara & parcial
+
+        # Situação de uma fechada depende só do dia: futura quando Final > hoje
+        if situacoes:
+            futura = dias > dia_hoje
+            parcial = futura if 'futura' in situacoes else ~futura
+            if not ('futura' in situacoes and 'atrasada' in situacoes):
+                mascara = parcial if mascara is None else mascara & parcial
+
+        if mascara is not None:
+            dias, pesos = dias[mascara], pesos[mascara]
+        quantidade += np.bincount(dias - d0, weights=pesos, minlength=len(quantidade)).astype(np.int64)
+
+    def contagens(self, data_inicio, data_fim, selecoes=None, hoje=None):
+        # Vetor diário (inclusive nas duas pontas) com zero nos dias sem fechamento
+        selecoes = selecoes or {}
+        d0, d1 = dia_numero(data_inicio), dia_numero(data_fim)
+        quantidade = np.zeros(max(d1 - d0 + 1, 0), dtype=np.int64)
+
+        status = selecoes.get('status')
+        if not len(quantidade) or (status and 'fechada' not in status):
+            return quantidade
+
+        permitidos = self._permitidos(selecoes)
+        dia_hoje = dia_numero(hoje or date.today())
+        situacoes = selecoes.get('Situação')
+
+        planos = selecoes.get('Plano')
+        if planos:
+            codigos = self.valores['Plano'].get_indexer(planos)
+            for codigo in np.unique(codigos[codigos >= 0]):
+                self._somar(self.plano, self.limites_plano[codigo], self.limites_plano[codigo + 1],
+                            d0, d1, permitidos, dia_hoje, situacoes, quantidade)
+        else:
+            self._somar(self.total, 0, len(self.total['dia']),
+                        d0, d1, permitidos, dia_hoje, situacoes, quantidade)
+        return quantidade
+
+    def serie(self, data_inicio, data_fim, selecoes=None, hoje=None):
+        quantidade = self.contagens(data_inicio, data_fim, selecoes, hoje)
+        return pd.DataFrame({
+            'Periodo': pd.date_range(start=data_inicio, periods=len(quantidade)).date,
+            'Quantidade': quantidade,
+        })
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from pcp import compacto
+
+# Somas aditivas por (setor, status, dia do Final): é tudo o que as páginas de setor leem.
+# Vazão = OFs fechadas por dia do Final (mesma convenção da evolução do dashboard de OFs),
+# WIP = OFs abertas, atraso = abertas com o Final já vencido.
+SOMAS = ['ofs', 'saldo', 'programado', 'produzido']
+
+NIVEIS = ['setor', 'fechada', 'dia']
+
+# Médias móveis da vazão, em dias
+JANELAS = [7, 30]
+
+PERIODOS = {"30 dias": 30, "90 dias": 90, "365 dias": 365}
+
+# Faixas de atraso das OFs abertas: (de, até) dias depois do Final; vencer hoje já é atraso
+FAIXAS_ATRASO = {
+    "até 7 dias": (0, 7),
+    "8 a 30 dias": (8, 30),
+    "31 a 90 dias": (31, 90),
+    "mais de 90 dias": (91, None),
+}
+
+SEM_SETOR = "Sem setor"
+
+
+def nome_setor(valor):
+    if pd.isna(valor):
+        return SEM_SETOR
+    return compacto.NOMES_SUBG.get(valor, str(valor))
+
+
+def _agregar(df):
+    # A única passada pelas linhas: setor pelo factorize de Sub-g (o nome só nos distintos)
+    codigos, valores = pd.factorize(df['Sub-g'], use_na_sentinel=False)
+    saldo = df['Saldo'].to_numpy(dtype=np.float64)
+    colunas = {
+        'setor': codigos,
+        'fechada': saldo == 0,
+        'dia': compacto.dias(df, 'Final').astype(np.int64),
+        'ofs': np.ones(len(df), dtype=np.int64),
+        'saldo': saldo,
+    }
+    for col, origem in [('programado', 'PROGRAMADO'), ('produzido', 'PRODUZIDO')]:
+        colunas[col] = df[origem].to_numpy(dtype=np.float64) if origem in df.columns else np.zeros(len(df))
+    somas = pd.DataFrame(colunas).groupby(NIVEIS, sort=False)[SOMAS].sum()
+
+    nomes = np.array([nome_setor(valor) for valor in valores], dtype=object)
+    somas.index = pd.MultiIndex.from_arrays(
+        [nomes[somas.index.get_level_values('setor')],
+         somas.index.get_level_values('fechada'),
+         somas.index.get_level_values('dia')],
+        names=NIVEIS,
+    )
+    return somas
+
+
+class PainelSetores:
+    # Montado uma vez por versão do dataset e já particionado por setor: abrir a página de
+    # um setor só lê a sua fatia (setor x dias, algumas centenas de linhas), nunca as OFs.
+
+    def __init__(self, df):
+        self._montar(_agregar(df))
+
+    def _montar(self, somas):
+        self.somas = somas
+        self._fatias = {}
+        for setor, fatia in somas.groupby(level='setor', sort=False):
+            fatia = fatia.droplevel('setor')
+            self._fatias[setor] = {'abertas': _fatia(fatia, False), 'fechadas': _fatia(fatia, True)}
+        # Produção geral: todos os setores somados, também montado uma vez
+        total = somas.groupby(level=['fechada', 'dia']).sum()
+        self._fatias[None] = {'abertas': _fatia(total, False), 'fechadas': _fatia(total, True)}
+
+    def atualizar(self, delta):
+        # Painel da versão seguinte: tira a contribuição das linhas antigas do delta e soma a das novas
+        soma = pd.concat([self.somas, -_agregar(delta.antigas), _agregar(delta.novas)])
+        soma = soma.groupby(level=NIVEIS, sort=False).sum()
+        novo = PainelSetores.__new__(PainelSetores)
+        novo._montar(soma[soma['ofs'] > 0])
+        return novo
+
+    def setores(self):
+        # Os setores conhecidos na ordem do mapeamento, depois os outros valores de Sub-g
+        presentes = [setor for setor in self._fatias if setor is not None]
+        conhecidos = [setor for setor in compacto.NOMES_SUBG.values() if setor in presentes]
+        return conhecidos + sorted(setor for setor in presentes if setor not in conhecidos)
+
+    def _abertas(self, setor):
+        return self._fatias[setor]['abertas']
+
+    def _fechadas(self, setor):
+        return self._fatias[setor]['fechadas']
+
+    def vazao(self, setor, hoje, dias=90):
+        # OFs fechadas e quantidade produzida por dia, com as médias móveis de JANELAS.
+        # setor=None soma todos os setores.
+        fim = compacto.dia_numero(hoje)
+        inicio = fim - dias - max(JANELAS) + 1
+        fechadas = self._fechadas(setor)
+        dia = fechadas.index.to_numpy()
+        dentro = (dia >= inicio) & (dia <= fim)
+        posicao = dia[dentro] - inicio
+        tamanho = fim - inicio + 1
+        ofs = np.bincount(posicao, weights=fechadas['ofs'].to_numpy()[dentro], minlength=tamanho).astype(np.int64)
+        produzido = np.bincount(posicao, weights=fechadas['produzido'].to_numpy()[dentro], minlength=tamanho)
+
+        resultado = {'Fechadas': ofs, 'Produzido': produzido}
+        acumulado = np.concatenate([[0], np.cumsum(ofs)])
+        for janela in JANELAS:
+            soma = acumulado[janela:] - acumulado[:-janela]
+            resultado[f"Média {janela} dias"] = np.concatenate([np.full(janela - 1, np.nan), soma / janela])
+        datas = pd.to_datetime(np.arange(inicio, fim + 1).astype('datetime64[D]'))
+        tabela = pd.DataFrame(resultado, index=pd.Index(datas, name='Dia'))
+        return tabela.iloc[-dias:]
+
+    def indicadores(self, setor, hoje):
+        dia_hoje = compacto.dia_numero(hoje)
+        abertas = self._abertas(setor)
+        dia = abertas.index.to_numpy()
+        # OFs sem Final contam como atrasadas, como na Situação do dashboard de OFs
+        atrasada = dia <= dia_hoje
+        ofs_atrasadas = abertas['ofs'].to_numpy()[atrasada]
+        com_data = dia[atrasada] != compacto.SEM_DATA
+        dias_atraso = (dia_hoje - dia[atrasada][com_data]) * ofs_atrasadas[com_data]
+
+        vazao = self.vazao(setor, hoje, dias=max(JANELAS))
+        media_30 = vazao['Fechadas'].iloc[-30:].mean()
+        wip = int(abertas['ofs'].sum())
+        return {
+            'wip_ofs': wip,
+            'wip_saldo': float(abertas['saldo'].sum()),
+            'atrasadas': int(ofs_atrasadas.sum()),
+            'saldo_atrasado': float(abertas['saldo'].to_numpy()[atrasada].sum()),
+            'atraso_medio_dias': float(dias_atraso.sum() / max(ofs_atrasadas[com_data].sum(), 1)),
+            'fechadas_7d': int(vazao['Fechadas'].iloc[-7:].sum()),
+            'vazao_30d': float(media_30),
+            # Dias para zerar o WIP no ritmo dos últimos 30 dias
+            'cobertura_dias': float(wip / media_30) if media_30 > 0 else float('inf'),
+        }
+
+    def atraso(self, setor, hoje):
+        # OFs abertas por faixa de atraso
+        dia_hoje = compacto.dia_numero(hoje)
+        abertas = self._abertas(setor)
+        dia = abertas.index.to_numpy()
+        sem_data = dia == compacto.SEM_DATA
+        atraso = dia_hoje - dia
+        ofs = abertas['ofs'].to_numpy()
+        contagem = {}
+        for rotulo, (de, ate) in FAIXAS_ATRASO.items():
+            na_faixa = ~sem_data & (atraso >= de) & ((atraso <= ate) if ate is not None else True)
+            contagem[rotulo] = int(ofs[na_faixa].sum())
+        contagem["sem data"] = int(ofs[sem_data].sum())
+        return pd.Series(contagem, name='OFs')
+
+    def resumo(self, hoje):
+        # Uma linha por setor, para a produção geral
+        linhas = {setor: self.indicadores(setor, hoje) for setor in self.setores()}
+        return pd.DataFrame.from_dict(linhas, orient='index')
+
+
+def _fatia(somas, fechada):
+    # Somas por dia (ordenadas) das OFs abertas ou das fechadas
+    if fechada in somas.index.get_level_values('fechada'):
+        return somas.xs(fechada, level='fechada').sort_index()
+    return pd.DataFrame(columns=SOMAS, index=pd.Index([], dtype=np.int64, name='dia'), dtype=np.float64)
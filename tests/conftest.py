@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+# Os testes importam pcp/ e benchmarks/ da raiz do repositório, como os benchmarks
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from benchmarks.sintetico import gerar_planilha  # noqa: E402
+from pcp import ingestao  # noqa: E402
+
+
+@pytest.fixture
+def pasta_cache(tmp_path, monkeypatch):
+    # Parquet convertido num diretório do teste, nunca no .cache_pcp do app
+    pasta = tmp_path / "cache"
+    pasta.mkdir()
+    monkeypatch.setattr(ingestao, "PASTA_CACHE", str(pasta))
+    return pasta
+
+
+@pytest.fixture(scope="session")
+def planilhas(tmp_path_factory):
+    # planilhas(n, semente) -> caminho de um xlsx sintético, gerado uma vez por sessão de testes
+    pasta = tmp_path_factory.mktemp("planilhas")
+    geradas = {}
+
+    def gerar(n_linhas, semente=42):
+        if (n_linhas, semente) not in geradas:
+            caminho = pasta / f"ofs_{n_linhas}_{semente}.xlsx"
+            caminho.write_bytes(gerar_planilha(n_linhas, semente))
+            geradas[n_linhas, semente] = str(caminho)
+        return geradas[n_linhas, semente]
+
+    return gerar
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_delta import proximo_export
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, compacto
+
+
+def test_hash_nao_depende_do_tipo_reduzido():
+    df = gerar_dataframe(500)
+    largo = df.astype({'PROGRAMADO': np.int64, 'Saldo': np.float64})
+    estreito = df.astype({'PROGRAMADO': np.int16, 'Saldo': np.float32})
+    estreito['Plano'] = estreito['Plano'].astype('category')
+    estreito['Sub-g'] = estreito['Sub-g'].astype(np.int8).astype('category')
+    assert np.array_equal(armazenamento.hash_linhas(largo), armazenamento.hash_linhas(estreito))
+
+    estreito.loc[3, 'Saldo'] += 1
+    iguais = armazenamento.hash_linhas(largo) == armazenamento.hash_linhas(estreito)
+    assert np.flatnonzero(~iguais).tolist() == [3]
+
+
+def test_export_que_so_muda_de_tipo_nao_gera_delta(tmp_path):
+    # O compactar reduz cada export ao menor tipo que cabe: com uma OF de PROGRAMADO
+    # 40.000 o segundo export sai com int32 onde o primeiro tinha int16
+    bruto = gerar_dataframe(2_000)
+    segundo = bruto.copy()
+    segundo.loc[0, 'PROGRAMADO'] = 40_000
+    segundo.loc[0, 'Saldo'] = 40_000 - segundo.loc[0, 'PRODUZIDO']
+    base, novo = compacto.compactar(bruto), compacto.compactar(segundo)
+    assert base['PROGRAMADO'].dtype != novo['PROGRAMADO'].dtype
+
+    loja = armazenamento.LojaOfs(str(tmp_path))
+    loja.aplicar_export(base, 'base')
+    delta = loja.aplicar_export(novo, 'novo')
+    assert (delta.inseridas, delta.alteradas, delta.removidas) == (0, 1, 0)
+
+
+def test_linhagens_nao_se_comparam(tmp_path):
+    lojas = armazenamento.LojasOfs(str(tmp_path))
+    rng = np.random.default_rng(0)
+    diario = gerar_dataframe(1_000)
+    outro = gerar_dataframe(1_000, semente=9)
+    diario_seguinte = proximo_export(diario, 50, rng)
+
+    linhagem = armazenamento.linhagem_uploads(["ofs_20261017.xlsx"])
+    assert linhagem == armazenamento.linhagem_uploads(["OFS_20261018.xlsx"])
+    linhagem_outra = armazenamento.linhagem_uploads(["estoque.xlsx"])
+    assert linhagem_outra != linhagem
+
+    lojas.aplicar_export(compacto.compactar(diario), 'dia 17', linhagem)
+    # Outro usuário carrega um arquivo sem relação: primeira versão da linhagem dele
+    delta_outro = lojas.aplicar_export(compacto.compactar(outro), 'estoque', linhagem_outra)
+    assert delta_outro.versao_anterior is None
+    # O export seguinte da primeira linhagem continua comparado com o dia anterior
+    delta = lojas.aplicar_export(compacto.compactar(diario_seguinte), 'dia 18', linhagem)
+    assert delta.versao_anterior == 'dia 17'
+    assert (delta.inseridas, delta.alteradas, delta.removidas, delta.fechadas) == (0, 50, 0, 50)
+    assert lojas.delta('dia 18') is delta
+    assert lojas.delta('estoque') is delta_outro
+
+
+def test_loja_reaberta_continua_da_ultima_versao(tmp_path):
+    rng = np.random.default_rng(0)
+    bruto = gerar_dataframe(1_000)
+    armazenamento.LojaOfs(str(tmp_path)).aplicar_export(compacto.compactar(bruto), 'v1')
+    reaberta = armazenamento.LojaOfs(str(tmp_path))
+    assert reaberta.versao == 'v1'
+    delta = reaberta.aplicar_export(compacto.compactar(proximo_export(bruto, 10, rng)), 'v2')
+    assert (delta.versao_anterior, delta.alteradas, delta.inseridas) == ('v1', 10, 0)
+    assert (delta.antigas['Saldo'] > 0).all() and (delta.novas['Saldo'] == 0).all()
+
+
+def test_loja_guarda_so_hashes_e_le_antigas_do_disco(tmp_path):
+    rng = np.random.default_rng(1)
+    bruto = gerar_dataframe(2_000)
+    base = compacto.compactar(bruto)
+    seguinte = proximo_export(bruto, 40, rng).drop(index=[5, 6])
+    novo = compacto.compactar(seguinte.reset_index(drop=True))
+
+    em_memoria = armazenamento.LojaOfs(str(tmp_path / "memoria"))
+    em_memoria.aplicar_export(base, 'base')
+    esperado = em_memoria.aplicar_export(novo, 'novo', lambda versao: base if versao == 'base' else None)
+
+    # Sem o dataset anterior em memória (despejado do registro): as antigas vêm das partições
+    do_disco = armazenamento.LojaOfs(str(tmp_path / "disco"))
+    do_disco.aplicar_export(base, 'base')
+    obtido = do_disco.aplicar_export(novo, 'novo', lambda versao: None)
+
+    # A loja não segura nenhum dataset inteiro fora do orçamento do registro
+    assert not any(isinstance(valor, pd.DataFrame) for valor in vars(do_disco).values())
+    assert (obtido.alteradas, obtido.removidas) == (esperado.alteradas, esperado.removidas) == (40, 2)
+    pd.testing.assert_frame_equal(obtido.antigas, esperado.antigas, check_categorical=False)
+    pd.testing.assert_frame_equal(obtido.novas, esperado.novas)
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from pcp import banco_planejamento, planejamento
+
+# Dois BancoPlanejamento no mesmo arquivo fazem o papel de dois processos do app: cada um
+# com o seu pool de conexões e o seu cache de leitura
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "planejamento.db")
+
+
+def lote(tabela, nome):
+    return tabela[tabela["Lote"] == nome].iloc[0]
+
+
+def test_gravacao_com_versao_velha_e_rejeitada(caminho):
+    banco_a = banco_planejamento.BancoPlanejamento(caminho)
+    banco_b = banco_planejamento.BancoPlanejamento(caminho)
+    lida_a, lida_b = banco_a.tabela(), banco_b.tabela()
+    versao = lote(lida_a, "24328")["versao"]
+    assert versao == lote(lida_b, "24328")["versao"]
+
+    # A grava primeiro; B ainda tem a versão que leu antes e perde a edição
+    assert banco_a.aplicar_mudancas(planejamento.mudancas(lida_a, {0: {"Cálculo NEC": True}})) == []
+    assert banco_b.aplicar_mudancas(planejamento.mudancas(lida_b, {0: {"Programar": False}})) == ["24328"]
+
+    atual = lote(banco_b.tabela(), "24328")
+    assert atual["versao"] == versao + 1
+    assert bool(atual["Cálculo NEC"]) and bool(atual["Programar"])
+
+    # Relendo, a mesma edição passa
+    assert banco_b.aplicar_mudancas(planejamento.mudancas(banco_b.tabela(), {0: {"Programar": False}})) == []
+    assert not lote(banco_a.tabela(), "24328")["Programar"]
+
+
+def test_leitura_depois_de_escrita_ve_o_dado_novo(caminho):
+    banco_a = banco_planejamento.BancoPlanejamento(caminho)
+    banco_b = banco_planejamento.BancoPlanejamento(caminho)
+    antes = banco_a.tabela()
+    assert banco_a.tabela() is antes
+
+    # Escrita por outro processo: o contador em meta invalida o cache de A
+    banco_b.adicionar({"Lote": "25100", "Descrição": "NOVO", "Cor": "blue", "Programar": True,
+                       "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": False})
+    depois = banco_a.tabela()
+    assert depois is not antes
+    assert list(depois["Lote"]) == ["24328", "24431", "25100"]
+
+    # Escrita pelo próprio processo também
+    banco_a.aplicar_mudancas([("25100", 1, {"Gerar OF": True})])
+    assert bool(lote(banco_a.tabela(), "25100")["Gerar OF"])
+
+    with pytest.raises(banco_planejamento.LoteExistente):
+        banco_a.adicionar({"Lote": "25100", "Descrição": "DE NOVO", "Cor": "red", "Programar": False,
+                           "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": False})
+
+
+def test_leitura_nao_espera_escrita_em_andamento(caminho):
+    # WAL: com uma transação de escrita aberta, a leitura segue com o último commit
+    banco_a = banco_planejamento.BancoPlanejamento(caminho)
+    banco_b = banco_planejamento.BancoPlanejamento(caminho)
+    versao = banco_a.versao()
+    with banco_b._transacao() as conexao:
+        conexao.execute("UPDATE lotes SET cor = 'black' WHERE lote = '24328'")
+        assert lote(banco_a.tabela(), "24328")["Cor"] == "pink"
+    assert banco_a.versao() == versao + 1
+    assert lote(banco_a.tabela(), "24328")["Cor"] == "black"
+
+
+def test_escritas_concorrentes_nao_se_perdem(caminho):
+    banco = banco_planejamento.BancoPlanejamento(caminho, tamanho_pool=4)
+    outro = banco_planejamento.BancoPlanejamento(caminho, tamanho_pool=2)
+    versao = banco.versao()
+    erros = []
+
+    def adicionar(destino, inicio):
+        try:
+            for i in range(inicio, inicio + 20):
+                destino.adicionar({"Lote": f"L{i:03d}", "Descrição": "x", "Cor": "gray", "Programar": False,
+                                   "Cálculo NEC": False, "Gerar SOC": False, "E-mail SOC": False, "Gerar OF": False})
+        except Exception as erro:
+            erros.append(erro)
+
+    destinos = [banco, banco, outro, outro]
+    threads = [threading.Thread(target=adicionar, args=(destino, i * 20)) for i, destino in enumerate(destinos)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert erros == []
+    assert len(banco.tabela()) == 2 + 80
+    assert banco.versao() == versao + 80
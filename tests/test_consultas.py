@@ -0,0 +1,41 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_pedidos import vencendo_por_varredura
+from benchmarks.bench_setores import pagina_por_varredura
+from benchmarks.sintetico import gerar_dataframe
+from pcp import compacto, pedidos, setores
+
+# Consultas das páginas pelos agregados contra a varredura das OFs que elas substituíram
+
+HOJE = pd.Timestamp(date.today())
+
+
+@pytest.fixture(scope="module")
+def df():
+    return compacto.compactar(gerar_dataframe(3_000, semente=5))
+
+
+@pytest.mark.parametrize("subg, setor", list(compacto.NOMES_SUBG.items()))
+def test_painel_igual_a_varredura(df, subg, setor):
+    wip, atrasadas, fechadas_30d = pagina_por_varredura(df, subg, HOJE)
+    painel = setores.PainelSetores(df)
+    indicadores = painel.indicadores(setor, HOJE)
+    assert (indicadores['wip_ofs'], indicadores['atrasadas']) == (wip, atrasadas)
+    assert painel.vazao(setor, HOJE, 30)['Fechadas'].sum() == fechadas_30d
+
+
+@pytest.mark.parametrize("dias", [7, 30, 90])
+def test_vencendo_igual_a_varredura(df, dias):
+    esperado = vencendo_por_varredura(df, HOJE, dias)
+    indice = pedidos.IndicePedidos(df)
+    obtido = pd.concat([
+        indice.vencendo(tipo, HOJE + pd.Timedelta(days=1), HOJE + pd.Timedelta(days=dias))
+        for tipo in ['Pedido', 'Paralelo']
+    ])
+    assert len(esperado)
+    assert sorted(map(str, obtido.index)) == sorted(map(str, esperado.index))
+    assert np.array_equal(np.sort(obtido['prazo'].to_numpy()), np.sort(esperado['prazo'].to_numpy()))
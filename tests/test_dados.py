@@ -0,0 +1,24 @@
+import pandas as pd
+
+from paginas import _dados
+from pcp import compacto, ingestao
+
+
+def test_dataset_despejado_volta_do_parquet(planilhas, pasta_cache):
+    with open(planilhas(1_000), "rb") as arquivo:
+        conteudo = arquivo.read()
+    chave = ingestao.hash_conteudo(conteudo)
+    esperado = compacto.compactar(ingestao.carregar_ofs(conteudo, chave))
+
+    # Registro novo, como depois de o LRU despejar a versão: só o Parquet convertido ficou
+    _dados.registro_datasets.clear()
+    try:
+        registro = _dados.registro_datasets()
+        assert registro.residente(chave) is None
+        df = _dados.recarregar_dataset(chave)
+        pd.testing.assert_frame_equal(df, esperado)
+        assert registro.residente(chave) is df
+        # Sem o Parquet não há de onde recarregar
+        assert _dados.recarregar_dataset("0" * 64) is None
+    finally:
+        _dados.registro_datasets.clear()
@@ -0,0 +1,39 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import classificacao, compacto, exportacao
+
+HOJE = pd.Timestamp(date.today())
+
+
+@pytest.fixture(scope="module")
+def visao():
+    # Como a visão do dashboard: dataset compacto + colunas de classificação
+    df = compacto.compactar(gerar_dataframe(500))
+    return df.join(classificacao.classificar(df, HOJE))
+
+
+def test_colunas_derivadas_internas_nao_saem(visao):
+    colunas = exportacao.colunas_exportadas(visao.assign(_hash=np.uint64(0)))
+    assert 'Plano_25xxx' not in colunas and '_hash' not in colunas
+    assert colunas == [col for col in visao.columns if col != 'Plano_25xxx']
+
+
+@pytest.mark.parametrize("formato", list(exportacao.FORMATOS))
+def test_arquivo_tem_so_as_colunas_exportadas(visao, formato, tmp_path):
+    posicoes = np.flatnonzero(visao['status'].to_numpy() == 'aberta')
+    atual = exportacao.Exportacao(visao, posicoes, formato, pasta=str(tmp_path), linhas_por_bloco=100).iniciar()
+    atual._thread.join()
+    assert atual.erro is None and atual.escritas == len(posicoes)
+    if formato == "CSV":
+        lido = pd.read_csv(atual.caminho, sep=";", encoding="utf-8-sig")
+    elif formato == "Excel":
+        lido = pd.read_excel(atual.caminho)
+    else:
+        lido = pd.read_parquet(atual.caminho)
+    assert list(lido.columns) == exportacao.colunas_exportadas(visao)
+    assert len(lido) == len(posicoes)
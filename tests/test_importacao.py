@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from benchmarks import bench_importacao
+from paginas import PAGINAS
+
+# Partida a frio do app.py medida com -X importtime, num processo novo: orçamento de tempo
+# e nenhuma biblioteca pesada antes de uma página de dados ser aberta
+
+ORCAMENTO_MS = float(os.environ.get("PCP_ORCAMENTO_IMPORTACAO_MS", 900))
+
+
+@pytest.fixture(scope="module")
+def partida():
+    return bench_importacao.medir_importacao("import app")
+
+
+def test_partida_no_orcamento(partida):
+    assert "app" in partida
+    assert partida["app"] <= ORCAMENTO_MS, f"partida levou {partida['app']:.0f} ms"
+
+
+def test_partida_sem_bibliotecas_pesadas(partida):
+    assert [modulo for modulo in bench_importacao.PESADOS if modulo in partida] == []
+
+
+def test_registro_nao_importa_paginas():
+    tempos = bench_importacao.medir_importacao("import paginas")
+    assert [nome for nome in PAGINAS if f"paginas.{nome}" in tempos] == []
@@ -0,0 +1,91 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_delta import proximo_export
+from benchmarks.sintetico import gerar_dataframe
+from pcp import armazenamento, compacto, lotes, matriz_planos, pedidos, serie_temporal, setores
+
+# Cada agregado atualizado pelo delta da loja tem de ser igual ao remontado do zero sobre o
+# export novo. O export novo fecha OFs, adia o Final de outras, remove e insere OFs.
+
+HOJE = pd.Timestamp(date.today())
+
+
+def exportar_seguinte(base, rng):
+    novo = proximo_export(base, 300, rng)
+    abertas = np.flatnonzero(novo['Saldo'].to_numpy() != 0)
+    adiadas = rng.choice(abertas, 100, replace=False)
+    novo.loc[adiadas, 'Final'] = novo.loc[adiadas, 'Final'] + pd.Timedelta(days=5)
+    removidas = rng.choice(len(novo), 100, replace=False)
+    inseridas = gerar_dataframe(100, semente=7)
+    inseridas['Ordem F'] += 1_000_000
+    return pd.concat([novo.drop(index=removidas), inseridas], ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def exports(tmp_path_factory):
+    # (base, novo, delta da loja entre os dois), todos na forma compacta como no app
+    rng = np.random.default_rng(0)
+    bruto = gerar_dataframe(3_000, semente=1)
+    base = compacto.compactar(bruto)
+    novo = compacto.compactar(exportar_seguinte(bruto, rng))
+    loja = armazenamento.LojaOfs(str(tmp_path_factory.mktemp("loja")))
+    loja.aplicar_export(base, 'base')
+    delta = loja.aplicar_export(novo, 'novo')
+    assert delta.inseridas and delta.alteradas and delta.removidas and delta.fechadas
+    return base, novo, delta
+
+
+def comparar_cubo(obtido, esperado):
+    inicio, fim = HOJE - pd.Timedelta(days=500), HOJE + pd.Timedelta(days=60)
+    planos = list(esperado.valores['Plano'][:20])
+    for selecoes in [{}, {'Plano': planos}, {'Tipo_Lote': ['Pedido']}, {'Situação': ['futura']}]:
+        assert np.array_equal(obtido.contagens(inicio, fim, selecoes, HOJE),
+                              esperado.contagens(inicio, fim, selecoes, HOJE)), selecoes
+
+
+def comparar_progresso(obtido, esperado):
+    assert np.allclose(obtido.somas.sort_index().to_numpy(float), esperado.somas.sort_index().to_numpy(float))
+
+
+def comparar_matriz(obtido, esperado):
+    for selecoes in [{}, {'Tipo_Lote': ['Pedido']}, {'status': ['aberta']}]:
+        pd.testing.assert_frame_equal(obtido.contagem(selecoes), esperado.contagem(selecoes))
+
+
+def comparar_painel(obtido, esperado):
+    assert obtido.setores() == esperado.setores()
+    for setor in [None] + esperado.setores():
+        assert obtido.indicadores(setor, HOJE) == esperado.indicadores(setor, HOJE)
+        pd.testing.assert_frame_equal(obtido.vazao(setor, HOJE), esperado.vazao(setor, HOJE))
+        pd.testing.assert_series_equal(obtido.atraso(setor, HOJE), esperado.atraso(setor, HOJE))
+
+
+def comparar_pedidos(obtido, esperado):
+    for tipo in ['Pedido', 'Paralelo']:
+        assert obtido.resumo(tipo, HOJE) == esperado.resumo(tipo, HOJE)
+        assert np.array_equal(obtido._ordenados[tipo].prazos, esperado._ordenados[tipo].prazos)
+        # Mesma ordem também entre pedidos com o mesmo prazo
+        assert np.array_equal(obtido._ordenados[tipo].planos, esperado._ordenados[tipo].planos)
+        vencendo = [indice.vencendo(tipo, HOJE, HOJE + pd.Timedelta(days=30)).sort_index()
+                    for indice in (obtido, esperado)]
+        pd.testing.assert_frame_equal(*vencendo, check_dtype=False)
+
+
+AGREGADOS = {
+    'cubo': (serie_temporal.CuboFechadas, comparar_cubo),
+    'progresso de lotes': (lotes.ProgressoLotes, comparar_progresso),
+    'matriz de planos': (lambda df: matriz_planos.MatrizPlanos(df, HOJE), comparar_matriz),
+    'painel de setores': (setores.PainelSetores, comparar_painel),
+    'índice de pedidos': (pedidos.IndicePedidos, comparar_pedidos),
+}
+
+
+@pytest.mark.parametrize("nome", list(AGREGADOS))
+def test_incremental_igual_a_remontar(exports, nome):
+    base, novo, delta = exports
+    construir, comparar = AGREGADOS[nome]
+    comparar(construir(base).atualizar(delta), construir(novo))
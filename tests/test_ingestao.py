@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pcp import ingestao
+
+# Leitura em blocos: mesmo resultado do pandas e pico de memória que não cresce com as linhas
+# nem com recargas. O pico é medido num processo separado, pelo VmHWM do /proc: o ru_maxrss
+# herda o pico do processo do pytest, que gerou as planilhas.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TAMANHO_BLOCO = 500
+
+# Folga (MB) para o pico: alocador e caches do openpyxl oscilam um pouco entre execuções.
+# Lendo a planilha inteira com o pandas, 40 mil linhas já custam uns 20 MB a mais que 2 mil.
+FOLGA_MB = 8
+
+MEDIR = """
+import json, os, sys
+from pcp import ingestao
+
+def pico_mb():
+    with open("/proc/self/status") as status:
+        linha = next(linha for linha in status if linha.startswith("VmHWM:"))
+    return int(linha.split()[1]) / 1024
+
+origem, destino, recargas, bloco = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+picos = []
+for _ in range(recargas):
+    if os.path.exists(destino):
+        os.remove(destino)
+    ingestao.converter_em_blocos(origem, destino, tamanho_bloco=bloco)
+    picos.append(pico_mb())
+print(json.dumps(picos))
+"""
+
+
+def picos_rss(origem, destino, recargas):
+    # Pico de RSS (MB) depois de cada conversão da mesma planilha, no mesmo processo
+    saida = subprocess.run(
+        [sys.executable, "-c", MEDIR, origem, str(destino), str(recargas), str(TAMANHO_BLOCO)],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    return json.loads(saida.stdout)
+
+
+def test_blocos_igual_ao_pandas(planilhas, tmp_path):
+    origem = planilhas(2_000)
+    destino = tmp_path / "ofs.parquet"
+    ingestao.converter_em_blocos(origem, str(destino), tamanho_bloco=TAMANHO_BLOCO)
+    obtido = ingestao.ler_parquet(str(destino))
+    esperado = ingestao.normalizar(pd.read_excel(origem, engine="openpyxl"))
+
+    assert len(obtido) == len(esperado)
+    for col in ['Ordem F', 'Saldo', 'PROGRAMADO', 'PRODUZIDO']:
+        assert np.array_equal(obtido[col].to_numpy(), esperado[col].to_numpy()), col
+    for col in ingestao.COLUNAS_DATA:
+        assert obtido[col].equals(esperado[col]), col
+
+
+so_linux = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="VmHWM só existe no /proc do Linux")
+
+
+@so_linux
+def test_rss_estavel_entre_recargas(planilhas, tmp_path):
+    picos = picos_rss(planilhas(2_000), tmp_path / "ofs.parquet", recargas=4)
+    assert picos[-1] - picos[0] < FOLGA_MB, picos
+
+
+@so_linux
+def test_rss_estavel_com_mais_linhas(planilhas, tmp_path):
+    pequeno = picos_rss(planilhas(2_000), tmp_path / "pequeno.parquet", recargas=1)[0]
+    grande = picos_rss(planilhas(40_000), tmp_path / "grande.parquet", recargas=1)[0]
+    assert grande - pequeno < FOLGA_MB, (pequeno, grande)
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from pcp import ingestao
+
+# Vários exports convertidos em paralelo viram um dataset só, sem OF repetida: a mesma
+# Ordem F em mais de um arquivo fica com a linha do último arquivo da lista
+
+
+def ler(planilhas, tamanhos):
+    # Exports de tamanhos diferentes: as Ordens F do sintético se sobrepõem pelo começo
+    arquivos = []
+    for semente, n_linhas in enumerate(tamanhos):
+        with open(planilhas(n_linhas, semente), "rb") as arquivo:
+            conteudo = arquivo.read()
+        arquivos.append((ingestao.hash_conteudo(conteudo), conteudo))
+    return arquivos
+
+
+def test_paralelo_junta_sem_repetir_ordem_f(planilhas, pasta_cache, monkeypatch, tmp_path):
+    arquivos = ler(planilhas, [1_500, 1_000, 2_000])
+    progresso = []
+    paralelo = ingestao.carregar_varias(arquivos, lambda feitos, total: progresso.append((feitos, total)),
+                                        max_processos=2)
+
+    # Cada arquivo sozinho, num cache separado, e o dedup feito aqui
+    monkeypatch.setattr(ingestao, "PASTA_CACHE", str(tmp_path / "serial"))
+    separados = [ingestao.carregar_ofs(conteudo, chave) for chave, conteudo in arquivos]
+    esperado = pd.concat(separados, ignore_index=True).drop_duplicates('Ordem F', keep='last')
+    esperado = esperado.reset_index(drop=True)
+
+    assert paralelo['Ordem F'].is_unique
+    assert len(paralelo) == 2_000
+    pd.testing.assert_frame_equal(paralelo, esperado, check_like=True)
+    assert progresso[-1] == (3, 3)
+
+
+def test_paralelo_igual_ao_serial(planilhas, pasta_cache, monkeypatch, tmp_path):
+    arquivos = ler(planilhas, [1_000, 1_000])
+    paralelo = ingestao.carregar_varias(arquivos, max_processos=2)
+    monkeypatch.setattr(ingestao, "PASTA_CACHE", str(tmp_path / "serial"))
+    serial = ingestao.carregar_varias(arquivos, max_processos=1)
+    pd.testing.assert_frame_equal(paralelo, serial)
+    assert paralelo.attrs["versao"] == ingestao.chave_combinada([chave for chave, _ in arquivos])
@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+from paginas import _perfil
+from pcp import perfil
+
+
+def test_payload_contado_pelo_enqueue():
+    enviadas = []
+    ctx = SimpleNamespace(_enqueue=enviadas.append)
+    execucao = perfil.Execucao("teste")
+    assert _perfil._ligar_payload(ctx, execucao)
+    secao = execucao.abrir("tabela")
+    ctx._enqueue(SimpleNamespace(ByteSize=lambda: 2048))
+    execucao.fechar(secao)
+    registro = execucao.finalizar()
+    assert len(enviadas) == 1
+    assert registro['payload_medido'] and registro['secoes'][0]['payload_bytes'] == 2048
+
+
+def test_sem_enqueue_desliga_so_o_payload():
+    # Streamlit sem o ScriptRunContext._enqueue privado: nada é trocado no contexto
+    ctx = SimpleNamespace()
+    execucao = perfil.Execucao("teste")
+    execucao.payload_medido = _perfil._ligar_payload(ctx, execucao)
+    execucao.fechar(execucao.abrir("tabela"))
+    registro = execucao.finalizar()
+    assert not registro['payload_medido'] and not hasattr(ctx, "_enqueue")
+    assert registro['secoes'][0]['tempo_ms'] >= 0
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import compacto, programacao, setores
+
+HOJE = pd.Timestamp(date.today())
+
+
+@pytest.fixture(scope="module")
+def carteira():
+    # OFs abertas e capacidade por setor para zerar a carteira em uns 60 dias úteis
+    df = compacto.compactar(gerar_dataframe(4_000, semente=3))
+    abertas = df[df['Saldo'].to_numpy() > 0]
+    saldo = abertas.groupby(abertas['Sub-g'].map(setores.nome_setor), observed=True)['Saldo'].sum()
+    return df, programacao.Calendario((saldo / 60).to_dict())
+
+
+@pytest.fixture(scope="module")
+def base(carteira):
+    df, calendario = carteira
+    lotes = sorted(df['Plano'].astype(str).unique())
+    return programacao.Programacao(df, calendario, {lote: 1 for lote in lotes[:50]}, HOJE)
+
+
+@pytest.mark.parametrize("mudanca", ["sobe", "desce", "várias", "nenhuma"])
+def test_reprogramar_igual_a_programar_do_zero(carteira, base, mudanca):
+    df, calendario = carteira
+    lotes = sorted(base.prioridades)
+    novas = dict(base.prioridades)
+    if mudanca == "sobe":
+        novas['25100'] = 0
+    elif mudanca == "desce":
+        novas[lotes[0]] = programacao.PRIORIDADE_PADRAO + 1
+    elif mudanca == "várias":
+        novas.update({lote: 5 for lote in lotes[10:30]})
+        novas['P0001'] = 0
+
+    incremental = base.reprogramar(novas)
+    do_zero = programacao.Programacao(df, calendario, novas, HOJE)
+    pd.testing.assert_frame_equal(incremental.resultado(), do_zero.resultado())
+    # A programação de partida não muda (outras sessões podem estar nela)
+    pd.testing.assert_frame_equal(
+        base.resultado(), programacao.Programacao(df, calendario, base.prioridades, HOJE).resultado()
+    )
+
+
+def test_setor_sem_capacidade_fica_sem_data(carteira):
+    df, calendario = carteira
+    capacidade = dict(calendario.capacidade, Solda=0)
+    resultado = programacao.Programacao(df, programacao.Calendario(capacidade), {}, HOJE)
+    assert resultado.sem_capacidade == ['Solda']
+    resumo = resultado.resumo()
+    assert resumo.loc['Solda', 'Sem data no horizonte'] == resumo.loc['Solda', 'OFs']
+    assert resumo.drop('Solda')['Sem data no horizonte'].sum() == 0
+    assert resultado.reprogramar({'25100': 0}).sem_capacidade == ['Solda']
+
+
+def test_capacidade_estimada_sem_produzido(carteira):
+    df, _ = carteira
+    estimadas = programacao.capacidades_estimadas(df.drop(columns=['PRODUZIDO', 'PROGRAMADO']))
+    assert set(estimadas) == {'Montagem', 'Solda', 'Estamparia'}
+    assert all(capacidade > 0 for capacidade in estimadas.values())
+    resultado = programacao.Programacao(df, programacao.Calendario(estimadas), {}, HOJE)
+    assert resultado.sem_capacidade == []
+    assert resultado.resultado()['Fim previsto'].notna().all()
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from pcp import ingestao, monitor, registro
+
+
+def test_residente_nao_conta_acesso_nem_reordena():
+    itens = registro.RegistroDatasets(orcamento_bytes=10**9)
+    a, b = gerar_dataframe(100), gerar_dataframe(100, semente=1)
+    itens.inserir('a', a)
+    itens.inserir('b', b)
+    assert itens.residente('a') is a and itens.residente('c') is None
+    assert (itens.acertos, itens.faltas) == (0, 0)
+
+    # 'a' continua o menos usado e sai primeiro
+    itens.orcamento_bytes = registro.tamanho_bytes(a) * 2
+    itens.inserir('c', gerar_dataframe(100, semente=2))
+    assert itens.residente('a') is None and itens.residente('b') is b
+
+
+def test_monitor_guarda_so_a_versao(tmp_path):
+    caminho = tmp_path / "ofs.xlsx"
+    caminho.write_bytes(b"export")
+    carregados = []
+
+    def carregar(chave, conteudo):
+        carregados.append(chave)
+        return pd.DataFrame({'Ordem F': range(10)})
+
+    pasta = monitor.MonitorPasta(str(tmp_path), carregar, espera_estavel=0)
+    pasta._ingerir(str(caminho))
+    pasta._ingerir(str(caminho))
+    assert pasta.atual() == ingestao.hash_conteudo(b"export")
+    assert carregados == [pasta.atual()]
+    assert pasta.metricas()['linhas'] == 10
+
+
+def test_monitor_publica_versao_depois_das_metricas(tmp_path):
+    caminho = tmp_path / "ofs.xlsx"
+    caminho.write_bytes(b"export")
+    pasta = monitor.MonitorPasta(str(tmp_path), lambda chave, conteudo: pd.DataFrame(), espera_estavel=0)
+    vistas = []
+
+    class Metricas(dict):
+        def update(self, *args, **kwargs):
+            # Enquanto as métricas mudam, a página ainda não pode ver a versão nova
+            vistas.append(pasta.atual())
+            super().update(*args, **kwargs)
+
+    pasta._metricas = Metricas(pasta._metricas)
+    pasta._ingerir(str(caminho))
+    assert vistas == [None]
+    assert pasta.atual() is not None and pasta.metricas()['ultima_ingestao'] is not None